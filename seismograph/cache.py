@@ -0,0 +1,253 @@
+# -*- coding: utf-8 -*-
+
+"""
+Content-addressed cache of test results.
+Success of test is reused while its inputs are not changed.
+
+Inputs of test:
+    * source files of case class and its bases
+    * values of config which were read by case
+    * files from "__cache_files__" attribute of case class
+"""
+
+import os
+import sys
+import json
+import inspect
+import hashlib
+import logging
+
+from . import runnable
+from .utils import pyv
+
+
+logger = logging.getLogger(__name__)
+
+
+PACKAGE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+MISSING_FILE_DIGEST = 'missing'
+
+_caches = {}
+
+
+def get_digest(*strings):
+    digest = hashlib.sha1()
+
+    for string in strings:
+        digest.update(pyv.unicode_string(string).encode('utf-8'))
+        digest.update(b'\0')
+
+    return digest.hexdigest()
+
+
+def get_functions(cls):
+    for value in vars(cls).values():
+        value = getattr(value, '__func__', value)
+
+        if inspect.isfunction(value):
+            yield value
+
+            for cell in value.__closure__ or ():
+                try:
+                    contents = cell.cell_contents
+                except ValueError:  # empty cell
+                    continue
+                if inspect.isfunction(contents):
+                    yield contents
+
+
+def get_source_files(cls):
+    """
+    Files which contain code of case class and its bases.
+    Files of the framework are skipped.
+    """
+    files = set()
+
+    for base in inspect.getmro(cls):
+        module = sys.modules.get(base.__module__)
+        module_file = getattr(module, '__file__', None)
+
+        if module_file:
+            files.add(module_file)
+
+        for func in get_functions(base):
+            files.add(func.__code__.co_filename)
+
+    for file_path in files:
+        file_path = os.path.abspath(file_path)
+
+        if file_path.endswith(('.pyc', '.pyo')):
+            file_path = file_path[:-1]
+
+        if not file_path.startswith(PACKAGE_DIR):
+            yield file_path
+
+
+class ConfigReader(object):
+    """
+    Proxy to config which remembers read keys
+    """
+
+    def __init__(self, config):
+        object.__setattr__(self, '_ConfigReader__config', config)
+        object.__setattr__(self, '_ConfigReader__keys', set())
+
+    def __getattr__(self, item):
+        self.__keys.add(item)
+        return getattr(self.__config, item)
+
+    def __setattr__(self, key, value):
+        setattr(self.__config, key, value)
+
+    def __getitem__(self, item):
+        self.__keys.add(item)
+        return self.__config[item]
+
+    def __contains__(self, item):
+        self.__keys.add(item)
+        return item in self.__config
+
+    def get(self, item, default=None):
+        self.__keys.add(item)
+        return self.__config.get(item, default)
+
+    @property
+    def keys_read(self):
+        return sorted(self.__keys)
+
+    @property
+    def config(self):
+        return self.__config
+
+
+class TestCache(object):
+
+    def __init__(self, path):
+        self.__path = path
+        self.__file_digests = {}
+        self.__static_keys = {}
+
+        if not os.path.isdir(path):
+            os.makedirs(path)
+
+    @property
+    def path(self):
+        return self.__path
+
+    def file_digest(self, file_path):
+        if file_path not in self.__file_digests:
+            try:
+                with open(file_path, 'rb') as fp:
+                    digest = hashlib.sha1(fp.read()).hexdigest()
+            except IOError:
+                digest = MISSING_FILE_DIGEST
+
+            self.__file_digests[file_path] = digest
+
+        return self.__file_digests[file_path]
+
+    def static_key(self, case):
+        """
+        Key from code of case and declared files
+        """
+        cache_key = (case.__class__, runnable.method_name(case))
+
+        if cache_key not in self.__static_keys:
+            source_files = sorted(get_source_files(case.__class__))
+            declared_files = sorted(case.__cache_files__ or ())
+
+            self.__static_keys[cache_key] = get_digest(
+                sys.version_info[:2],
+                runnable.class_name(case),
+                runnable.method_name(case),
+                *(
+                    u'{}:{}'.format(f, self.file_digest(f))
+                    for f in source_files + declared_files
+                )
+            )
+
+        return self.__static_keys[cache_key]
+
+    def entry_path(self, case):
+        return os.path.join(
+            self.__path, '{}.json'.format(self.static_key(case)),
+        )
+
+    def is_success(self, case):
+        entry_path = self.entry_path(case)
+
+        if not os.path.isfile(entry_path):
+            return False
+
+        try:
+            with open(entry_path) as fp:
+                entry = json.load(fp)
+        except ValueError:
+            logger.warning(
+                'Cache entry "{}" is corrupted and will be ignored'.format(entry_path),
+            )
+            return False
+
+        config = get_config(case)
+
+        for key, digest in entry.get('config', {}).items():
+            if get_digest(repr(config.get(key))) != digest:
+                logger.debug(
+                    'Cache entry "{}" is outdated by config value "{}"'.format(
+                        entry_path, key,
+                    ),
+                )
+                return False
+
+        return True
+
+    def add_success(self, case):
+        entry_path = self.entry_path(case)
+        config = get_config(case)
+        reader = case.config if isinstance(case.config, ConfigReader) else None
+
+        entry = {
+            'case': runnable.class_name(case),
+            'method': runnable.method_name(case),
+            'config': dict(
+                (key, get_digest(repr(config.get(key))))
+                for key in (reader.keys_read if reader else ())
+            ),
+        }
+
+        logger.debug('Save cache entry to "{}"'.format(entry_path))
+
+        tmp_path = '{}.{}.tmp'.format(entry_path, os.getpid())
+
+        with open(tmp_path, 'w') as fp:
+            json.dump(entry, fp, sort_keys=True)
+
+        pyv.replace(tmp_path, entry_path)
+
+
+def get_config(case):
+    config = case.config
+
+    if isinstance(config, ConfigReader):
+        return config.config
+
+    return config
+
+
+def get_cache(config):
+    """
+    Cache by config or None if cache is disabled
+    """
+    if isinstance(config, ConfigReader):
+        config = config.config
+
+    path = config.get('TEST_CACHE') if config is not None else None
+
+    if not path:
+        return None
+
+    if path not in _caches:
+        _caches[path] = TestCache(path)
+
+    return _caches[path]
@@ -1,12 +1,12 @@
 # -*- coding: utf-8 -*-
 
 import logging
-import traceback
 from functools import wraps
 from unittest import TestCase as __UnitTest__
 
 from six import with_metaclass
 
+from . import cache
 from . import steps
 from . import loader
 from . import reason
@@ -14,6 +14,8 @@ from . import runnable
 from .utils import pyv
 from . import extensions
 from .exceptions import Skip
+from .reason import get_traceback
+from .utils.common import PhaseTimer
 from .utils.common import measure_time
 from .utils.common import call_to_chain
 from .exceptions import ExtensionNotRequired
@@ -26,9 +28,23 @@ logger = logging.getLogger(__name__)
 DEFAULT_LAYERS = []
 MATCH_CASE_TO_LAYER = {}
 
+# (class of case, layers of case) -> chains of layers
+LAYER_CHAINS = {}
+
+# (class of case, name of test method) which were compiled
+COMPILED_CASES = set()
+
 
 SKIP_ATTRIBUTE_NAME = '__skip__'
 SKIP_WHY_ATTRIBUTE_NAME = '__skip_why__'
+COMPILED_FROM_ATTRIBUTE_NAME = '__compiled_from__'
+
+TEST_PHASE = 'test'
+SETUP_PHASE = 'setup'
+LAYERS_PHASE = 'layers'
+TEARDOWN_PHASE = 'teardown'
+EXTENSIONS_PHASE = 'extensions'
+SETUP_CLASS_PHASE = 'setup_class'
 
 
 def repeat(case):
@@ -45,16 +61,24 @@ def prepare(case, method):
 
 def setup_class_proxy(case):
     if getattr(case.__class__, '__setup_class_was_called__', False):
-        return
-    case.setup_class()
+        return None
+    result = case.setup_class()
     setattr(case.__class__, '__setup_class_was_called__', True)
+    return result
 
 
 def teardown_class_proxy(case):
     if getattr(case.__class__, '__teardown_class_was_called__', False):
-        return
-    case.teardown_class()
+        return None
+    result = case.teardown_class()
     setattr(case.__class__, '__teardown_class_was_called__', True)
+    return result
+
+
+def reset_class_proxies(case):
+    cls = get_case_class(case)
+    setattr(cls, '__setup_class_was_called__', False)
+    setattr(cls, '__teardown_class_was_called__', False)
 
 
 def _skip(reason):
@@ -118,15 +142,40 @@ def flows(*flows):
     return wrapper
 
 
-def apply_flows(case):
-    if not steps.is_step_by_step_case(case) and case.__flows__:
-        setattr(
-            case.__class__,
-            runnable.method_name(case),
-            flows(*case.__flows__)(
-                getattr(case.__class__, runnable.method_name(case)),
-            ),
-        )
+def compile_method(method, *decorators):
+    """
+    Decorators are applied to original method,
+    so method which was compiled already is not wrapped twice.
+    """
+    original = getattr(method, COMPILED_FROM_ATTRIBUTE_NAME, method)
+    compiled = original
+
+    for decorator in decorators:
+        compiled = decorator(compiled)
+
+    setattr(compiled, COMPILED_FROM_ATTRIBUTE_NAME, original)
+
+    return compiled
+
+
+def compile_case(cls, method_name):
+    """
+    Class of case is compiled once for each test method.
+    Instances of case share compiled methods of class.
+    """
+    key = (cls, method_name)
+
+    if key in COMPILED_CASES:
+        return
+
+    logger.debug(
+        'Compile case "{}.{}" for method "{}"'.format(
+            cls.__module__, cls.__name__, method_name,
+        ),
+    )
+
+    cls.__compile__(method_name)
+    COMPILED_CASES.add(key)
 
 
 def make_case_class_from_function(
@@ -156,15 +205,203 @@ def make_case_class_from_function(
     return cls
 
 
+def get_case_class(case):
+    return case.cls if isinstance(case, CaseSpec) else case.__class__
+
+
 def with_match_layers(context, case):
     for layer in context.layers:
         yield layer
 
     for cls, layer in MATCH_CASE_TO_LAYER.items():
-        if isinstance(case, cls) and layer.enabled:
+        if issubclass(get_case_class(case), cls) and layer.enabled:
             yield layer
 
 
+def get_skip_reason(cls, method_name):
+    """
+    Reason of skip if case or test method is skipped else None
+    """
+    if hasattr(cls, SKIP_ATTRIBUTE_NAME):
+        return getattr(cls, SKIP_WHY_ATTRIBUTE_NAME, 'no reason')
+
+    method = getattr(cls, method_name, None)
+
+    if getattr(method, SKIP_ATTRIBUTE_NAME, False):
+        return getattr(method, SKIP_WHY_ATTRIBUTE_NAME, 'no reason')
+
+    return None
+
+
+class CaseSpec(object):
+    """
+    Lightweight description of case.
+    Instance of case is created on demand when it should be run.
+    Skipped and always success cases are resolved by spec
+    and instance of case is not created for them.
+    Layers get spec instead of case in "on_skip" and "on_success".
+    """
+
+    __slots__ = (
+        '__cls',
+        '__config',
+        '__context',
+        '__skip_reason',
+        '__method_name',
+        '_stopped_on',
+    )
+
+    def __init__(self, cls, method_name, config=None):
+        self.__cls = cls
+        self.__config = config
+        self.__context = None
+        self.__method_name = method_name
+        self.__skip_reason = get_skip_reason(cls, method_name)
+
+        self._stopped_on = method_name
+
+    def __call__(self, *args, **kwargs):
+        if self.is_resolved:
+            return run_resolved_case(self, *args, **kwargs)
+        return self.build()(*args, **kwargs)
+
+    def __str__(self):
+        return '{} ({}:{})'.format(
+            self.__method_name, self.suite_name, self.__cls.__name__,
+        )
+
+    def __repr__(self):
+        return '<{} {}.{}>'.format(
+            self.__class__.__name__, self.__class_name__(), self.__method_name,
+        )
+
+    def __class_name__(self):
+        return '{}.{}'.format(self.suite_name, self.__cls.__name__)
+
+    def __method_name__(self):
+        return self.__method_name
+
+    def __stopped_on__(self):
+        return self._stopped_on
+
+    def __phases__(self):
+        return None
+
+    def __flow__(self, result):
+        """
+        Result of spec is added without instance of case
+        """
+        timer = measure_time()
+
+        if result.current_state.should_stop:
+            return
+
+        with result.proxy() as result_proxy:
+            result_proxy.start(self)
+
+            if self.always_success:
+                yield self.context.hook(self, 'on_success', self)
+                result_proxy.add_success(
+                    self, timer(),
+                )
+            else:
+                yield self.context.hook(self, 'on_skip', self, self.__skip_reason, result_proxy)
+                result_proxy.add_skip(
+                    self, self.__skip_reason, timer(),
+                )
+
+    def __record__(self):
+        return runnable.RunnableRecord(
+            self.id,
+            self.__class_name__(),
+            self.__method_name,
+            stopped_on=self._stopped_on,
+            suite_name=self.suite_name,
+            case_name=self.__cls.__name__,
+        )
+
+    @property
+    def __repeatable__(self):
+        return self.__cls.__repeatable__
+
+    @property
+    def id(self):
+        return id(self)
+
+    @property
+    def cls(self):
+        return self.__cls
+
+    @property
+    def config(self):
+        return self.__config
+
+    @property
+    def context(self):
+        """
+        Context with layers of case class.
+        Setup and teardown are never called for spec.
+        """
+        if self.__context is None:
+            self.__context = CaseContext(
+                None, None, layers=self.__cls.__layers__,
+            )
+
+        return self.__context
+
+    @property
+    def suite_name(self):
+        return self.__cls.__mount_data__.suite_name
+
+    @property
+    def skip_reason(self):
+        return self.__skip_reason
+
+    @property
+    def always_success(self):
+        return self.__cls.__always_success__
+
+    @property
+    def is_resolved(self):
+        """
+        Result of case is known without run
+        """
+        return self.always_success or self.__skip_reason is not None
+
+    def support_mp(self):
+        pass
+
+    def build(self):
+        return self.__cls(self.__method_name, config=self.__config)
+
+
+def create_case(cls, method_name, config=None):
+    """
+    Spec is returned instead of case if result of case is known without run
+    """
+    spec = CaseSpec(cls, method_name, config=config)
+
+    if spec.is_resolved:
+        return spec
+
+    return spec.build()
+
+
+def build_case(case):
+    if isinstance(case, CaseSpec) and not case.is_resolved:
+        return case.build()
+
+    return case
+
+
+def is_resolved(case):
+    return isinstance(case, CaseSpec) and case.is_resolved
+
+
+def run_resolved_case(spec, result):
+    runnable.run_flow(spec.__flow__(result))
+
+
 class CaseBox(object):
 
     def __init__(self, iterable):
@@ -189,22 +426,32 @@ class CaseBox(object):
     def __getattr__(self, item):
         return getattr(self.__current, item)
 
-    def __run_current__(self, result):
-        if self.__current.__repeatable__ and self.__current.config.REPEAT > 0:
-            for _ in pyv.xrange(self.__current.config.REPEAT):
-                self.__current(result)
+    def sort(self, key=None, reverse=False):
+        self.__cases = sorted(self.__cases, key=key, reverse=reverse)
+
+    @staticmethod
+    def __run_case__(case, result):
+        if case.__repeatable__ and case.config.REPEAT > 0:
+            for _ in pyv.xrange(case.config.REPEAT):
+                case(result)
         else:
-            self.__current(result)
+            case(result)
 
     def __run__(self, result):
         for case in self.__cases:
-            self.__current = case
+            # class is not set up for case which will not be run
+            if is_resolved(case):
+                self.__run_case__(case, result)
+                continue
+
+            self.__current = build_case(case)
             try:
-                setup_class_proxy(self.__current)
+                with self.__current.phases.measure(SETUP_CLASS_PHASE):
+                    setup_class_proxy(self.__current)
             except BaseException as error:
                 runnable.stopped_on(self.__current, 'setup_class')
                 raise error
-            self.__run_current__(result)
+            self.__run_case__(self.__current, result)
 
         if self.__current:
             try:
@@ -213,6 +460,10 @@ class CaseBox(object):
                 runnable.stopped_on(self.__current, 'teardown_class')
                 raise error
 
+            # case which was built on demand is not kept after run
+            if self.__current is not case:
+                self.__current = None
+
 
 class MountData(object):
 
@@ -423,6 +674,7 @@ class CaseContext(runnable.ContextOfRunnableObject):
         self.__require = []
         self.__extensions = {}
         self.__layers = layers if layers else []
+        self.__chains_key = None
 
         self.__setup_callbacks = [setup]
         self.__teardown_callbacks = [teardown]
@@ -453,169 +705,153 @@ class CaseContext(runnable.ContextOfRunnableObject):
             if layer.enabled:
                 yield layer
 
-    def start_context(self, case):
-        logger.debug(
-            'Start context of case "{}"'.format(
-                runnable.class_name(case),
-            ),
+    def get_chain(self, case, method_name):
+        """
+        Bound methods of layers which implement the hook.
+        Chains are resolved once for class of case.
+        """
+        if self.__chains_key is None:
+            self.__chains_key = (get_case_class(case), ) + tuple(self.__layers)
+
+        return runnable.get_layer_chains(
+            LAYER_CHAINS,
+            self.__chains_key,
+            lambda: with_match_layers(self, case),
+            CaseLayer,
+        )[method_name]
+
+    def hook(self, case, method_name, *args):
+        """
+        Chain of layers for hook. Case is stopped on hook if chain was failed.
+        """
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                'Call to chain callbacks "{}" of case "{}"'.format(
+                    method_name, runnable.class_name(case),
+                ),
+            )
+
+        return runnable.Chain(
+            self.get_chain(case, method_name),
+            args=args,
+            runnable=case,
+            stopped_on=method_name,
         )
 
-        try:
-            call_to_chain(
-                with_match_layers(self, case), 'on_setup', case,
+    def start_chains(self, case):
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                'Start context of case "{}"'.format(
+                    runnable.class_name(case),
+                ),
             )
-            call_to_chain(self.__setup_callbacks, None)
-        except BaseException:
-            runnable.stopped_on(case, 'start_context')
-            raise
 
-    def stop_context(self, case):
-        logger.debug(
-            'Stop context of case "{}"'.format(
-                runnable.class_name(case),
+        return (
+            runnable.Chain(
+                self.get_chain(case, 'on_setup'),
+                args=(case, ),
+                runnable=case,
+                phase=LAYERS_PHASE,
+                stopped_on='start_context',
+            ),
+            runnable.Chain(
+                self.__setup_callbacks,
+                runnable=case,
+                phase=SETUP_PHASE,
+                stopped_on='start_context',
             ),
         )
 
-        try:
-            call_to_chain(
-                with_match_layers(self, case), 'on_teardown', case,
+    def stop_chains(self, case):
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                'Stop context of case "{}"'.format(
+                    runnable.class_name(case),
+                ),
             )
-            call_to_chain(self.__teardown_callbacks, None)
-        except BaseException:
-            runnable.stopped_on(case, 'stop_context')
-            raise
 
-    def install_extensions(self):
+        return (
+            runnable.Chain(
+                self.get_chain(case, 'on_teardown'),
+                args=(case, ),
+                runnable=case,
+                phase=LAYERS_PHASE,
+                stopped_on='stop_context',
+            ),
+            runnable.Chain(
+                self.__teardown_callbacks,
+                runnable=case,
+                phase=TEARDOWN_PHASE,
+                stopped_on='stop_context',
+            ),
+        )
+
+    def start_context(self, case):
+        call_to_chain(self.start_chains(case), None)
+
+    def stop_context(self, case):
+        call_to_chain(self.stop_chains(case), None)
+
+    def get_extension(self, name, suite_name=None):
+        if name not in self.__extensions:
+            self.__extensions[name] = extensions.get(name, suite_name=suite_name)
+
+        return self.__extensions[name]
+
+    def install_extensions(self, suite_name=None):
         for ext_name in self.require:
-            if ext_name not in self.__extensions:
-                self.__extensions[ext_name] = extensions.get(ext_name)
+            self.get_extension(ext_name, suite_name=suite_name)
+
+    def release_extensions(self):
+        for ext_name, ext in self.__extensions.items():
+            extensions.release(ext_name, ext)
+
+        self.__extensions.clear()
 
     def on_init(self, case):
-        logger.debug(
-            'Call to chain callbacks "on_init" of case "{}"'.format(
-                runnable.class_name(case),
-            ),
-        )
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                'Call to chain callbacks "on_init" of case "{}"'.format(
+                    runnable.class_name(case),
+                ),
+            )
 
         call_to_chain(
-            with_match_layers(self, case), 'on_init', case,
+            self.get_chain(case, 'on_init'), None, case,
         )
 
     def on_require(self, case):
-        logger.debug(
-            'Call to chain callbacks "on_require" of case "{}"'.format(
-                runnable.class_name(case),
-            ),
-        )
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                'Call to chain callbacks "on_require" of case "{}"'.format(
+                    runnable.class_name(case),
+                ),
+            )
 
         call_to_chain(
-            with_match_layers(self, case), 'on_require', self.__require,
+            self.get_chain(case, 'on_require'), None, self.__require,
         )
 
     def on_skip(self, case, reason, result):
-        logger.debug(
-            'Call to chain callbacks "on_skip" of case "{}"'.format(
-                runnable.class_name(case),
-            ),
-        )
-
-        try:
-            call_to_chain(
-                with_match_layers(self, case), 'on_skip', case, reason, result,
-            )
-        except BaseException:
-            runnable.stopped_on(case, 'on_skip')
-            raise
+        self.hook(case, 'on_skip', case, reason, result)()
 
     def on_any_error(self, error, case, result):
-        logger.debug(
-            'Call to chain callbacks "on_any_error" of case "{}"'.format(
-                runnable.class_name(case),
-            ),
-        )
-
-        try:
-            call_to_chain(
-                with_match_layers(self, case), 'on_any_error', error, case, result,
-            )
-        except BaseException:
-            runnable.stopped_on(case, 'on_any_error')
-            raise
+        self.hook(case, 'on_any_error', error, case, result)()
 
     def on_error(self, error, case, result):
-        logger.debug(
-            'Call to chain callbacks "on_error" of case "{}"'.format(
-                runnable.class_name(case),
-            ),
-        )
-
-        try:
-            call_to_chain(
-                with_match_layers(self, case), 'on_error', error, case, result,
-            )
-        except BaseException:
-            runnable.stopped_on(case, 'on_error')
-            raise
+        self.hook(case, 'on_error', error, case, result)()
 
     def on_context_error(self, error, case, result):
-        logger.debug(
-            'Call to chain callbacks "on_context_error" of case "{}"'.format(
-                runnable.class_name(case),
-            ),
-        )
-
-        try:
-            call_to_chain(
-                with_match_layers(self, case), 'on_context_error', error, case, result,
-            )
-        except BaseException:
-            runnable.stopped_on(case, 'on_context_error')
-            raise
+        self.hook(case, 'on_context_error', error, case, result)()
 
     def on_fail(self, fail, case, result):
-        logger.debug(
-            'Call to chain callbacks "on_fail" of case "{}"'.format(
-                runnable.class_name(case),
-            ),
-        )
-
-        try:
-            call_to_chain(
-                with_match_layers(self, case), 'on_fail', fail, case, result,
-            )
-        except BaseException:
-            runnable.stopped_on(case, 'on_fail')
-            raise
+        self.hook(case, 'on_fail', fail, case, result)()
 
     def on_success(self, case):
-        logger.debug(
-            'Call to chain callbacks "on_success" of case "{}"'.format(
-                runnable.class_name(case),
-            ),
-        )
-
-        try:
-            call_to_chain(
-                with_match_layers(self, case), 'on_success', case,
-            )
-        except BaseException:
-            runnable.stopped_on(case, 'on_success')
-            raise
+        self.hook(case, 'on_success', case)()
 
     def on_run(self, case):
-        logger.debug(
-            'Call to chain callbacks "on_run" of case "{}"'.format(
-                runnable.class_name(case),
-            ),
-        )
-
-        try:
-            call_to_chain(
-                with_match_layers(self, case), 'on_run', case,
-            )
-        except BaseException:
-            runnable.stopped_on(case, 'on_run')
-            raise
+        self.hook(case, 'on_run', case)()
 
 
 assertion = AssertionBase()
@@ -627,7 +863,9 @@ class Case(with_metaclass(steps.CaseMeta, runnable.RunnableObject, runnable.Moun
     __layers__ = None
     __static__ = False
     __require__ = None
+    __cacheable__ = True
     __repeatable__ = True
+    __cache_files__ = None
     __create_reason__ = True
     __always_success__ = False
     __assertion_class__ = None
@@ -637,7 +875,7 @@ class Case(with_metaclass(steps.CaseMeta, runnable.RunnableObject, runnable.Moun
     #
 
     def __is_run__(self):
-        return self.__is_run
+        return self._is_run
 
     def __is_mount__(self):
         mount_data = getattr(
@@ -653,6 +891,19 @@ class Case(with_metaclass(steps.CaseMeta, runnable.RunnableObject, runnable.Moun
             self.__mount_data__.suite_name, self.__class__.__name__,
         )
 
+    def __phases__(self):
+        return self.__phases
+
+    def __record__(self):
+        return runnable.RunnableRecord(
+            self.id,
+            runnable.class_name(self),
+            runnable.method_name(self),
+            stopped_on=runnable.stopped_on(self),
+            suite_name=self.__mount_data__.suite_name,
+            case_name=self.__class__.__name__,
+        )
+
     def __reason__(self):
         reasons = []
 
@@ -693,7 +944,14 @@ class Case(with_metaclass(steps.CaseMeta, runnable.RunnableObject, runnable.Moun
         return reason.join(*reasons)
 
     def __run__(self, result):
-        self.__is_run = True
+        runnable.run_flow(self.__flow__(result))
+
+    def __flow__(self, result):
+        """
+        Steps of run. Chains of layers, callbacks and test method
+        are yielded to runner of flow which calls them.
+        """
+        self._is_run = True
         timer = measure_time()
 
         if result.current_state.should_stop:
@@ -703,7 +961,7 @@ class Case(with_metaclass(steps.CaseMeta, runnable.RunnableObject, runnable.Moun
             result_proxy.start(self)
 
             if self.__always_success__:
-                self.__context.on_success(self)
+                yield self.__context.hook(self, 'on_success', self)
                 result_proxy.add_success(
                     self, timer(),
                 )
@@ -711,66 +969,98 @@ class Case(with_metaclass(steps.CaseMeta, runnable.RunnableObject, runnable.Moun
 
             if hasattr(self, SKIP_ATTRIBUTE_NAME):
                 reason = getattr(self, SKIP_WHY_ATTRIBUTE_NAME, 'no reason')
-                self.__context.on_skip(self, reason, result_proxy)
+                yield self.__context.hook(self, 'on_skip', self, reason, result_proxy)
                 result_proxy.add_skip(
                     self, reason, timer(),
                 )
                 return
 
+            test_cache = cache.get_cache(self.__config) if self.__cacheable__ else None
+
+            if test_cache and test_cache.is_success(self):
+                yield self.__context.hook(self, 'on_success', self)
+                result_proxy.add_success(
+                    self, timer(), cached=True,
+                )
+                return
+
             self.__log = result_proxy.console.child_console()
 
             try:
-                self.__context.on_run(self)
+                logger.debug(
+                    'Install extensions on context of case "{}"'.format(
+                        runnable.class_name(self),
+                    ),
+                )
+
+                with self.__phases.measure(EXTENSIONS_PHASE):
+                    self.__context.install_extensions(
+                        suite_name=self.__mount_data__.suite_name,
+                    )
+
+                with self.__phases.measure(LAYERS_PHASE):
+                    yield self.__context.hook(self, 'on_run', self)
 
                 was_success = True
 
                 for _ in iter(repeat(self)):
-                    with self.__context(self):
-                        try:
-                            test_method = prepare(
-                                self, getattr(self, runnable.method_name(self)),
+                    for chain in self.__context.start_chains(self):
+                        yield chain
+
+                    try:
+                        with self.__phases.measure(TEST_PHASE):
+                            test_method = runnable.Chain(
+                                (prepare(self, getattr(self, runnable.method_name(self))), ),
                             )
                             for _ in iter(repeat_method(self)):
-                                test_method()
-                        except ALLOW_RAISED_EXCEPTIONS:
-                            result_proxy.current_state.should_stop = True
-                            raise
-                        except Skip as s:
-                            was_success = False
-                            self.__context.on_skip(self, s.message, result_proxy)
-                            result_proxy.add_skip(
-                                self, s.message, timer(),
-                            )
-                        except AssertionError as fail:
-                            was_success = False
-                            self.__context.on_fail(fail, self, result_proxy)
-                            result_proxy.add_fail(
-                                self, traceback.format_exc(), timer(), fail,
-                            )
-                        except BaseException as error:
-                            was_success = False
-                            self.__context.on_error(error, self, result_proxy)
-                            self.__context.on_any_error(error, self, result_proxy)
-                            result_proxy.add_error(
-                                self, traceback.format_exc(), timer(), error,
-                            )
+                                yield test_method
+                    except ALLOW_RAISED_EXCEPTIONS:
+                        result_proxy.current_state.should_stop = True
+                        raise
+                    except Skip as s:
+                        was_success = False
+                        yield self.__context.hook(self, 'on_skip', self, s.message, result_proxy)
+                        result_proxy.add_skip(
+                            self, s.message, timer(),
+                        )
+                    except AssertionError as fail:
+                        was_success = False
+                        yield self.__context.hook(self, 'on_fail', fail, self, result_proxy)
+                        result_proxy.add_fail(
+                            self, get_traceback(), timer(), fail,
+                        )
+                    except BaseException as error:
+                        was_success = False
+                        yield self.__context.hook(self, 'on_error', error, self, result_proxy)
+                        yield self.__context.hook(self, 'on_any_error', error, self, result_proxy)
+                        result_proxy.add_error(
+                            self, get_traceback(), timer(), error,
+                        )
+                    finally:
+                        for chain in self.__context.stop_chains(self):
+                            yield chain
 
                     if not was_success:
                         break
 
                 if was_success:
-                    self.__context.on_success(self)
+                    yield self.__context.hook(self, 'on_success', self)
                     result_proxy.add_success(
                         self, timer(),
                     )
+
+                    if test_cache:
+                        test_cache.add_success(self)
             except ALLOW_RAISED_EXCEPTIONS:
                 raise
             except BaseException as error:
-                self.__context.on_context_error(error, self, result_proxy)
-                self.__context.on_any_error(error, self, result_proxy)
+                yield self.__context.hook(self, 'on_context_error', error, self, result_proxy)
+                yield self.__context.hook(self, 'on_any_error', error, self, result_proxy)
                 result_proxy.add_error(
-                    self, traceback.format_exc(), timer(), error,
+                    self, get_traceback(), timer(), error,
                 )
+            finally:
+                self.__context.release_extensions()
 
     #
     # Behavior on magic methods
@@ -805,13 +1095,17 @@ class Case(with_metaclass(steps.CaseMeta, runnable.RunnableObject, runnable.Moun
                 ),
             )
 
+        if self.__cacheable__ and cache.get_cache(config):
+            config = cache.ConfigReader(config)
+
         self.__log = None
-        self.__is_run = False
+        self._is_run = False
         self.__config = config
+        self.__phases = PhaseTimer()
         self._method_name = method_name
 
         if use_flows:
-            apply_flows(self)
+            compile_case(self.__class__, method_name)
 
         self.__context = CaseContext(
             self.setup,
@@ -837,14 +1131,6 @@ class Case(with_metaclass(steps.CaseMeta, runnable.RunnableObject, runnable.Moun
         self.__context.on_init(self)
         self.__context.on_require(self)
 
-        logger.debug(
-            'Install extensions on context of case "{}"'.format(
-                runnable.class_name(self),
-            ),
-        )
-
-        self.__context.install_extensions()
-
         super(Case, self).__init__()
 
     @classmethod
@@ -875,6 +1161,21 @@ class Case(with_metaclass(steps.CaseMeta, runnable.RunnableObject, runnable.Moun
 
         return cls
 
+    @classmethod
+    def __compile__(cls, method_name):
+        """
+        Wrap test method of class by flows.
+        Is called once for each test method of class.
+        """
+        if not steps.is_step_by_step_case(cls) and cls.__flows__:
+            setattr(
+                cls,
+                method_name,
+                compile_method(
+                    getattr(cls, method_name), flows(*cls.__flows__),
+                ),
+            )
+
     def __repeat__(self):
         yield
 
@@ -893,10 +1194,21 @@ class Case(with_metaclass(steps.CaseMeta, runnable.RunnableObject, runnable.Moun
     def log(self):
         return self.__log
 
+    @log.setter
+    def log(self, value):
+        self.__log = value
+
     @property
     def context(self):
         return self.__context
 
+    @property
+    def phases(self):
+        """
+        Durations of phases of run. Phases of repeated case are summed.
+        """
+        return self.__phases
+
     @property
     def assertion(self):
         return self.__assertion
@@ -919,7 +1231,9 @@ class Case(with_metaclass(steps.CaseMeta, runnable.RunnableObject, runnable.Moun
         if name not in self.__context.require:
             raise ExtensionNotRequired(name)
 
-        return self.__context.extensions.get(name)
+        return self.__context.get_extension(
+            name, suite_name=self.__mount_data__.suite_name,
+        )
 
     @runnable.run_method
     def skip_test(self, reason):
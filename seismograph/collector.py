@@ -2,22 +2,45 @@
 
 import logging
 from random import Random
+from multiprocessing.pool import ThreadPool
 
 from . import loader
-from . import extensions
 from .suite import BuildRule
-from .exceptions import CollectError
 from .utils.common import call_to_chain
 
 
 logger = logging.getLogger(__name__)
 
 
-def get_shuffle(config):
-    if config.RANDOM:
+def get_shuffle(config, runtime_history=None):
+    if config.LPT:
+        if runtime_history is None:
+            from .history import load
+            runtime_history = load(config)
+        shuffle = runtime_history.sort
+    elif config.RANDOM:
         random = Random(config.RANDOM_SEED)
-        return random.shuffle
-    return None
+        shuffle = random.shuffle
+    else:
+        shuffle = None
+
+    if config.FAILED_FIRST:
+        return get_failed_first_shuffle(config, shuffle)
+
+    return shuffle
+
+
+def get_failed_first_shuffle(config, shuffle=None):
+    from .last_failed import load
+
+    sort = load(config).sort
+
+    def failed_first(objects):
+        if shuffle:
+            shuffle(objects)
+        sort(objects)
+
+    return failed_first
 
 
 def get_suite_name_from_command(command):
@@ -53,16 +76,8 @@ def get_test_name_from_command(command):
         return None
 
 
-def try_apply_rules(suite, rules):
-    for rule in rules[::-1]:
-        if rule.is_of(suite):
-            suite.assign_build_rule(rule)
-            rules.remove(rule)
-
-
-def base_generator(suites, shuffle=None):
+def build_all(suites, shuffle=None):
     call_to_chain(suites, 'build', shuffle=shuffle)
-    extensions.clear()
 
     if shuffle:
         shuffle(suites)
@@ -71,51 +86,116 @@ def base_generator(suites, shuffle=None):
         yield suite
 
 
-def generator_by_commands(suites, rules, shuffle=None):
+def build_pipeline(suites, shuffle=None):
+    """
+    Suites are built one by one. Next suite is built in background
+    while current suite is running and cases are built on demand.
+    """
+    if shuffle:
+        shuffle(suites)
+
+    def build(suite):
+        suite.build(shuffle=shuffle, lazy=True)
+        return suite
+
+    pool = ThreadPool(1)
+
+    try:
+        current = None
+
+        for suite in suites:
+            following = pool.apply_async(build, args=(suite, ))
+
+            if current is not None:
+                yield current.get()
+
+            current = following
+
+        if current is not None:
+            yield current.get()
+    finally:
+        pool.close()
+
+
+def base_generator(suites, shuffle=None, lazy=False):
+    if lazy:
+        return build_pipeline(suites, shuffle=shuffle)
+
+    return build_all(suites, shuffle=shuffle)
+
+
+def generator_by_commands(suites, rules, shuffle=None, lazy=False):
+    index = loader.create_suite_index(suites)
+
     loaded_suites = []
+    loaded_names = set()
 
     for rule in rules[::-1]:
-        suite = loader.load_suite_by_name(rule.suite_name, suites)
+        suite = loader.load_suite_by_name(rule.suite_name, index)
+
+        suite.assign_build_rule(rule)
 
-        try_apply_rules(suite, rules)
-        if suite not in loaded_suites:
+        if suite.name not in loaded_names:
+            loaded_names.add(suite.name)
             loaded_suites.append(suite)
 
-    if rules:
-        raise CollectError(
-            'incorrect commands to collect "{}"'.format(
-                ', '.join(str(r) for r in rules),
-            ),
+    for suite in base_generator(loaded_suites, shuffle=shuffle, lazy=lazy):
+        yield suite
+
+
+def create_rules(commands):
+    return [
+        BuildRule(
+            suite_name=get_suite_name_from_command(c),
+            case_name=get_case_name_from_command(c),
+            test_name=get_test_name_from_command(c),
         )
+        for c in commands
+    ]
 
-    call_to_chain(loaded_suites, 'build', shuffle=shuffle)
-    extensions.clear()
 
-    if shuffle:
-        shuffle(loaded_suites)
+def is_lazy(config):
+    """
+    Workers of multiprocessing get suites which were built in parent process
+    """
+    return not (config.EAGER_BUILD or config.MULTIPROCESSING)
 
-    for suite in loaded_suites:
-        yield suite
 
+def create_generator(suites, config, runtime_history=None):
+    """
+    :param runtime_history: history which was loaded for LPT order
+    """
+    shuffle = get_shuffle(config, runtime_history=runtime_history)
 
-def create_generator(suites, config):
     if config.TESTS:
         logger.debug('Create suite generator by commands')
 
-        rules = [
-            BuildRule(
-                suite_name=get_suite_name_from_command(c),
-                case_name=get_case_name_from_command(c),
-                test_name=get_test_name_from_command(c),
-            )
-            for c in config.TESTS
-        ]
         return generator_by_commands(
-            suites, rules, shuffle=get_shuffle(config),
+            suites,
+            create_rules(config.TESTS),
+            shuffle=shuffle,
+            lazy=is_lazy(config),
         )
 
+    if config.LAST_FAILED:
+        from .last_failed import load
+
+        commands = load(config).get_commands(suites)
+
+        if commands:
+            logger.debug('Create suite generator by last failed')
+
+            return generator_by_commands(
+                suites,
+                create_rules(commands),
+                shuffle=shuffle,
+                lazy=is_lazy(config),
+            )
+
+        logger.debug('Last failed tests are not found')
+
     logger.debug('Create base suite generator')
 
     return base_generator(
-        suites, shuffle=get_shuffle(config),
+        suites, shuffle=shuffle, lazy=is_lazy(config),
     )
@@ -16,6 +16,9 @@ from .datastructures import DictObject
 logger = logging.getLogger(__name__)
 
 
+DEFAULT_LAST_FAILED_FILE = '.seismograph_last_failed'
+
+
 def create_option_parser():
     parser = OptionParser('seismograph <suites_path> [options]')
 
@@ -26,6 +29,67 @@ def create_option_parser():
         default=None,
         help='Path to xml file to store the xunit report in.',
     )
+    result_group.add_option(
+        '--events-log',
+        dest='EVENTS_LOG',
+        default=None,
+        help='Path to file to append the lifecycle events of run to.',
+    )
+    result_group.add_option(
+        '--events-log-format',
+        dest='EVENTS_LOG_FORMAT',
+        type='choice',
+        choices=['json', 'marshal'],
+        default='json',
+        help='Format of events log: json lines or marshal records with length prefix.',
+    )
+    result_group.add_option(
+        '--profile',
+        dest='PROFILE',
+        default=None,
+        help='Path to dir to store cProfile stats of each case in. '
+             'Aggregated stats are printed at the end of run.',
+    )
+    result_group.add_option(
+        '--profile-top',
+        dest='PROFILE_TOP',
+        type=int,
+        default=20,
+        help='Num functions in aggregated stats of profile.',
+    )
+    result_group.add_option(
+        '--profile-filter',
+        dest='PROFILE_FILTER',
+        default=None,
+        help='Profile cases of suites which match to regexp only.',
+    )
+    result_group.add_option(
+        '--history',
+        dest='HISTORY',
+        default=None,
+        help='Path to file to store the history of runtime in.',
+    )
+    result_group.add_option(
+        '--last-failed-file',
+        dest='LAST_FAILED_FILE',
+        default=DEFAULT_LAST_FAILED_FILE,
+        help='Path to file to store the failed tests of last run in. '
+             'Is "{}" by default.'.format(DEFAULT_LAST_FAILED_FILE),
+    )
+    result_group.add_option(
+        '--no-last-failed-file',
+        dest='NO_LAST_FAILED_FILE',
+        action='store_true',
+        default=False,
+        help='No store the failed tests of run. --lf and --ff read the file still.',
+    )
+    result_group.add_option(
+        '--test-cache',
+        dest='TEST_CACHE',
+        default=None,
+        help='Path to dir to cache results of tests in. '
+             'Success of test is reused while its code, config and files are not changed.',
+    )
     parser.add_option_group(result_group)
 
     console_group = OptionGroup(parser, 'Output options')
@@ -50,6 +114,21 @@ def create_option_parser():
         default=False,
         help='No capture log.',
     )
+    console_group.add_option(
+        '--capture-size',
+        type=int,
+        dest='CAPTURE_SIZE',
+        default=64 * 1024,
+        help='Max size in bytes of captured log of case which is kept in memory. '
+             'Older records are moved to temporary file.',
+    )
+    console_group.add_option(
+        '--durations',
+        type=int,
+        dest='DURATIONS',
+        default=0,
+        help='Print N slowest tests and setups.',
+    )
     console_group.add_option(
         '--suite-detail',
         action='store_true',
@@ -105,6 +184,13 @@ def create_option_parser():
         default=[],
         help='Run these tests.',
     )
+    run_group.add_option(
+        '--collect-cache',
+        dest='COLLECT_CACHE',
+        default=None,
+        help='Path to file to store the manifest of collection in. '
+             'Tree is shown without import of unchanged modules.',
+    )
     run_group.add_option(
         '--include-regexp',
         dest='INCLUDE_SUITES_PATTERN',
@@ -140,6 +226,29 @@ def create_option_parser():
         default=False,
         help='Random order when tests is running.',
     )
+    run_group.add_option(
+        '--lpt',
+        dest='LPT',
+        action='store_true',
+        default=False,
+        help='Run the longest suites and tests first by history of runtime. '
+             'Is used instead of random order.',
+    )
+    run_group.add_option(
+        '--lf', '--last-failed',
+        dest='LAST_FAILED',
+        action='store_true',
+        default=False,
+        help='Run only tests which failed at the last run. '
+             'All tests are run if there are no failures.',
+    )
+    run_group.add_option(
+        '--ff', '--failed-first',
+        dest='FAILED_FIRST',
+        action='store_true',
+        default=False,
+        help='Run tests which failed at the last run before the rest.',
+    )
     run_group.add_option(
         '--random-seed',
         dest='RANDOM_SEED',
@@ -181,12 +290,41 @@ def create_option_parser():
         default=float(1800),
         help='Timeout to release and join multiprocessing process.',
     )
+    run_group.add_option(
+        '--mp-split-suites',
+        dest='MULTIPROCESSING_SPLIT_SUITES',
+        action='store_true',
+        default=False,
+        help='Distribute cases of suites across multiprocessing workers.',
+    )
+    run_group.add_option(
+        '--mp-worker-max-suites',
+        type=int,
+        dest='MULTIPROCESSING_WORKER_MAX_SUITES',
+        default=0,
+        help='Num suites after which multiprocessing worker will be recycled.',
+    )
+    run_group.add_option(
+        '--mp-worker-max-rss',
+        type=int,
+        dest='MULTIPROCESSING_WORKER_MAX_RSS',
+        default=0,
+        help='RSS size (MB) after which multiprocessing worker will be recycled. '
+             'Is ignored on platforms without "/proc".',
+    )
     run_group.add_option(
         '--gevent',
         dest='GEVENT',
         action='store_true',
         default=False,
-        help='Use gevent groups for run. Allow for python 2 only.',
+        help='Use gevent groups for run.',
+    )
+    run_group.add_option(
+        '--asyncio',
+        dest='ASYNCIO',
+        action='store_true',
+        default=False,
+        help='Use asyncio groups for run. Allow for python 3.5 and greater only.',
     )
     run_group.add_option(
         '--threading',
@@ -202,6 +340,14 @@ def create_option_parser():
         default=False,
         help='Use multiprocessing groups for run.',
     )
+    run_group.add_option(
+        '--eager-build',
+        dest='EAGER_BUILD',
+        action='store_true',
+        default=False,
+        help='Build all suites and cases before run. '
+             'Next suite is built while current suite is running otherwise.',
+    )
     parser.add_option_group(run_group)
 
     return parser
@@ -214,10 +360,18 @@ def prepare_config(config):
         from logging.config import dictConfig
         dictConfig(logging_settings)
 
-    if not config.GEVENT and not config.THREADING and (
+    if not config.GEVENT and not config.THREADING and not config.ASYNCIO and (
             config.ASYNC_SUITES or config.ASYNC_TESTS):
         config.MULTIPROCESSING = True
 
+    if config.LPT and not config.HISTORY:
+        raise ConfigError(
+            'history file is required for LPT order',
+        )
+
+    if (config.LAST_FAILED or config.FAILED_FIRST) and not config.LAST_FAILED_FILE:
+        config.LAST_FAILED_FILE = DEFAULT_LAST_FAILED_FILE
+
     if (config.STEPS_LOG or config.FLOWS_LOG) and not config.VERBOSE:
         config.VERBOSE = True
 
@@ -0,0 +1,133 @@
+# -*- coding: utf-8 -*-
+
+"""
+Log of lifecycle events of program.
+Each event is one record which is appended to file by one write,
+so file can be appended from several processes and can be read while program is running.
+
+Formats:
+    * json - one json object per line
+    * marshal - length of record (4 bytes, little-endian) and record dumped by marshal
+"""
+
+import os
+import json
+import time
+import struct
+import marshal
+import logging
+
+
+logger = logging.getLogger(__name__)
+
+
+JSON_FORMAT = 'json'
+MARSHAL_FORMAT = 'marshal'
+
+FORMATS = (JSON_FORMAT, MARSHAL_FORMAT)
+
+FRAME_HEADER = struct.Struct('<I')
+
+RUN_START = 'run_start'
+RUN_END = 'run_end'
+SUITE_START = 'suite_start'
+SUITE_END = 'suite_end'
+CASE_START = 'case_start'
+CASE_END = 'case_end'
+
+
+def dump_json(record):
+    return (json.dumps(record, sort_keys=True) + '\n').encode('utf-8')
+
+
+def dump_marshal(record):
+    data = marshal.dumps(record)
+    return FRAME_HEADER.pack(len(data)) + data
+
+
+DUMPS = {
+    JSON_FORMAT: dump_json,
+    MARSHAL_FORMAT: dump_marshal,
+}
+
+
+def read_json(fp):
+    while True:
+        line = fp.readline()
+
+        if not line:
+            break
+
+        # record is not written completely yet
+        if not line.endswith(b'\n'):
+            fp.seek(-len(line), os.SEEK_CUR)
+            break
+
+        yield json.loads(line.decode('utf-8'))
+
+
+def read_marshal(fp):
+    while True:
+        header = fp.read(FRAME_HEADER.size)
+
+        if len(header) < FRAME_HEADER.size:
+            fp.seek(-len(header), os.SEEK_CUR)
+            break
+
+        size, = FRAME_HEADER.unpack(header)
+        data = fp.read(size)
+
+        # record is not written completely yet
+        if len(data) < size:
+            fp.seek(-(len(header) + len(data)), os.SEEK_CUR)
+            break
+
+        yield marshal.loads(data)
+
+
+READERS = {
+    JSON_FORMAT: read_json,
+    MARSHAL_FORMAT: read_marshal,
+}
+
+
+def read(fp, fmt=JSON_FORMAT):
+    """
+    Records from file which was opened in binary mode.
+    Can be called again on the same file to get new records.
+    """
+    return READERS[fmt](fp)
+
+
+class EventsLog(object):
+
+    def __init__(self, path, fmt=JSON_FORMAT):
+        if fmt not in FORMATS:
+            raise ValueError(
+                'Unknown format of events log "{}"'.format(fmt),
+            )
+
+        self.__path = path
+        self.__dumps = DUMPS[fmt]
+        self.__fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+
+    @property
+    def path(self):
+        return self.__path
+
+    def write(self, event, **data):
+        data.update(
+            event=event,
+            time=time.time(),
+            pid=os.getpid(),
+        )
+
+        try:
+            os.write(self.__fd, self.__dumps(data))
+        except OSError as error:
+            logger.warning(
+                'Can not write event "{}" to "{}": {}'.format(event, self.__path, error),
+            )
+
+    def close(self):
+        os.close(self.__fd)
@@ -37,6 +37,10 @@ class TimeoutException(SeismographError):
     pass
 
 
+class WorkerError(SeismographError):
+    pass
+
+
 class ExtensionNotFound(SeismographError):
     pass
 
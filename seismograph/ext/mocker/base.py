@@ -247,7 +247,7 @@ class BaseMockServer(object):
 
     def serve_forever(self):
         if self._gevent:
-            from gevent.wsgi import WSGIServer
+            from gevent.pywsgi import WSGIServer
 
             WSGIServer(
                 (self.__host, self.__port), self,
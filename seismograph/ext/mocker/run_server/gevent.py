@@ -3,7 +3,7 @@
 from __future__ import absolute_import
 
 from gevent import Greenlet
-from gevent.wsgi import WSGIServer
+from gevent.pywsgi import WSGIServer
 
 
 class RunServerInGreenlet(Greenlet):
@@ -20,7 +20,7 @@ class RunServerInGreenlet(Greenlet):
             self._mock_server,
             log='default' if self._mock_server.debug else None,
         )
-        self._httpd.start()
+        self._httpd.serve_forever()
 
     def stop(self):
         if self._httpd:
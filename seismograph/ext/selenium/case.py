@@ -289,27 +289,36 @@ class SeleniumCase(case.Case):
     __assertion_class__ = SeleniumAssertion
 
     def __init__(self, *args, **kwargs):
-        if self.__require_browser__:
-            kwargs.update(use_flows=False)
-    
-            super(SeleniumCase, self).__init__(*args, **kwargs)
+        super(SeleniumCase, self).__init__(*args, **kwargs)
 
-            if steps.is_step_by_step_case(self):
-                step_methods = []
-
-                for step_method in steps.get_step_methods(self):
-                    step_methods.append(require_browser(step_method))
-
-                setattr(self.__class__, steps.STEPS_STORAGE_ATTRIBUTE_NAME, step_methods)
-            else:
-                method = getattr(self.__class__, runnable.method_name(self))
-                setattr(self.__class__, runnable.method_name(self), require_browser(method))
+        if not self.__require_browser__:
+            self.page = None
 
-                case.apply_flows(self)
+    @classmethod
+    def __compile__(cls, method_name):
+        if not cls.__require_browser__:
+            return super(SeleniumCase, cls).__compile__(method_name)
+
+        if steps.is_step_by_step_case(cls):
+            setattr(
+                cls,
+                steps.STEPS_STORAGE_ATTRIBUTE_NAME,
+                [
+                    case.compile_method(step_method, require_browser)
+                    for step_method in steps.get_step_methods(cls)
+                ],
+            )
         else:
-            super(SeleniumCase, self).__init__(*args, **kwargs)
+            decorators = [require_browser]
 
-            self.page = None
+            if cls.__flows__:
+                decorators.append(case.flows(*cls.__flows__))
+
+            setattr(
+                cls,
+                method_name,
+                case.compile_method(getattr(cls, method_name), *decorators),
+            )
 
     def __reason__(self):
         selenium = self.ext(EX_NAME)
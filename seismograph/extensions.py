@@ -1,10 +1,41 @@
 # -*- coding: utf-8 -*-
 
+"""
+Extensions are shared between runnable objects by name.
+
+Scope of extension defines how long instance of extension lives:
+    * run - one instance for run (for each process in multiprocessing)
+    * worker - one instance for each thread of each process
+    * suite - one instance for suite and its cases
+    * case - new instance for each case
+
+Instance which can be reset is returned to pool when its scope is ended
+and is reused instead of creating new one.
+Reset hook is given on setting of extension
+or is "__reset__" method of instance.
+
+Data has no scope, deep copy of data is given each time.
+"""
+
+import os
+import logging
+import threading
 from copy import deepcopy
 
 from .exceptions import ExtensionNotFound
 
 
+logger = logging.getLogger(__name__)
+
+
+RUN_SCOPE = 'run'
+WORKER_SCOPE = 'worker'
+SUITE_SCOPE = 'suite'
+CASE_SCOPE = 'case'
+
+SCOPES = (RUN_SCOPE, WORKER_SCOPE, SUITE_SCOPE, CASE_SCOPE)
+
+
 _TMP = {}
 _WAS_CLEAR = False
 
@@ -19,15 +50,39 @@ def add_options(ext, parser):
         ext.__add_options__(parser)
 
 
+def get_scope_key(scope, suite_name=None):
+    if scope == RUN_SCOPE:
+        return RUN_SCOPE
+
+    if scope == WORKER_SCOPE:
+        return os.getpid(), threading.current_thread().ident
+
+    if scope == SUITE_SCOPE:
+        return suite_name
+
+    return None
+
+
 class ExtensionContainer(object):
 
-    def __init__(self, ext, args=None, kwargs=None):
+    def __init__(self, ext, args=None, kwargs=None, scope=CASE_SCOPE, reset=None):
+        if scope not in SCOPES:
+            raise ValueError(
+                'Unknown scope of extension "{}"'.format(scope),
+            )
+
         self.__ext = ext
         self.__args = args or tuple()
         self.__kwargs = kwargs or dict()
+        self.__scope = scope
+        self.__reset = reset
 
-    def __call__(self):
-        return self.__ext(*self.__args, **self.__kwargs)
+        self.__lock = threading.Lock()
+        self.__pool = []
+        self.__instances = {}
+
+    def __call__(self, suite_name=None):
+        return self.acquire(suite_name=suite_name)
 
     @property
     def ext(self):
@@ -41,25 +96,105 @@ class ExtensionContainer(object):
     def kwargs(self):
         return self.__kwargs
 
+    @property
+    def scope(self):
+        return self.__scope
+
+    def create(self):
+        return self.__ext(*self.__args, **self.__kwargs)
+
+    def reset(self, instance):
+        """
+        Returns True if instance was reset and can be reused
+        """
+        if self.__reset is not None:
+            self.__reset(instance)
+            return True
+
+        if hasattr(instance, '__reset__'):
+            instance.__reset__()
+            return True
+
+        return False
+
+    def acquire(self, suite_name=None, pool=True):
+        """
+        :param pool: instance of case scope can be taken from pool.
+            Should be False if instance will not be released.
+        """
+        key = get_scope_key(self.__scope, suite_name=suite_name)
+
+        if key is None:
+            instance = None
+
+            if pool:
+                with self.__lock:
+                    instance = self.__pool.pop() if self.__pool else None
+
+            # instance of case scope is created without lock
+            return self.create() if instance is None else instance
+
+        with self.__lock:
+            if key not in self.__instances:
+                self.__instances[key] = self.__pool.pop() if self.__pool else self.create()
+
+            return self.__instances[key]
+
+    def release(self, instance):
+        """
+        Instance of case scope is returned to pool if it can be reset.
+        Instances of other scopes live until end of their scope.
+        """
+        if self.__scope == CASE_SCOPE:
+            self.__put(instance)
+
+    def release_key(self, key):
+        with self.__lock:
+            instance = self.__instances.pop(key, None)
+
+        if instance is not None:
+            self.__put(instance)
+
+    def __put(self, instance):
+        try:
+            can_reuse = self.reset(instance)
+        except BaseException as error:
+            logger.warning(
+                'Can not reset extension "{}": {}'.format(self.__ext, error),
+            )
+            return
+
+        if can_reuse:
+            with self.__lock:
+                self.__pool.append(instance)
+
 
 class SingletonExtensionContainer(ExtensionContainer):
 
     def __init__(self, *args, **kwargs):
+        kwargs.setdefault('scope', RUN_SCOPE)
         super(SingletonExtensionContainer, self).__init__(*args, **kwargs)
 
-        self.__instance = None
 
-    def __call__(self):
-        if self.__instance is None:
-            self.__instance = super(
-                SingletonExtensionContainer, self,
-            ).__call__()
-        return self.__instance
+class DataContainer(ExtensionContainer):
+    """
+    Deep copy of data is given each time,
+    so changes of data are not seen by other cases
+    """
+
+    def create(self):
+        return deepcopy(self.ext)
+
+    def acquire(self, suite_name=None, pool=True):
+        return self.create()
+
+    def release(self, instance):
+        pass
 
 
-def get(name):
+def get_container(name):
     try:
-        container = _TMP[name]
+        return _TMP[name]
     except KeyError:
         if _WAS_CLEAR:
             raise RuntimeError(
@@ -67,24 +202,37 @@ def get(name):
             )
         raise ExtensionNotFound(name)
 
-    if isinstance(container, ExtensionContainer):
-        return container()
 
-    return deepcopy(container)
+def get(name, suite_name=None, pool=True):
+    return get_container(name).acquire(suite_name=suite_name, pool=pool)
 
 
-def set(ext, name, is_data=False, singleton=False, args=None, kwargs=None):
+def release(name, instance):
+    container = _TMP.get(name)
+
+    if container is not None:
+        container.release(instance)
+
+
+def release_suite(suite_name):
+    """
+    Instances of suite scope are released when suite was run
+    """
+    for container in list(_TMP.values()):
+        if container.scope == SUITE_SCOPE:
+            container.release_key(suite_name)
+
+
+def set(ext, name, is_data=False, singleton=False, args=None, kwargs=None, scope=None, reset=None):
+    if scope is None:
+        scope = RUN_SCOPE if singleton else CASE_SCOPE
+
     if is_data:
-        _TMP[name] = ext
+        _TMP[name] = DataContainer(ext)
     else:
-        if singleton:
-            _TMP[name] = SingletonExtensionContainer(
-                ext, args=args, kwargs=kwargs,
-            )
-        else:
-            _TMP[name] = ExtensionContainer(
-                ext, args=args, kwargs=kwargs,
-            )
+        _TMP[name] = ExtensionContainer(
+            ext, args=args, kwargs=kwargs, scope=scope, reset=reset,
+        )
 
 
 def clear():
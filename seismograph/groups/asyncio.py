@@ -0,0 +1,239 @@
+# -*- coding: utf-8 -*-
+
+"""
+Groups for run on asyncio event loop.
+Test methods, setup, teardown and layer hooks can be coroutine functions.
+"""
+
+from __future__ import absolute_import
+
+import sys
+import asyncio
+import inspect
+from functools import partial
+
+from six.moves import _thread
+
+from .. import case as _case
+from .. import suite as _suite
+from .. import runnable
+from ..result import LogCapture
+from ..groups import get_pool_size_of_value
+from ..exceptions import ALLOW_RAISED_EXCEPTIONS
+
+
+async def maybe_await(value):
+    if inspect.isawaitable(value):
+        return await value
+    return value
+
+
+async def call(callback, *args):
+    if isinstance(callback, (AsyncioSuiteGroup, AsyncioCaseGroup)):
+        return await callback.__arun__(*args)
+
+    if isinstance(callback, runnable.RunnableGroup):
+        # group of other kind blocks loop while it is run
+        loop = asyncio.get_event_loop()
+        return await loop.run_in_executor(None, partial(callback, *args))
+
+    return await maybe_await(callback(*args))
+
+
+async def call_chain(chain):
+    with chain.guard():
+        for callback in chain.callbacks:
+            await call(callback, *chain.args)
+
+
+async def run_flow(flow):
+    """
+    The same as runnable.run_flow but coroutines of chains are awaited
+    """
+    try:
+        chain = next(flow)
+
+        while True:
+            try:
+                await call_chain(chain)
+            except BaseException:
+                chain = flow.throw(*sys.exc_info())
+            else:
+                chain = next(flow)
+    except StopIteration:
+        pass
+
+
+def is_flow_of(runnable_object, cls):
+    """
+    Flow is not used if __run__ of runnable object was overridden
+    """
+    return type(runnable_object).__run__ is cls.__run__
+
+
+async def gather(coroutines):
+    tasks = [asyncio.ensure_future(c) for c in coroutines]
+
+    try:
+        await asyncio.gather(*tasks)
+    except ALLOW_RAISED_EXCEPTIONS:
+        for task in tasks:
+            task.cancel()
+        raise
+
+
+def current_task():
+    try:
+        if hasattr(asyncio, 'current_task'):
+            return asyncio.current_task()
+        return asyncio.Task.current_task()
+    except RuntimeError:  # loop is not running
+        return None
+
+
+def get_context_key():
+    """
+    Logs are captured for each task of loop
+    """
+    task = current_task()
+
+    if task is None:
+        return _thread.get_ident()
+
+    return id(task)
+
+
+def run_until_complete(coroutine):
+    LogCapture.stream.key_function = get_context_key
+    loop = asyncio.new_event_loop()
+
+    try:
+        return loop.run_until_complete(coroutine)
+    finally:
+        loop.close()
+
+
+async def run_case(case, result):
+    """
+    Flow of case is run with awaiting of coroutines
+    """
+    if is_flow_of(case, _case.Case):
+        await run_flow(case.__flow__(result))
+    else:
+        case(result)
+
+
+async def run_resolved_case(case, result):
+    """
+    Result of case is known without run
+    """
+    await run_flow(case.__flow__(result))
+
+
+async def run_repeated_case(case, result):
+    case = _case.build_case(case)
+    run = run_resolved_case if _case.is_resolved(case) else run_case
+
+    if case.__repeatable__ and case.config.REPEAT > 0:
+        for _ in range(case.config.REPEAT):
+            await run(case, result)
+    else:
+        await run(case, result)
+
+
+async def run_box(box, result, semaphore):
+    """
+    Cases of box are run concurrently between setup_class and teardown_class
+    """
+    cases = [_case.build_case(case) for case in box]
+
+    # class is not set up for cases which will not be run
+    for case in cases:
+        if _case.is_resolved(case):
+            await run_repeated_case(case, result)
+
+    cases = [case for case in cases if not _case.is_resolved(case)]
+
+    if not cases:
+        return
+
+    try:
+        with cases[0].phases.measure(_case.SETUP_CLASS_PHASE):
+            await maybe_await(_case.setup_class_proxy(cases[0]))
+    except BaseException:
+        runnable.stopped_on(cases[0], 'setup_class')
+        raise
+
+    await gather(
+        target(semaphore, run_repeated_case, case, result) for case in cases
+    )
+
+    try:
+        await maybe_await(_case.teardown_class_proxy(cases[-1]))
+    except BaseException:
+        runnable.stopped_on(cases[-1], 'teardown_class')
+        raise
+
+
+async def run_suite(suite, result):
+    """
+    Flow of suite is run with awaiting of coroutines
+    """
+    if is_flow_of(suite, _suite.Suite):
+        await run_flow(suite.__flow__(result))
+    else:
+        suite(result)
+
+
+async def target(semaphore, run, runnable_object, result):
+    async with semaphore:
+        await run(runnable_object, result)
+
+
+class AsyncioSuiteGroup(runnable.RunnableGroup):
+
+    def __run__(self, result):
+        self._is_run = True
+
+        run_until_complete(
+            self.__arun__(result),
+        )
+
+    async def __arun__(self, result):
+        self._is_run = True
+
+        semaphore = asyncio.Semaphore(
+            get_pool_size_of_value(self.config.ASYNC_SUITES),
+        )
+
+        await gather(
+            target(semaphore, run_suite, suite, result)
+            for suite in self.objects
+        )
+
+
+class AsyncioCaseGroup(runnable.RunnableGroup):
+
+    def __run__(self, result):
+        self._is_run = True
+
+        run_until_complete(
+            self.__arun__(result),
+        )
+
+    async def __arun__(self, result):
+        self._is_run = True
+
+        semaphore = asyncio.Semaphore(
+            get_pool_size_of_value(self.config.ASYNC_TESTS, in_two=True),
+        )
+
+        coroutines = []
+
+        for case in self.objects:
+            if isinstance(case, _case.CaseBox):
+                coroutines.append(run_box(case, result, semaphore))
+            else:
+                coroutines.append(target(semaphore, run_repeated_case, case, result))
+
+        await gather(coroutines)
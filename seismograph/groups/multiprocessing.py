@@ -2,29 +2,188 @@
 
 from __future__ import absolute_import
 
+import time
+import logging
+from threading import Lock
+from itertools import groupby
+from contextlib import contextmanager
+
+from .. import events
+from .. import history
+from .. import last_failed
 from .. import runnable
 from ..case import CaseBox
+from ..case import reset_class_proxies
 from ..xunit import XUnitData
-from ..utils.common import waiting_for
+from ..exceptions import WorkerError
+from ..utils.mp import get_rss_size
+from ..utils.common import measure_time
 from ..groups import get_pool_size_of_value
+from ..exceptions import ALLOW_RAISED_EXCEPTIONS
 
 
-MPProcess = mp_manager = None
+logger = logging.getLogger(__name__)
+
+
+POLL_DELAY = 0.01
+MAX_SUITE_ATTEMPTS = 2
+
+# worker which is released is expected to exit quickly
+RELEASE_JOIN_TIMEOUT = 5
+
+RESULT_EVENT = 'result'
+SUITE_DONE_EVENT = 'suite_done'
+
+
+MPProcess = MPPipe = None
 
 
 def import_mp():
-    global MPProcess, mp_manager
+    global MPProcess, MPPipe
 
+    from multiprocessing import Pipe
     from multiprocessing import Process
-    from multiprocessing import Manager
 
+    MPPipe = Pipe
     MPProcess = Process
-    mp_manager = Manager()
 
 
-def target(suite, mp_result):
-    suite(mp_result)
-    mp_result.save_result()
+def should_recycle(done, max_suites=None, max_rss=None):
+    if max_suites and done >= max_suites:
+        return True
+
+    if max_rss:
+        rss_size = get_rss_size()
+
+        if rss_size is not None and rss_size >= max_rss:
+            return True
+
+    return False
+
+
+def rebox(cases):
+    for box, items in groupby(cases, key=lambda item: item[0]):
+        if box is None:
+            for _, case in items:
+                yield case
+        else:
+            yield box.__class__(
+                [case for _, case in items],
+            )
+
+
+def split_suite(suite, num, weight=None):
+    """
+    Split cases of suite to parts of equal weight.
+    Number of parts is around num. Order of cases is saved
+    and cases of one box are placed to the same box in each part.
+    """
+    cases = []
+
+    for obj in suite:
+        if isinstance(obj, CaseBox):
+            cases.extend((obj, case) for case in obj)
+        else:
+            cases.append((None, obj))
+
+    if not cases:
+        return
+
+    weights = [weight(case) for _, case in cases] if weight else []
+
+    if sum(weights) <= 0:
+        weights = [1 for _ in cases]
+
+    limit = sum(weights) / float(num)
+    part, part_weight = [], 0
+
+    for item, item_weight in zip(cases, weights):
+        part.append(item)
+        part_weight += item_weight
+
+        if part_weight >= limit:
+            yield list(rebox(part))
+            part, part_weight = [], 0
+
+    if part:
+        yield list(rebox(part))
+
+
+def run_unit(unit, result):
+    suite, cases = unit
+
+    if cases is None:
+        suite(result)
+    else:
+        # setup_class and teardown_class should be called
+        # for each part of case box which was run by worker
+        for case in cases:
+            if isinstance(case, CaseBox):
+                for c in case:
+                    reset_class_proxies(c)
+                    break
+
+        suite(result, cases=cases)
+
+
+def target(conn, units, mp_result, max_suites=None, max_rss=None):
+    done = 0
+
+    mp_result.start_stream(conn)
+
+    while True:
+        index = conn.recv()
+
+        if index is None:
+            break
+
+        mp_result.start_unit(index)
+
+        try:
+            run_unit(units[index], mp_result)
+        except ALLOW_RAISED_EXCEPTIONS:
+            mp_result.current_state.should_stop = True
+
+        done += 1
+        recycle = should_recycle(
+            done, max_suites=max_suites, max_rss=max_rss,
+        )
+
+        mp_result.send(SUITE_DONE_EVENT, index, recycle)
+
+        if recycle or mp_result.current_state.should_stop:
+            break
+
+
+class StreamResultProxy(object):
+    """
+    Result proxy of suite inside worker process.
+    Result of each case is sent to parent process as soon as case is done.
+    """
+
+    def __init__(self, mp_result, suite, result_proxy):
+        self.__suite = suite
+        self.__mp_result = mp_result
+        self.__result_proxy = result_proxy
+
+    def __getattr__(self, item):
+        return getattr(self.__result_proxy, item)
+
+    @contextmanager
+    def proxy(self, runnable_object=None, timer=None):
+        if runnable_object:
+            with self.__result_proxy.proxy(runnable_object, timer=timer) as result_proxy:
+                yield result_proxy
+            return
+
+        result_proxy = self.__result_proxy.create_proxy()
+
+        try:
+            yield result_proxy
+        finally:
+            result_proxy.freeze_phases()
+            result_proxy.console.flush()
+            self.__mp_result.send_result(self.__suite, result_proxy)
 
 
 class MPResult(object):
@@ -33,9 +192,13 @@ class MPResult(object):
 
     def __init__(self, result):
         self.result = result
-        self.queue = mp_manager.Queue()
 
-        self.result.support_mp(mp_manager)
+        self.__unit = None
+        self.__conn = None
+        self.__lock = None
+        self.__live_proxies = {}
+
+        self.result.support_mp()
 
     def __getattr__(self, item):
         return getattr(self.result, item)
@@ -43,153 +206,475 @@ class MPResult(object):
     @staticmethod
     def pack_result_storage(storage):
         return [
-            (runnable.id, xunit_data.to_marshal())
-            for runnable, xunit_data in storage
+            (record.id, record.description, xunit_data.to_marshal())
+            for record, xunit_data in storage
         ]
 
     def unpack_result_storage(self, storage):
-        for runnable_id, xunit_data in storage:
-            yield self.MATCH[runnable_id], XUnitData.from_marshal(xunit_data)
+        for runnable_id, description, xunit_data in storage:
+            record = runnable.record(self.MATCH[runnable_id])
+            record.description = description
+
+            yield record, XUnitData.from_marshal(xunit_data)
+
+    def pack_result(self, result_proxy):
+        return (
+            self.pack_result_storage(result_proxy.successes),
+            self.pack_result_storage(result_proxy.skipped),
+            self.pack_result_storage(result_proxy.failures),
+            self.pack_result_storage(result_proxy.errors),
+        )
+
+    def unpack_result(self, packed):
+        successes, skipped, failures, errors = packed
+
+        result_proxy = self.create_proxy()
+
+        result_proxy.errors.extend(
+            self.unpack_result_storage(errors),
+        )
+        result_proxy.successes.extend(
+            self.unpack_result_storage(successes),
+        )
+        result_proxy.skipped.extend(
+            self.unpack_result_storage(skipped),
+        )
+        result_proxy.failures.extend(
+            self.unpack_result_storage(failures),
+        )
+
+        return result_proxy
 
     def match(self, suite):
         self.MATCH[suite.id] = suite
-        suite.support_mp(mp_manager)
+        suite.support_mp()
 
         for case in suite:
             if isinstance(case, CaseBox):
                 for c in case:
                     self.MATCH[c.id] = c
-                    c.support_mp(mp_manager)
+                    c.support_mp()
             else:
                 self.MATCH[case.id] = case
-                case.support_mp(mp_manager)
+                case.support_mp()
+
+    #
+    # Worker side
+    #
+
+    def start_stream(self, conn):
+        self.__conn = conn
+        self.__lock = Lock()
+
+    def start_unit(self, index):
+        self.__unit = index
+
+    def send(self, *event):
+        with self.__lock:
+            self.__conn.send(event)
+
+    def send_result(self, suite, result_proxy, runtime=None):
+        self.send(
+            RESULT_EVENT,
+            self.__unit,
+            suite.id,
+            runtime,
+            self.pack_result(result_proxy),
+        )
 
-    def save_result(self):
-        if self.result.proxies:
-            self.queue.put(
-                (
-                    self.result.proxies[0].name,
-                    self.result.proxies[0].runtime,
+    @contextmanager
+    def proxy(self, runnable_object=None, timer=None):
+        if self.__conn is None:
+            with self.result.proxy(runnable_object, timer=timer) as result_proxy:
+                yield result_proxy
+            return
 
-                    self.pack_result_storage(
-                        self.result.successes,
-                    ),
-                    self.pack_result_storage(
-                        self.result.skipped,
-                    ),
-                    self.pack_result_storage(
-                        self.result.failures,
-                    ),
-                    self.pack_result_storage(
-                        self.result.errors,
-                    ),
-                ),
+        result_proxy = self.create_proxy(
+            name=runnable.class_name(runnable_object),
+        )
+        result_proxy.set_timer(timer)
+
+        try:
+            yield StreamResultProxy(self, runnable_object, result_proxy)
+        finally:
+            result_proxy.stop_timer()
+            result_proxy.freeze_phases()
+            result_proxy.console.flush()
+            self.send_result(
+                runnable_object, result_proxy, runtime=result_proxy.runtime,
             )
 
-    def sync(self):
-        while not self.queue.empty():
-            name, runtime, successes, skipped, failures, errors = self.queue.get()
+    #
+    # Parent side
+    #
 
-            result_proxy = self.create_proxy(
-                name=name,
+    def get_live_proxy(self, suite):
+        try:
+            return self.__live_proxies[suite.id]
+        except KeyError:
+            live_proxy = self.create_proxy(
+                name=runnable.class_name(suite),
             )
-            result_proxy.runtime = runtime
+            live_proxy.runtime = float()
 
-            result_proxy.errors.extend(
-                self.unpack_result_storage(errors),
-            )
-            result_proxy.successes.extend(
-                self.unpack_result_storage(successes),
-            )
-            result_proxy.skipped.extend(
-                self.unpack_result_storage(skipped),
-            )
-            result_proxy.failures.extend(
-                self.unpack_result_storage(failures),
-            )
+            self.result.proxies.append(live_proxy)
+            self.result.event(events.SUITE_START, name=live_proxy.name)
+            self.__live_proxies[suite.id] = live_proxy
+
+            return live_proxy
+
+    def merge(self, suite, result_proxy, runtime=None):
+        live_proxy = self.get_live_proxy(suite)
+
+        if runtime is not None:
+            live_proxy.runtime += runtime
+
+        live_proxy.extend(result_proxy)
+        self.result.extend(result_proxy)
+
+    def done(self, suite):
+        live_proxy = self.__live_proxies.get(suite.id)
 
-            self.result.extend(result_proxy)
-            self.result.proxies.append(result_proxy)
+        if live_proxy is not None:
+            self.result.report(live_proxy)
+            self.result.event_of_suite(live_proxy)
+
+    def merge_packed(self, suite_id, runtime, packed):
+        self.merge(
+            self.MATCH[suite_id], self.unpack_result(packed), runtime=runtime,
+        )
+
+
+class Worker(object):
+    """
+    Long-lived process which receives indexes
+    of work units over pipe and sends results back
+    """
+
+    def __init__(self, units, mp_result, max_suites=None, max_rss=None):
+        self.conn, child_conn = MPPipe()
+
+        self.process = MPProcess(
+            target=target,
+            args=(child_conn, units, mp_result),
+            kwargs={
+                'max_rss': max_rss,
+                'max_suites': max_suites,
+            },
+        )
+
+        self.timer = None
+        self.current = None
+
+        # stream should not be in writing when process is forked
+        mp_result.console.wait()
+        self.process.start()
+
+    @property
+    def is_busy(self):
+        return self.current is not None
+
+    def is_alive(self):
+        return self.process.is_alive()
+
+    def send(self, index):
+        self.current = index
+        self.timer = measure_time()
+        self.conn.send(index)
+
+    def receive(self):
+        if not self.conn.poll():
+            return None
+
+        try:
+            return self.conn.recv()
+        except (EOFError, IOError):
+            return None
+
+    def release(self):
+        self.timer = None
+        self.current = None
+
+    def stop(self):
+        try:
+            self.conn.send(None)
+        except (EOFError, IOError):
+            pass
+
+    def join(self, timeout=None):
+        self.process.join(timeout=timeout)
+
+    def terminate(self):
+        if self.process.is_alive():
+            self.process.terminate()
 
 
 class Multiprocessing(object):
 
-    def __init__(self, result, config, suites=None):
+    def __init__(self, result, config, suites=None, runtime_history=None):
         self.queue = []
-        self.stack = []
+        self.units = []
+        self.workers = []
+        self.attempts = {}
+        self.reported = set()
+        self.remaining = {}
 
         self.mp_result = MPResult(result)
         self.release_timeout = config.MULTIPROCESSING_TIMEOUT
         self.max_processes = get_pool_size_of_value(config.ASYNC_SUITES)
+        self.max_rss = config.MULTIPROCESSING_WORKER_MAX_RSS
+        self.max_suites = config.MULTIPROCESSING_WORKER_MAX_SUITES
+        self.split_suites = config.MULTIPROCESSING_SPLIT_SUITES
+        self.history = runtime_history
+
+        if config.LPT and self.history is None:
+            self.history = history.load(config)
+
+        self.last_failed = last_failed.load(config) if config.FAILED_FIRST else None
 
         if suites:
             self.add_suites(suites)
 
+        if self.history:
+            self.queue.sort(key=self.expected_runtime, reverse=True)
+
+        if self.last_failed:
+            self.queue.sort(key=lambda i: not self.is_failed(i))
+
     def __enter__(self):
         return self
 
     def __exit__(self, *args, **kwargs):
-        self.terminate_all()
+        self.stop_all()
         self.join_all()
-        self.mp_result.sync()
+        self.terminate_all()
+
+    @property
+    def should_stop(self):
+        return self.mp_result.current_state.should_stop
+
+    def expected_runtime(self, index):
+        suite, cases = self.units[index]
+
+        if cases is None:
+            return self.history.expected_runtime(suite)
+
+        return sum(self.history.expected_runtime(c) for c in cases)
+
+    def is_failed(self, index):
+        suite, cases = self.units[index]
+
+        if cases is None:
+            return self.last_failed.is_failed(suite)
+
+        return any(self.last_failed.is_failed(c) for c in cases)
+
+    def add_unit(self, suite, cases=None):
+        self.queue.append(len(self.units))
+        self.units.append((suite, cases))
+        self.remaining[suite.id] = self.remaining.get(suite.id, 0) + 1
+
+    def unit_done(self, index):
+        suite, _ = self.units[index]
+        self.remaining[suite.id] -= 1
+
+        if not self.remaining[suite.id]:
+            self.mp_result.done(suite)
 
     def add_suite(self, suite):
         self.mp_result.match(suite)
 
-        self.queue.append(
-            MPProcess(
-                target=target,
-                args=(suite, self.mp_result),
-            ),
-        )
+        if self.split_suites:
+            weight = self.history.expected_runtime if self.history else None
+
+            for cases in split_suite(suite, self.max_processes, weight=weight):
+                self.add_unit(suite, cases=cases)
+        else:
+            self.add_unit(suite)
 
     def add_suites(self, suites):
         for suite in suites:
             self.add_suite(suite)
 
-    def try_release(self):
-        for process in self.stack[::-1]:
-            if not process.is_alive():
-                process.join(timeout=self.release_timeout)
-                self.stack.remove(process)
-
-    def is_release(self):
-        self.try_release()
-        return len(self.stack) < self.max_processes
-
-    def wait_release(self):
-        waiting_for(
-            self.is_release,
-            timeout=self.release_timeout,
-            message='Process list have not been release for "{}" sec.'.format(
-                self.release_timeout,
-            )
+    def start_worker(self):
+        logger.debug('Start multiprocessing worker')
+
+        worker = Worker(
+            self.units,
+            self.mp_result,
+            max_rss=self.max_rss,
+            max_suites=self.max_suites,
         )
+        self.workers.append(worker)
+
+        return worker
+
+    def release_worker(self, worker):
+        worker.join(timeout=RELEASE_JOIN_TIMEOUT)
+        worker.terminate()
+        self.workers.remove(worker)
+
+    def add_lost_suite(self, index, runtime, error):
+        suite, _ = self.units[index]
+
+        logger.debug(
+            'Suite "{}" was lost by multiprocessing worker'.format(suite.name),
+        )
+
+        result_proxy = self.mp_result.create_proxy()
+        result_proxy.add_error(
+            suite, error.message, runtime, error,
+        )
+        result_proxy.console.flush()
+
+        self.mp_result.merge(suite, result_proxy, runtime=runtime)
+        self.unit_done(index)
+
+    def reschedule(self, index, runtime):
+        self.attempts[index] = self.attempts.get(index, 0) + 1
+
+        # results which were streamed already can not be revoked,
+        # so suite is rescheduled only if it did not report anything
+        if index in self.reported:
+            self.add_lost_suite(
+                index,
+                runtime,
+                WorkerError('Worker process died while suite was running'),
+            )
+        elif self.attempts[index] < MAX_SUITE_ATTEMPTS:
+            self.queue.insert(0, index)
+        else:
+            self.add_lost_suite(
+                index,
+                runtime,
+                WorkerError(
+                    'Worker process died {} times on suite'.format(
+                        self.attempts[index],
+                    ),
+                ),
+            )
+
+    def handle_event(self, worker, event):
+        event_type = event[0]
+
+        if event_type == RESULT_EVENT:
+            _, index, suite_id, runtime, packed = event
+            self.reported.add(index)
+            self.mp_result.merge_packed(suite_id, runtime, packed)
+        elif event_type == SUITE_DONE_EVENT:
+            _, index, recycle = event
+            worker.release()
+            self.unit_done(index)
+
+            if recycle:
+                logger.debug('Recycle multiprocessing worker')
+                self.release_worker(worker)
+
+    def check_worker(self, worker):
+        has_events = False
+        event = worker.receive()
+
+        while event is not None:
+            has_events = True
+            self.handle_event(worker, event)
+
+            if worker not in self.workers:
+                return True
+
+            event = worker.receive()
+
+        if has_events:
+            return True
+
+        if worker.is_busy and worker.timer() > self.release_timeout:
+            index, runtime = worker.current, worker.timer()
+            worker.terminate()
+            self.release_worker(worker)
+            self.add_lost_suite(
+                index,
+                runtime,
+                WorkerError(
+                    'Suite was not released for "{}" sec.'.format(
+                        self.release_timeout,
+                    ),
+                ),
+            )
+            return True
+
+        if not worker.is_alive():
+            index, runtime = worker.current, worker.timer and worker.timer()
+            self.release_worker(worker)
+
+            if index is not None:
+                self.reschedule(index, runtime)
+
+            return True
+
+        return False
+
+    def send_unit(self, worker):
+        index = self.queue.pop(0)
+        suite, _ = self.units[index]
+
+        # suite is started when its first unit is sent to worker
+        self.mp_result.get_live_proxy(suite)
+
+        worker.send(index)
+
+    def dispatch(self):
+        for worker in self.workers:
+            if not self.queue:
+                break
+
+            if not worker.is_busy:
+                self.send_unit(worker)
+
+        while self.queue and len(self.workers) < self.max_processes:
+            self.send_unit(self.start_worker())
+
+    def stop_all(self):
+        for worker in self.workers:
+            worker.stop()
 
     def join_all(self):
-        for process in self.stack:
-            process.join(timeout=self.release_timeout)
+        for worker in self.workers:
+            worker.join(timeout=self.release_timeout)
 
     def terminate_all(self):
-        for process in self.stack:
-            process.terminate()
+        for worker in self.workers:
+            worker.terminate()
 
     def serve(self):
-        while self.queue:
-            process = self.queue.pop()
-            process.start()
-            self.stack.append(process)
-            self.wait_release()
+        while self.queue or any(w.is_busy for w in self.workers):
+            has_changes = False
 
-        self.join_all()
+            for worker in self.workers[::-1]:
+                has_changes = self.check_worker(worker) or has_changes
+
+            if self.should_stop:
+                del self.queue[:]
+            else:
+                self.dispatch()
+
+            if not has_changes:
+                time.sleep(POLL_DELAY)
 
 
 class MultiprocessingSuiteGroup(runnable.RunnableGroup):
 
+    def __init__(self, objects, config, runtime_history=None):
+        super(MultiprocessingSuiteGroup, self).__init__(objects, config)
+
+        self.__runtime_history = runtime_history
+
     def __run__(self, result):
         self._is_run = True
 
         import_mp()
 
-        with Multiprocessing(result, self.config, suites=self.objects) as mp:
+        with Multiprocessing(
+                result,
+                self.config,
+                suites=self.objects,
+                runtime_history=self.__runtime_history) as mp:
             mp.serve()
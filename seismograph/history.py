@@ -0,0 +1,189 @@
+# -*- coding: utf-8 -*-
+
+"""
+Runtime history of suites and tests.
+Can be used to run the longest work first.
+"""
+
+import os
+import json
+import logging
+
+from . import loader
+from . import runnable
+from .utils import pyv
+from .case import Case
+from .case import CaseBox
+from .case import CaseSpec
+from .suite import Suite
+
+
+logger = logging.getLogger(__name__)
+
+
+# weight of last runtime when runtime is merged with history
+SMOOTHING = 0.5
+
+
+def get_test_key(case):
+    return u'{}:{}'.format(
+        runnable.class_name(case), runnable.method_name(case),
+    )
+
+
+def merge_runtime(old, new):
+    if old is None:
+        return new
+    return round(old + (new - old) * SMOOTHING, 6)
+
+
+def is_cached(result):
+    """
+    Every test of result was taken from cache
+    """
+    state = result.get_state()
+    return state.tests > 0 and state.cached == state.tests
+
+
+class History(object):
+
+    def __init__(self, suites=None, tests=None):
+        self.__suites = suites or {}
+        self.__tests = tests or {}
+
+        self.__default_runtime = None
+
+    def __nonzero__(self):
+        return bool(self.__suites or self.__tests)
+
+    def __bool__(self):  # please python 3
+        return self.__nonzero__()
+
+    @classmethod
+    def from_file(cls, path):
+        if not os.path.isfile(path):
+            logger.debug(
+                'History file "{}" does not exist'.format(path),
+            )
+            return cls()
+
+        logger.debug('Load history from "{}"'.format(path))
+
+        try:
+            with open(path) as fp:
+                data = json.load(fp)
+        except ValueError:
+            logger.warning(
+                'History file "{}" is corrupted and will be ignored'.format(path),
+            )
+            return cls()
+
+        return cls(
+            suites=data.get('suites'),
+            tests=data.get('tests'),
+        )
+
+    @property
+    def suites(self):
+        return self.__suites
+
+    @property
+    def tests(self):
+        return self.__tests
+
+    @property
+    def default_runtime(self):
+        """
+        Runtime of test which is not in history yet
+        """
+        if self.__default_runtime is None:
+            if self.__tests:
+                self.__default_runtime = sum(self.__tests.values()) / len(self.__tests)
+            else:
+                self.__default_runtime = float()
+
+        return self.__default_runtime
+
+    def to_file(self, path):
+        logger.debug('Save history to "{}"'.format(path))
+
+        tmp_path = '{}.tmp'.format(path)
+
+        with open(tmp_path, 'w') as fp:
+            json.dump(
+                {
+                    'suites': self.__suites,
+                    'tests': self.__tests,
+                },
+                fp,
+                sort_keys=True,
+            )
+
+        pyv.replace(tmp_path, path)
+
+    def expected_runtime(self, obj):
+        if isinstance(obj, Suite):
+            runtime = self.__suites.get(obj.name)
+
+            if runtime is None and not runnable.is_build(obj):
+                # suites are sorted before they are built
+                return sum(
+                    self.__tests.get(
+                        u'{}.{}:{}'.format(obj.name, cls.__name__, name),
+                        self.default_runtime,
+                    )
+                    for cls in obj.cases
+                    for name in loader.load_test_names_from_case(cls)
+                )
+
+            if runtime is None:
+                return sum(self.expected_runtime(o) for o in obj)
+
+            return runtime
+
+        if isinstance(obj, CaseBox):
+            return sum(self.expected_runtime(c) for c in obj)
+
+        if isinstance(obj, (Case, CaseSpec)):
+            return self.__tests.get(
+                get_test_key(obj), self.default_runtime,
+            )
+
+        return float()
+
+    def sort(self, objects):
+        """
+        Longest processing time first. Can be used instead of shuffle.
+        """
+        objects.sort(key=self.expected_runtime, reverse=True)
+
+    def update(self, result):
+        tests = {}
+
+        for storage in (result.errors, result.failures, result.successes):
+            for record, xunit_data in storage:
+                # runtime of cached success is not runtime of test
+                if record.case_name is not None and not xunit_data.cached:
+                    key = get_test_key(record)
+                    tests[key] = tests.get(key, float()) + xunit_data.runtime
+
+        for key, runtime in tests.items():
+            self.__tests[key] = merge_runtime(self.__tests.get(key), runtime)
+
+        for proxy in result.proxies:
+            if proxy.runtime is not None and not is_cached(proxy):
+                self.__suites[proxy.name] = merge_runtime(
+                    self.__suites.get(proxy.name), proxy.runtime,
+                )
+
+        self.__default_runtime = None
+
+
+def load(config):
+    return History.from_file(config.HISTORY)
+
+
+def save(result, path):
+    history = History.from_file(path)
+    history.update(result)
+    history.to_file(path)
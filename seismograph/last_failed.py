@@ -0,0 +1,220 @@
+# -*- coding: utf-8 -*-
+
+"""
+State of last failed tests.
+Can be used to run failed tests only or to run them first.
+"""
+
+import os
+import json
+import logging
+
+from . import loader
+from . import runnable
+from .utils import pyv
+from .case import Case
+from .case import CaseBox
+from .case import CaseSpec
+from .suite import Suite
+
+
+logger = logging.getLogger(__name__)
+
+
+def get_command(runnable_object):
+    """
+    Command in format of "-t" option
+    """
+    if isinstance(runnable_object, runnable.RunnableRecord):
+        if runnable_object.case_name is None:
+            return runnable_object.suite_name
+
+        return u'{}:{}.{}'.format(
+            runnable_object.suite_name,
+            runnable_object.case_name,
+            runnable_object.method_name,
+        )
+
+    if isinstance(runnable_object, Suite):
+        return runnable_object.name
+
+    if isinstance(runnable_object, Case):
+        return u'{}:{}.{}'.format(
+            runnable_object.__mount_data__.suite_name,
+            runnable_object.__class__.__name__,
+            runnable.method_name(runnable_object),
+        )
+
+    if isinstance(runnable_object, CaseSpec):
+        return u'{}:{}.{}'.format(
+            runnable_object.suite_name,
+            runnable_object.cls.__name__,
+            runnable.method_name(runnable_object),
+        )
+
+    return None
+
+
+class LastFailed(object):
+
+    def __init__(self, commands=None):
+        self.__commands = commands or []
+
+        self.__suite_names = set(
+            c.split(':')[0] for c in self.__commands
+        )
+
+    def __nonzero__(self):
+        return bool(self.__commands)
+
+    def __bool__(self):  # please python 3
+        return self.__nonzero__()
+
+    def __contains__(self, runnable_object):
+        return self.is_failed(runnable_object)
+
+    @classmethod
+    def from_file(cls, path):
+        if not os.path.isfile(path):
+            logger.debug(
+                'Last failed file "{}" does not exist'.format(path),
+            )
+            return cls()
+
+        logger.debug('Load last failed from "{}"'.format(path))
+
+        try:
+            with open(path) as fp:
+                data = json.load(fp)
+        except ValueError:
+            logger.warning(
+                'Last failed file "{}" is corrupted and will be ignored'.format(path),
+            )
+            return cls()
+
+        return cls(commands=data.get('commands'))
+
+    @property
+    def commands(self):
+        return self.__commands
+
+    def to_file(self, path):
+        logger.debug('Save last failed to "{}"'.format(path))
+
+        tmp_path = '{}.tmp'.format(path)
+
+        with open(tmp_path, 'w') as fp:
+            json.dump(
+                {
+                    'commands': self.__commands,
+                },
+                fp,
+                indent=2,
+            )
+
+        pyv.replace(tmp_path, path)
+
+    def is_failed(self, obj):
+        if isinstance(obj, Suite):
+            return obj.name in self.__suite_names
+
+        if isinstance(obj, CaseBox):
+            return any(self.is_failed(c) for c in obj)
+
+        if isinstance(obj, Case):
+            return get_command(obj) in self.__commands \
+                or obj.__mount_data__.suite_name in self.__commands
+
+        if isinstance(obj, CaseSpec):
+            return get_command(obj) in self.__commands \
+                or obj.suite_name in self.__commands
+
+        return False
+
+    def sort(self, objects):
+        """
+        Failed objects first. Order of objects is saved otherwise.
+        Failed cases go first inside of boxes too.
+        """
+        key = lambda o: not self.is_failed(o)
+
+        for obj in objects:
+            if isinstance(obj, CaseBox):
+                obj.sort(key=key)
+
+        objects.sort(key=key)
+
+    def get_commands(self, suites):
+        """
+        Commands which can be collected from suites.
+        Command of suite overrides commands of its cases.
+        """
+        suites = loader.create_suite_index(suites)
+        commands = []
+
+        for command in self.__commands:
+            suite_name, _, case_path = command.partition(':')
+            suite = suites.get(suite_name)
+
+            if suite is None:
+                logger.debug(
+                    'Suite of last failed "{}" is not found'.format(command),
+                )
+                continue
+
+            if not case_path:
+                commands.append(command)
+                continue
+
+            if suite_name in self.__commands:
+                continue
+
+            class_name = case_path.split('.')[0]
+
+            if suite.get_case_class(class_name) is None:
+                logger.debug(
+                    'Case of last failed "{}" is not found'.format(command),
+                )
+                continue
+
+            commands.append(command)
+
+        return commands
+
+    def update(self, result):
+        """
+        Commands of tests which were run by result are replaced
+        """
+        was_run = set()
+        failed = []
+
+        for storage in (result.skipped, result.successes, result.errors, result.failures):
+            for runnable_object, _ in storage:
+                was_run.add(get_command(runnable_object))
+
+        for proxy in result.proxies:
+            was_run.add(proxy.name)
+
+        for storage in (result.errors, result.failures):
+            for runnable_object, _ in storage:
+                command = get_command(runnable_object)
+
+                if command and command not in failed:
+                    failed.append(command)
+
+        self.__commands = [
+            c for c in self.__commands if c not in was_run and c not in failed
+        ] + failed
+        self.__suite_names = set(
+            c.split(':')[0] for c in self.__commands
+        )
+
+
+def load(config):
+    return LastFailed.from_file(config.LAST_FAILED_FILE)
+
+
+def save(result, path):
+    last_failed = LastFailed.from_file(path)
+    last_failed.update(result)
+    last_failed.to_file(path)
@@ -17,6 +17,24 @@ TEST_NAME_PREFIX = 'test'
 DEFAULT_TEST_NAME = 'test'
 
 
+# memo of test names is kept in dict of case class,
+# so it is not inherited by subclasses and lives while class lives
+TEST_NAMES_ATTRIBUTE_NAME = '__test_names__'
+
+# is changed when attributes of case classes are set or deleted
+test_names_version = 0
+
+
+def invalidate_test_names():
+    """
+    Test names of case classes will be loaded again.
+    Is called by metaclass of cases, should be called
+    after changing of attributes of base classes which are not cases.
+    """
+    global test_names_version
+    test_names_version += 1
+
+
 def check_path_is_exist(path):
     if not os.path.exists(path):
         raise LoaderError('Dir "{}" is not exist'.format(path))
@@ -64,19 +82,38 @@ def load_test_names_from_case(
         cls,
         test_name_prefix=None,
         default_test_name=None):
+    test_name_prefix = test_name_prefix or TEST_NAME_PREFIX
+    default_test_name = default_test_name or DEFAULT_TEST_NAME
+
     def is_test_name(name):
-        return name.startswith((test_name_prefix or TEST_NAME_PREFIX)) \
+        return name.startswith(test_name_prefix) \
             or \
-            name == (default_test_name or DEFAULT_TEST_NAME)
+            name == default_test_name
 
-    for name in sorted(dir(cls)):
-        if is_test_name(name):
-            logger.debug(
-                'Load test "{}" from case "{}.{}"'.format(
-                    name, cls.__module__, cls.__name__,
-                ),
-            )
-            yield name
+    key = (test_name_prefix, default_test_name)
+    memo = cls.__dict__.get(TEST_NAMES_ATTRIBUTE_NAME)
+
+    if memo is None:
+        memo = {}
+        setattr(cls, TEST_NAMES_ATTRIBUTE_NAME, memo)
+
+    version, test_names = memo.get(key, (None, None))
+
+    if version != test_names_version:
+        test_names = [name for name in sorted(dir(cls)) if is_test_name(name)]
+        memo[key] = test_names_version, test_names
+
+    for name in test_names:
+        logger.debug(
+            'Load test "{}" from case "{}.{}"'.format(
+                name, cls.__module__, cls.__name__,
+            ),
+        )
+        yield name
+
+
+def create_case(cls, method_name, config=None):
+    return cls(method_name, config=config)
 
 
 def load_tests_from_case(
@@ -84,6 +121,7 @@ def load_tests_from_case(
         config=None,
         box_class=None,
         method_name=None,
+        case_factory=create_case,
         test_name_prefix=None,
         default_test_name=None):
     logger.debug(
@@ -94,12 +132,12 @@ def load_tests_from_case(
 
     if method_name:
         for name in filter(lambda n: n == method_name, dir(cls)):
-            case = cls(name, config=config)
+            case = case_factory(cls, name, config=config)
             if box_class:
                 yield box_class((case, ))
             else:
                 yield case
-            raise StopIteration
+            return
         else:
             raise LoaderError(
                 'Test "{}" not found in "{}"'.format(
@@ -118,23 +156,38 @@ def load_tests_from_case(
 
             for name in names:
                 cases.append(
-                    cls(name, config=config)
+                    case_factory(cls, name, config=config)
                 )
 
             yield box_class(cases)
         else:
             for name in names:
-                yield cls(name, config=config)
+                yield case_factory(cls, name, config=config)
+
+
+def create_suite_index(suites):
+    index = {}
+
+    for suite in suites:
+        index.setdefault(suite.name, suite)
+
+    return index
 
 
 def load_suite_by_name(name, suites):
+    """
+    :param suites: list of suites or index from create_suite_index
+    """
     logger.debug(
         'Load suite "{}" from list'.format(name),
     )
 
-    for suite in filter(lambda s: s.name == name, suites):
-        return suite
-    else:
+    if not isinstance(suites, dict):
+        suites = create_suite_index(suites)
+
+    try:
+        return suites[name]
+    except KeyError:
         raise LoaderError(
             'Suite "{}" not found'.format(name),
         )
@@ -147,13 +200,15 @@ def load_case_from_suite(class_name, suite):
         ),
     )
 
-    for case_cls in filter(lambda c: c.__name__ == class_name, suite.cases):
-        return case_cls
-    else:
+    case_cls = suite.get_case_class(class_name)
+
+    if case_cls is None:
         raise LoaderError(
             'Test case "{}" not found'.format(class_name),
         )
 
+    return case_cls
+
 
 def load_suites_from_module(module, suite_class):
     logger.debug(
@@ -168,32 +223,44 @@ def load_suites_from_module(module, suite_class):
             yield value
 
 
-def load_suites_from_path(path_to_dir, suite_class, package=None, recursive=True):
-    logger.debug(
-        'Load suites from path "{}"'.format(path_to_dir),
-    )
-
+def iter_modules_from_path(path_to_dir, package=None, recursive=True):
+    """
+    Names and files of modules which can contain suites
+    """
     check_path_is_exist(path_to_dir)
 
     lst_dir = os.listdir(path_to_dir)
     full_path = lambda *n: os.path.join(path_to_dir, *n)
 
-    modules = (n.replace('.py', '') for n in lst_dir if is_py_module(n))
-
-    for module_name in modules:
-        module = load_module(module_name, package=package)
+    for file_name in lst_dir:
+        if is_py_module(file_name):
+            module_name = file_name.replace('.py', '')
 
-        for suite in load_suites_from_module(module, suite_class):
-            yield suite
+            yield (
+                '{}.{}'.format(package, module_name) if package else module_name,
+                full_path(file_name),
+            )
 
     if recursive:
         packs = (n for n in lst_dir if is_package(full_path(n)))
 
         for pack in packs:
 
-            for suite in load_suites_from_path(
+            for module in iter_modules_from_path(
                     full_path(pack),
-                    suite_class,
                     recursive=recursive,
                     package='{}.{}'.format(package, pack) if package else pack):
-                yield suite
+                yield module
+
+
+def load_suites_from_path(path_to_dir, suite_class, package=None, recursive=True):
+    logger.debug(
+        'Load suites from path "{}"'.format(path_to_dir),
+    )
+
+    for module_name, _ in iter_modules_from_path(
+            path_to_dir, package=package, recursive=recursive):
+        module = load_module(module_name)
+
+        for suite in load_suites_from_module(module, suite_class):
+            yield suite
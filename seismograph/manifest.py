@@ -0,0 +1,287 @@
+# -*- coding: utf-8 -*-
+
+"""
+Cache of collection.
+Manifest keeps suites, cases and tests of each module
+and can answer about them without import of unchanged modules.
+"""
+
+import os
+import json
+import hashlib
+import logging
+
+from . import loader
+from .utils import pyv
+
+
+logger = logging.getLogger(__name__)
+
+
+def get_file_hash(file_path):
+    with open(file_path, 'rb') as fp:
+        return hashlib.sha1(fp.read()).hexdigest()
+
+
+def get_file_stamp(file_path):
+    stat = os.stat(file_path)
+    return stat.st_mtime, stat.st_size
+
+
+def get_suite_entry(suite):
+    cases = []
+
+    for cls in suite.cases:
+        cases.append(
+            {
+                'name': cls.__name__,
+                'doc': cls.__doc__,
+                'tests': [
+                    [name, getattr(cls, name).__doc__]
+                    for name in loader.load_test_names_from_case(cls)
+                ],
+            },
+        )
+
+    return {
+        'name': suite.name,
+        'cases': cases,
+    }
+
+
+class Documented(object):
+
+    def __init__(self, doc):
+        self.__doc__ = doc
+
+
+class SuiteEntry(object):
+    """
+    Suite from manifest. Has interface of suite for tree.
+    """
+
+    def __init__(self, data):
+        self.__data = data
+
+    def __repr__(self):
+        return '<{} {}>'.format(self.__class__.__name__, self.name)
+
+    @property
+    def name(self):
+        return self.__data['name']
+
+    @property
+    def case_names(self):
+        return [c['name'] for c in self.__data['cases']]
+
+    def get_test_names(self, case_name):
+        for case in self.__data['cases']:
+            if case['name'] == case_name:
+                return [name for name, _ in case['tests']]
+        return None
+
+    def get_map(self):
+        return dict(
+            (
+                case['name'],
+                {
+                    'cls': Documented(case['doc']),
+                    'tests': dict(
+                        (name, Documented(doc)) for name, doc in case['tests']
+                    ),
+                },
+            )
+            for case in self.__data['cases']
+        )
+
+
+class Manifest(object):
+
+    def __init__(self, modules=None):
+        self.__modules = modules or {}
+        self.__is_changed = False
+
+        self.__suite_index = None
+
+    @classmethod
+    def from_file(cls, path):
+        if not os.path.isfile(path):
+            logger.debug(
+                'Manifest file "{}" does not exist'.format(path),
+            )
+            return cls()
+
+        logger.debug('Load manifest from "{}"'.format(path))
+
+        try:
+            with open(path) as fp:
+                data = json.load(fp)
+        except ValueError:
+            logger.warning(
+                'Manifest file "{}" is corrupted and will be ignored'.format(path),
+            )
+            return cls()
+
+        return cls(modules=data.get('modules'))
+
+    @property
+    def modules(self):
+        return self.__modules
+
+    @property
+    def is_changed(self):
+        return self.__is_changed
+
+    @property
+    def suite_index(self):
+        """
+        Suite name -> name of module where suite is defined
+        """
+        if self.__suite_index is None:
+            self.__suite_index = {}
+
+            for module_name in sorted(self.__modules):
+                for suite in self.__modules[module_name]['suites']:
+                    self.__suite_index.setdefault(suite['name'], module_name)
+
+        return self.__suite_index
+
+    def to_file(self, path):
+        logger.debug('Save manifest to "{}"'.format(path))
+
+        tmp_path = '{}.tmp'.format(path)
+
+        with open(tmp_path, 'w') as fp:
+            json.dump(
+                {
+                    'modules': self.__modules,
+                },
+                fp,
+                sort_keys=True,
+            )
+
+        pyv.replace(tmp_path, path)
+
+        self.__is_changed = False
+
+    def is_valid(self, module_name, file_path):
+        """
+        Module is not changed since it was added.
+        Hash of file is checked if mtime or size were changed.
+        """
+        entry = self.__modules.get(module_name)
+
+        if entry is None or entry['file'] != file_path:
+            return False
+
+        mtime, size = get_file_stamp(file_path)
+
+        if entry['mtime'] == mtime and entry['size'] == size:
+            return True
+
+        if entry['hash'] != get_file_hash(file_path):
+            return False
+
+        entry['mtime'], entry['size'] = mtime, size
+        self.__is_changed = True
+
+        return True
+
+    def add(self, module_name, file_path, suites):
+        logger.debug(
+            'Add module "{}" to manifest'.format(module_name),
+        )
+
+        mtime, size = get_file_stamp(file_path)
+
+        self.__modules[module_name] = {
+            'file': file_path,
+            'mtime': mtime,
+            'size': size,
+            'hash': get_file_hash(file_path),
+            'suites': [get_suite_entry(s) for s in suites],
+        }
+        self.__is_changed = True
+        self.__suite_index = None
+
+    def retain(self, module_names):
+        """
+        Remove modules which do not exist any more
+        """
+        for module_name in list(self.__modules):
+            if module_name not in module_names:
+                del self.__modules[module_name]
+                self.__is_changed = True
+                self.__suite_index = None
+
+    def get_suites(self, module_name):
+        return [
+            SuiteEntry(s) for s in self.__modules[module_name]['suites']
+        ]
+
+
+def load_suites_from_path(manifest, path_to_dir, suite_class, recursive=True, suite_names=None):
+    """
+    Import modules as loader does and add them to manifest.
+    If suite names are given, unchanged modules without these suites are not imported.
+    """
+    module_names = set()
+
+    if suite_names is not None:
+        required_modules = set(
+            manifest.suite_index[n] for n in suite_names if n in manifest.suite_index
+        )
+    else:
+        required_modules = None
+
+    for module_name, file_path in loader.iter_modules_from_path(
+            path_to_dir, recursive=recursive):
+        file_path = os.path.abspath(file_path)
+        module_names.add(module_name)
+
+        if required_modules is not None \
+                and module_name not in required_modules \
+                and manifest.is_valid(module_name, file_path):
+            logger.debug(
+                'Skip import of module "{}"'.format(module_name),
+            )
+            continue
+
+        module = loader.load_module(module_name)
+        suites = list(loader.load_suites_from_module(module, suite_class))
+
+        manifest.add(module_name, file_path, suites)
+
+        for suite in suites:
+            yield suite
+
+    manifest.retain(module_names)
+
+
+def load_entries_from_path(manifest, path_to_dir, suite_class, recursive=True):
+    """
+    Suites from manifest. Only changed modules will be imported.
+    """
+    module_names = set()
+
+    for module_name, file_path in loader.iter_modules_from_path(
+            path_to_dir, recursive=recursive):
+        file_path = os.path.abspath(file_path)
+        module_names.add(module_name)
+
+        if not manifest.is_valid(module_name, file_path):
+            module = loader.load_module(module_name)
+            manifest.add(
+                module_name,
+                file_path,
+                loader.load_suites_from_module(module, suite_class),
+            )
+
+        for entry in manifest.get_suites(module_name):
+            yield entry
+
+    manifest.retain(module_names)
+
+
+def load(config):
+    return Manifest.from_file(config.COLLECT_CACHE)
@@ -0,0 +1,166 @@
+# -*- coding: utf-8 -*-
+
+"""
+Profiling of cases.
+Each case is run under cProfile and stats of case are written to directory.
+Stats of all cases are aggregated to report at the end of run.
+"""
+
+import os
+import re
+import pstats
+import logging
+import cProfile
+from threading import Lock
+
+from six import StringIO
+
+from . import runnable
+from .case import CaseLayer
+from . import case as _case
+
+
+logger = logging.getLogger(__name__)
+
+
+FILE_EXTENSION = '.prof'
+
+SORT_KEY = 'tottime'
+
+# mtime of files which existed before run
+_old_files = {}
+
+
+def get_file_name(case):
+    name = u'{}.{}'.format(
+        runnable.class_name(case), runnable.method_name(case),
+    )
+    return re.sub(r'[^\w.-]', '_', name) + FILE_EXTENSION
+
+
+class ProfileLayer(CaseLayer):
+    """
+    Profile is enabled before setup of case and disabled on teardown
+    """
+
+    def __init__(self, path, pattern=None):
+        super(ProfileLayer, self).__init__()
+
+        self.__path = path
+        self.__pattern = re.compile(pattern) if pattern else None
+
+        self.__lock = Lock()
+        self.__profiles = {}
+        self.__written = set()
+
+        if not os.path.isdir(path):
+            os.makedirs(path)
+
+    @property
+    def path(self):
+        return self.__path
+
+    def is_profiled(self, case):
+        if self.__pattern is None:
+            return True
+
+        return bool(
+            self.__pattern.search(case.__mount_data__.suite_name),
+        )
+
+    def start(self, case):
+        if not self.is_profiled(case):
+            return
+
+        profile = cProfile.Profile()
+        self.__profiles[case.id] = profile
+        profile.enable()
+
+    def stop(self, case):
+        profile = self.__profiles.pop(case.id, None)
+
+        if profile is None:
+            return
+
+        profile.disable()
+
+        file_path = os.path.join(self.__path, get_file_name(case))
+
+        logger.debug(
+            'Save profile of case "{}" to "{}"'.format(
+                runnable.class_name(case), file_path,
+            ),
+        )
+
+        with self.__lock:
+            # stats of repeated case are summed
+            if file_path in self.__written:
+                stats = pstats.Stats(file_path)
+                stats.add(profile)
+                stats.dump_stats(file_path)
+            else:
+                profile.dump_stats(file_path)
+                self.__written.add(file_path)
+
+    def on_setup(self, case):
+        self.start(case)
+
+    def on_teardown(self, case):
+        self.stop(case)
+
+    def on_context_error(self, error, case, result):
+        self.stop(case)
+
+
+def get_files(path):
+    for file_name in sorted(os.listdir(path)):
+        if file_name.endswith(FILE_EXTENSION):
+            yield os.path.join(path, file_name)
+
+
+def install(config):
+    layer = ProfileLayer(config.PROFILE, pattern=config.PROFILE_FILTER)
+
+    _old_files.clear()
+    _old_files.update(
+        (f, os.path.getmtime(f)) for f in get_files(layer.path)
+    )
+
+    _case.DEFAULT_LAYERS[:] = [
+        l for l in _case.DEFAULT_LAYERS if not isinstance(l, ProfileLayer)
+    ]
+    _case.DEFAULT_LAYERS.append(layer)
+    runnable.invalidate_layers()
+
+
+def get_new_files(path, old_files=None):
+    """
+    Files of profiles which were written or rewritten during run
+    """
+    old_files = old_files or {}
+
+    for file_path in get_files(path):
+        if old_files.get(file_path) != os.path.getmtime(file_path):
+            yield file_path
+
+
+def create_report(path, top, old_files=None):
+    files = list(get_new_files(path, old_files=old_files))
+
+    if not files:
+        return None
+
+    stream = StringIO()
+    stats = pstats.Stats(*files, stream=stream)
+    stats.files = []  # do not list each file in report
+    stats.sort_stats(SORT_KEY).print_stats(top)
+
+    return u'Profile of {} cases in "{}":\n{}'.format(
+        len(files), path, stream.getvalue(),
+    )
+
+
+def report(config):
+    return create_report(
+        config.PROFILE, config.PROFILE_TOP, old_files=_old_files,
+    )
@@ -3,7 +3,6 @@
 import re
 import sys
 import logging
-import traceback
 
 from . import ext
 from . import config
@@ -14,6 +13,7 @@ from . import collector
 from . import extensions
 from .suite import Suite
 from .result import Result
+from .reason import get_traceback
 from .utils.common import measure_time
 from .utils.common import call_to_chain
 from .groups.default import DefaultSuiteGroup
@@ -24,6 +24,10 @@ logger = logging.getLogger(__name__)
 
 
 DEFAULT_LAYERS = []
+
+# layers of program -> chains of layers
+LAYER_CHAINS = {}
+
 CONFIG_ENV_NAME = 'SEISMOGRAPH_CONF'
 
 
@@ -78,6 +82,7 @@ class ProgramContext(runnable.ContextOfRunnableObject):
 
     def __init__(self, setup, teardown):
         self.__layers = []
+        self.__chains_key = None
 
         self.__setup_callbacks = [setup]
         self.__teardown_callbacks = [teardown]
@@ -102,62 +107,82 @@ class ProgramContext(runnable.ContextOfRunnableObject):
 
     def add_layers(self, layers):
         self.__layers.extend(layers)
+        self.__chains_key = None
+
+    def get_chain(self, method_name):
+        """
+        Bound methods of layers which implement the hook
+        """
+        if self.__chains_key is None:
+            self.__chains_key = tuple(self.__layers)
+
+        return runnable.get_layer_chains(
+            LAYER_CHAINS,
+            self.__chains_key,
+            lambda: self.layers,
+            ProgramLayer,
+        )[method_name]
 
     def start_context(self, program):
-        logger.debug(
-            'Start context of program "{}"'.format(
-                runnable.class_name(program),
-            ),
-        )
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                'Start context of program "{}"'.format(
+                    runnable.class_name(program),
+                ),
+            )
 
         try:
-            call_to_chain(self.layers, 'on_setup', program)
+            call_to_chain(self.get_chain('on_setup'), None, program)
             call_to_chain(self.__setup_callbacks, None)
         except BaseException:
             runnable.stopped_on(program, 'start_context')
             raise
 
     def stop_context(self, program):
-        logger.debug(
-            'Stop context of program "{}"'.format(
-                runnable.class_name(program),
-            ),
-        )
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                'Stop context of program "{}"'.format(
+                    runnable.class_name(program),
+                ),
+            )
 
         try:
-            call_to_chain(self.layers, 'on_teardown', program)
+            call_to_chain(self.get_chain('on_teardown'), None, program)
             call_to_chain(self.__teardown_callbacks, None)
         except BaseException:
             runnable.stopped_on(program, 'stop_context')
             raise
 
     def on_init(self, program):
-        logger.debug(
-            'Call to chain callbacks "on_init" of program "{}"'.format(
-                runnable.class_name(program),
-            ),
-        )
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                'Call to chain callbacks "on_init" of program "{}"'.format(
+                    runnable.class_name(program),
+                ),
+            )
 
-        call_to_chain(self.layers, 'on_init', program)
+        call_to_chain(self.get_chain('on_init'), None, program)
 
     def on_config(self, program, config):
-        logger.debug(
-            'Call to chain callbacks "on_config" of program "{}"'.format(
-                runnable.class_name(program),
-            ),
-        )
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                'Call to chain callbacks "on_config" of program "{}"'.format(
+                    runnable.class_name(program),
+                ),
+            )
 
-        call_to_chain(self.layers, 'on_config', config)
+        call_to_chain(self.get_chain('on_config'), None, config)
 
     def on_error(self, error, program, result):
-        logger.debug(
-            'Call to chain callbacks "on_error" of program "{}"'.format(
-                runnable.class_name(program),
-            ),
-        )
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                'Call to chain callbacks "on_error" of program "{}"'.format(
+                    runnable.class_name(program),
+                ),
+            )
 
         try:
-            call_to_chain(self.layers, 'on_error', error, program, result)
+            call_to_chain(self.get_chain('on_error'), None, error, program, result)
         except BaseException:
             runnable.stopped_on(program, 'on_error')
             raise
@@ -167,17 +192,18 @@ class ProgramContext(runnable.ContextOfRunnableObject):
             'Call to chain callbacks "on_option_parser" of program',
         )
 
-        call_to_chain(self.layers, 'on_option_parser', parser)
+        call_to_chain(self.get_chain('on_option_parser'), None, parser)
 
     def on_run(self, program):
-        logger.debug(
-            'Call to chain callbacks "on_run" of program "{}"'.format(
-                runnable.class_name(program),
-            ),
-        )
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                'Call to chain callbacks "on_run" of program "{}"'.format(
+                    runnable.class_name(program),
+                ),
+            )
 
         try:
-            call_to_chain(self.layers, 'on_run', program)
+            call_to_chain(self.get_chain('on_run'), None, program)
         except BaseException:
             runnable.stopped_on(program, 'on_run')
             raise
@@ -205,6 +231,10 @@ class Program(runnable.RunnableObject):
         self.__result.set_timer(timer)
 
         if self.suites_path:
+            if self.__config.TREE and self.can_use_manifest():
+                from .tree import print_tree
+                print_tree(self.__suites + self.load_suite_entries())
+
             self.load_suites()
 
         if not self.__suites and not self.__scripts:
@@ -212,8 +242,12 @@ class Program(runnable.RunnableObject):
                 'No suites or scripts for execution',
             )
 
+        if self.__config.LPT:
+            from .history import load
+            self.__runtime_history = load(self.__config)
+
         self.__suites = collector.create_generator(
-            self.__suites, self.__config,
+            self.__suites, self.__config, runtime_history=self.__runtime_history,
         )
 
         if self.__config.TREE:
@@ -236,7 +270,7 @@ class Program(runnable.RunnableObject):
             except BaseException as error:
                 self.__context.on_error(error, self, self.__result)
                 self.__result.add_error(
-                    self, traceback.format_exc(), timer(), error,
+                    self, get_traceback(), timer(), error,
                 )
 
         if self.__exit:
@@ -271,6 +305,7 @@ class Program(runnable.RunnableObject):
         self.__exit = exit
         self.__is_run = False
         self.__stream = stream
+        self.__runtime_history = None
 
         self.__context = ProgramContext(self.setup, self.teardown)
 
@@ -305,6 +340,10 @@ class Program(runnable.RunnableObject):
             from .case import set_no_skip
             set_no_skip()
 
+        if self.__config.PROFILE:
+            from . import profiler
+            profiler.install(self.__config)
+
         for extension in ext.TO_INIT:
             extensions.install(extension, self)
 
@@ -363,6 +402,19 @@ class Program(runnable.RunnableObject):
                 self.__suites, self.__config,
             )
 
+        if self.config.ASYNCIO:
+            logger.debug(
+                'Use "AsyncioSuiteGroup" to making suite group',
+            )
+
+            pyv.check_asyncio_supported()
+
+            from .groups.asyncio import AsyncioSuiteGroup
+
+            return AsyncioSuiteGroup(
+                self.__suites, self.__config,
+            )
+
         if self.config.THREADING:
             logger.debug(
                 'Use "ThreadingSuiteGroup" to making suite group',
@@ -382,7 +434,7 @@ class Program(runnable.RunnableObject):
             from .groups.multiprocessing import MultiprocessingSuiteGroup
 
             return MultiprocessingSuiteGroup(
-                self.__suites, self.__config,
+                self.__suites, self.__config, runtime_history=self.__runtime_history,
             )
 
         logger.debug(
@@ -413,7 +465,8 @@ class Program(runnable.RunnableObject):
 
     @staticmethod
     def ext(name):
-        return extensions.get(name)
+        # program does not release extension, so pool is not used
+        return extensions.get(name, pool=False)
 
     def setup(self, *args, **kwargs):
         pass
@@ -434,13 +487,14 @@ class Program(runnable.RunnableObject):
         extensions.set(data, name, is_data=True)
 
     @staticmethod
-    def shared_extension(name, ext, singleton=False, args=None, kwargs=None):
+    def shared_extension(name, ext, singleton=False, args=None, kwargs=None, scope=None, reset=None):
         extensions.set(
             ext,
             name,
             is_data=False,
             singleton=singleton,
             args=args, kwargs=kwargs,
+            scope=scope, reset=reset,
         )
 
     def suite_is_valid(self, suite):
@@ -492,6 +546,34 @@ class Program(runnable.RunnableObject):
                         self.__suite_class__,
                     ),
                 )
+            elif self.can_use_manifest(path):
+                from . import manifest
+
+                if path not in sys.path:
+                    sys.path.append(path)
+
+                collect_manifest = manifest.load(self.__config)
+
+                if self.__config.TESTS:
+                    suite_names = set(
+                        collector.get_suite_name_from_command(c)
+                        for c in self.__config.TESTS
+                    )
+                else:
+                    suite_names = None
+
+                self.register_suites(
+                    manifest.load_suites_from_path(
+                        collect_manifest,
+                        path,
+                        self.__suite_class__,
+                        recursive=self.recursive_load,
+                        suite_names=suite_names,
+                    ),
+                )
+
+                if collect_manifest.is_changed:
+                    collect_manifest.to_file(self.__config.COLLECT_CACHE)
             else:
                 if path not in sys.path:
                     sys.path.append(path)
@@ -504,6 +586,39 @@ class Program(runnable.RunnableObject):
                     ),
                 )
 
+    def can_use_manifest(self, path=None):
+        path = path or self.suites_path
+        return bool(self.__config.COLLECT_CACHE) and path != '__main__'
+
+    def load_suite_entries(self, path=None):
+        """
+        Suites from manifest of collection.
+        Unchanged modules are not imported.
+        """
+        from . import manifest
+
+        path = path or self.suites_path
+
+        if path not in sys.path:
+            sys.path.append(path)
+
+        collect_manifest = manifest.load(self.__config)
+
+        entries = [
+            entry for entry in manifest.load_entries_from_path(
+                collect_manifest,
+                path,
+                self.__suite_class__,
+                recursive=self.recursive_load,
+            )
+            if self.suite_is_valid(entry)
+        ]
+
+        if collect_manifest.is_changed:
+            collect_manifest.to_file(self.__config.COLLECT_CACHE)
+
+        return entries
+
     def run_scripts(self, result=None, run_point=None):
         if run_point:
             scripts = filter(
@@ -1,9 +1,21 @@
 # -*- coding: utf-8 -*-
 
+import sys
+import linecache
+import traceback
+
 from . import runnable
 from .utils import pyv
 
 
+MAX_RENDERED_TRACEBACKS = 1024
+
+CAUSE_MESSAGE = u'\nThe above exception was the direct cause of the following exception:\n\n'
+CONTEXT_MESSAGE = u'\nDuring handling of the above exception, another exception occurred:\n\n'
+
+_rendered_tracebacks = {}
+
+
 def format_reason(reason):
     return reason.__format_reason__()
 
@@ -12,12 +24,137 @@ def format_reason_to_output(reason):
     return reason.__format_reason_to_output__()
 
 
-class Reason(object):
+def format_output(runnable_object, text):
+    """
+    Text of reason under header of runnable object
+    """
+    runnable_repr = repr(runnable_object)
+    sep_line = u'=' * len(runnable_repr)
+
+    return u'\n'.join((sep_line, runnable_repr, sep_line, text))
+
+
+class Traceback(object):
+    """
+    Summary of raised exception.
+    Frames are kept as (file, line, function) and text is rendered
+    on demand. Identical tracebacks are rendered once.
+    """
+
+    def __init__(self, exc_type, exc_value, tb):
+        frames = []
+
+        while tb is not None:
+            code = tb.tb_frame.f_code
+            frames.append((code.co_filename, tb.tb_lineno, code.co_name))
+            tb = tb.tb_next
+
+        self.__frames = tuple(frames)
+        self.__exception = tuple(
+            pyv.unicode_string(line)
+            for line in traceback.format_exception_only(exc_type, exc_value)
+        )
+        self.__chain = self.get_chain(exc_value)
+        self.__text = None
+
+    def __unicode__(self):
+        return self.render()
+
+    def __str__(self):  # please python 3
+        return self.render()
+
+    @classmethod
+    def get_chain(cls, exc_value):
+        """
+        Cause or context of exception on python 3
+        """
+        cause = getattr(exc_value, '__cause__', None)
+
+        if cause is not None:
+            return CAUSE_MESSAGE, cls(type(cause), cause, cause.__traceback__)
+
+        context = getattr(exc_value, '__context__', None)
+
+        if context is not None and not exc_value.__suppress_context__:
+            return CONTEXT_MESSAGE, cls(type(context), context, context.__traceback__)
+
+        return None
+
+    @property
+    def key(self):
+        return self.__frames, self.__exception, self.__chain and (
+            self.__chain[0], self.__chain[1].key,
+        )
+
+    def render(self):
+        if self.__text is None:
+            key = self.key
+            self.__text = _rendered_tracebacks.get(key)
+
+            if self.__text is None:
+                self.__text = self.__render()
+
+                if len(_rendered_tracebacks) >= MAX_RENDERED_TRACEBACKS:
+                    _rendered_tracebacks.clear()
+
+                _rendered_tracebacks[key] = self.__text
 
-    def __init__(self, runnable_object, reason, config):
+        return self.__text
+
+    def __render(self):
+        lines = []
+
+        if self.__chain:
+            message, chained = self.__chain
+            lines.extend((chained.render(), message))
+
+        if self.__frames:
+            lines.append(u'Traceback (most recent call last):\n')
+
+        for file_name, line_number, name in self.__frames:
+            lines.append(
+                u'  File "{}", line {}, in {}\n'.format(
+                    pyv.unicode_string(file_name), line_number, name,
+                ),
+            )
+            line = linecache.getline(file_name, line_number).strip()
+
+            if line:
+                lines.append(u'    {}\n'.format(pyv.unicode_string(line)))
+
+        lines.extend(self.__exception)
+
+        return u''.join(lines)
+
+
+def get_traceback():
+    """
+    Traceback of exception which is being handled
+    """
+    return Traceback(*sys.exc_info())
+
+
+class Reason(object):
+    """
+    Reason of crash.
+    State of runnable object has to be taken at the moment of crash
+    by capture_context, text of reason is rendered on demand.
+    """
+
+    def __init__(self, runnable_object, reason, config, log=None):
+        self.__log = log
         self.__config = config
         self.__runnable_object = runnable_object
-        self.__reason = pyv.unicode_string(reason)
+        self.__reason = reason
+
+        self.__context = None
+        self.__formatted_reason = None
+
+    def __unicode__(self):
+        return self.__format_reason__()
+
+    def __str__(self):  # please python 3
+        return self.__format_reason__()
 
     @property
     def runnable_object(self):
@@ -25,45 +162,56 @@ class Reason(object):
 
     @property
     def reason(self):
-        return self.__reason
+        # traceback keeps its rendered text
+        return pyv.unicode_string(self.__reason)
 
     @property
     def config(self):
         return self.__config
 
+    def capture_context(self, record=None):
+        """
+        Take state of runnable object.
+        Runnable object is replaced by its record if record is given,
+        so runnable object is not held by reason.
+        """
+        if self.__context is None:
+            if self.__runnable_object.__create_reason__:
+                self.__context = runnable.reason(self.__runnable_object)
+            else:
+                self.__context = u''
+
+        if record is not None:
+            self.__runnable_object = record
+
+        return self
+
     def __format_reason__(self):
-        if self.__runnable_object.__create_reason__:
-            formatted_reason = (
-                runnable.reason(self.__runnable_object),
-                self.__reason,
-            )
-        else:
-            formatted_reason = (
-                self.__reason,
-            )
+        if self.__formatted_reason is None:
+            self.capture_context()
 
-        return u''.join(formatted_reason)
+            formatted_reason = [
+                self.__context,
+                self.reason,
+            ]
 
-    def __format_reason_to_output__(self):
-        tmp = []
+            if self.__log:
+                formatted_reason.append(
+                    u'\nCaptured log:\n\n{}'.format(self.__log),
+                )
 
-        runnable_repr = repr(self.__runnable_object)
-        sep_line = ''.join(
-            '=' for _ in pyv.xrange(
-                len(runnable_repr),
-            ),
-        )
+            self.__formatted_reason = u''.join(
+                pyv.unicode_string(s) for s in formatted_reason
+            )
 
-        tmp.append(sep_line)
-        tmp.append(runnable_repr)
-        tmp.append(sep_line)
-        tmp.append(self.__reason)
+        return self.__formatted_reason
 
-        return u'\n'.join(tmp)
+    def __format_reason_to_output__(self):
+        return format_output(self.__runnable_object, self.__format_reason__())
 
 
-def create(runnable_object, reason, config=None):
-    return Reason(runnable_object, reason, config)
+def create(runnable_object, reason, config=None, log=None):
+    return Reason(runnable_object, reason, config, log=log)
 
 
 def item(name, desc, *args):
@@ -1,15 +1,26 @@
 # -*- coding: utf-8 -*-
 
+import os
 import sys
+import heapq
 import logging
+import tempfile
 from threading import Lock
+from threading import Thread
+from collections import deque
+from collections import OrderedDict
 from contextlib import contextmanager
 
+from six.moves import queue
+from six.moves import _thread
+
 from . import xunit
+from . import events
 from . import reason
 from . import runnable
 from .utils import pyv
 from .utils import colors
+from .utils.mp import shared_flag
 from .utils.mp import MPSupportedValue
 
 
@@ -19,6 +30,8 @@ logger = logging.getLogger(__name__)
 
 DEFAULT_NAME = 'seismograph'
 
+DEFAULT_CAPTURE_SIZE = 64 * 1024
+
 
 def get_runnable_from_storage_item(item):
     runnable_object, _ = item
@@ -31,56 +44,256 @@ def get_xunit_data_from_storage_item(item):
 
 
 def get_last_item_from_storage(storage):
-    if storage:
-        return storage[len(storage) - 1]
-    return None
+    return storage.last
 
 
 def get_xunit_data_from_storage(storage, runnable_object):
-    for item in storage:
-        if get_runnable_from_storage_item(item) == runnable_object:
-            return get_xunit_data_from_storage_item(item)
-    return None
+    return storage.get(runnable_object)
 
 
 def reset_item_of_storage(storage, runnable_object, xunit_data):
     assert isinstance(xunit_data, xunit.XUnitData)
 
-    for item in storage:
-        if get_runnable_from_storage_item(item) == runnable_object:
-            storage.remove(item)
-            storage.append((runnable_object, xunit_data))
+    return storage.reset(runnable_object, xunit_data)
+
+
+def get_runtime_from_storage(storage):
+    return storage.runtime
+
+
+class Storage(object):
+    """
+    Items (record of runnable object, xunit data) of result in order of adding.
+    Index by id of runnable object, counters and runtime are kept on adding.
+    Storage is changed from threads of groups, so changes are done under lock.
+    """
+
+    def __init__(self, items=None):
+        self.__lock = Lock()
+
+        self.__key = 0
+        self.__items = OrderedDict()
+        self.__index = {}
+
+        self.__cached = 0
+        self.__runtime = float()
+
+        if items:
+            self.extend(items)
+
+    def __len__(self):
+        return len(self.__items)
+
+    def __iter__(self):
+        with self.__lock:
+            return iter(list(self.__items.values()))
+
+    def __nonzero__(self):
+        return bool(self.__items)
+
+    def __bool__(self):  # please python 3
+        return self.__nonzero__()
+
+    def __repr__(self):
+        return '<{} items={}>'.format(self.__class__.__name__, len(self))
+
+    @property
+    def last(self):
+        with self.__lock:
+            if self.__items:
+                return next(reversed(self.__items.values()))
+            return None
+
+    @property
+    def runtime(self):
+        return self.__runtime
+
+    @property
+    def cached(self):
+        return self.__cached
+
+    def __append(self, item):
+        runnable_object, xunit_data = item
+        record = runnable.record(runnable_object)
+
+        self.__key += 1
+        self.__items[self.__key] = (record, xunit_data)
+        self.__index.setdefault(record.id, []).append(self.__key)
+
+        self.__runtime += xunit_data.runtime
+        self.__cached += xunit_data.cached
+
+    def __remove(self, runnable_object):
+        keys = self.__index.get(runnable_object.id)
+
+        if not keys:
+            return None
+
+        item = self.__items.pop(keys.pop(0))
+
+        if not keys:
+            del self.__index[runnable_object.id]
+
+        xunit_data = get_xunit_data_from_storage_item(item)
+
+        self.__runtime -= xunit_data.runtime
+        self.__cached -= xunit_data.cached
+
+        return item
+
+    def append(self, item):
+        with self.__lock:
+            self.__append(item)
+
+    def extend(self, items):
+        items = list(items)
+
+        with self.__lock:
+            for item in items:
+                self.__append(item)
+
+    def get(self, runnable_object):
+        with self.__lock:
+            keys = self.__index.get(runnable_object.id)
+
+            if keys:
+                return get_xunit_data_from_storage_item(self.__items[keys[0]])
+
+            return None
+
+    def remove(self, runnable_object):
+        """
+        Remove first item of runnable object
+        """
+        with self.__lock:
+            return self.__remove(runnable_object)
+
+    def reset(self, runnable_object, xunit_data):
+        with self.__lock:
+            if self.__remove(runnable_object) is None:
+                return False
+
+            self.__append((runnable_object, xunit_data))
+
             return True
 
-    return False
 
+class CaseCapture(object):
+    """
+    Captured log of one case.
+    Last records are kept in memory up to max size,
+    older records are moved to temporary file.
+    """
 
-def get_runtime_from_storage(storage):
-    rt = float()
-    for item in storage:
-        rt += get_xunit_data_from_storage_item(item).runtime
-    return rt
+    def __init__(self, max_size=DEFAULT_CAPTURE_SIZE):
+        self.__max_size = max_size
+
+        self.__size = 0
+        self.__spill = None
+        self.__records = deque()
+
+    def __nonzero__(self):
+        return bool(self.__records)
+
+    def __bool__(self):  # please python 3
+        return self.__nonzero__()
+
+    @property
+    def is_spilled(self):
+        return self.__spill is not None
+
+    def write(self, s):
+        record = pyv.unicode_string(s).encode('utf-8')
+
+        self.__records.append(record)
+        self.__size += len(record)
+
+        while self.__size > self.__max_size and len(self.__records) > 1:
+            if self.__spill is None:
+                self.__spill = tempfile.TemporaryFile()
+
+            record = self.__records.popleft()
+            self.__size -= len(record)
+            self.__spill.write(record)
+
+    def getvalue(self):
+        data = []
+
+        if self.__spill is not None:
+            self.__spill.seek(0)
+            data.append(self.__spill.read())
+
+        data.extend(self.__records)
+
+        return b''.join(data).decode('utf-8', 'replace')
+
+    def close(self):
+        if self.__spill is not None:
+            self.__spill.close()
+            self.__spill = None
+
+        self.__size = 0
+        self.__records.clear()
 
 
 class CaptureStream(object):
+    """
+    Stream of captured handlers.
+    Records are written to capture of case which is running in current
+    thread (greenlet, task), records out of cases are written to common capture.
+    """
+
+    # can be replaced for context which is not a thread
+    key_function = staticmethod(_thread.get_ident)
 
     def __init__(self):
-        self.__buffer = []
+        self.__lock = Lock()
+        self.__captures = {}
+        self.__max_size = DEFAULT_CAPTURE_SIZE
+        self.__common = CaseCapture()
 
     def __getattr__(self, item):
         return getattr(sys.stderr, item)
 
+    @property
+    def max_size(self):
+        return self.__max_size
+
+    @max_size.setter
+    def max_size(self, value):
+        self.__max_size = value
+        self.__common = CaseCapture(value)
+
+    def bind(self):
+        capture = CaseCapture(self.__max_size)
+        previous = self.__captures.pop(self.key_function(), None)
+
+        if previous is not None:
+            previous.close()
+
+        self.__captures[self.key_function()] = capture
+
+        return capture
+
+    def release(self):
+        return self.__captures.pop(self.key_function(), None)
+
     def write(self, s):
-        self.__buffer.append(s)
+        capture = self.__captures.get(self.key_function())
+
+        if capture is not None:
+            capture.write(s)
+        else:
+            with self.__lock:
+                self.__common.write(s)
 
     def flush(self, fp=None):
-        if fp and self.__buffer:
+        if fp and self.__common:
             with lock:
                 fp.write('\nLogging capture:\n\n')
-                for s in self.__buffer:
-                    fp.write(s)
-                    fp.flush()
-            self.__buffer = []
+                fp.write(self.__common.getvalue())
+                fp.flush()
+            self.__common.close()
 
 
 class LogCapture(object):
@@ -104,6 +317,8 @@ class LogCapture(object):
                 yield logger
 
     def make(self):
+        self.stream.max_size = self.__config.CAPTURE_SIZE
+
         for logger in self.loggers:
             if logger in self.was_captured:
                 continue
@@ -117,6 +332,116 @@ class LogCapture(object):
     def flush(self, fp):
         self.stream.flush(fp)
 
+    @classmethod
+    def release(cls, need_log=False):
+        """
+        Release capture of current case.
+        Captured log is returned if it's needed.
+        """
+        capture = cls.stream.release()
+
+        if capture is None:
+            return None
+
+        try:
+            if need_log and capture:
+                return capture.getvalue()
+            return None
+        finally:
+            capture.close()
+
+
+class Chunk(list):
+    """
+    Collects strings which are written to it as to stream
+    """
+
+    write = list.append
+
+
+class ConsoleWriter(object):
+    """
+    Writes chunks of console to stream from background thread.
+    Chunks which are waiting in queue are written by one batch,
+    so threads of tests are not blocked by stream.
+    Worker processes write chunks at once, because worker
+    can be exited by os._exit and chunks in queue would be lost.
+    """
+
+    STOP = None
+
+    def __init__(self, stream):
+        self.__stream = stream
+
+        self.__owner_pid = os.getpid()
+
+        self.__pid = None
+        self.__queue = None
+        self.__thread = None
+
+    @property
+    def stream(self):
+        return self.__stream
+
+    def start(self):
+        logger.debug('Start console writer')
+
+        self.__pid = os.getpid()
+        self.__queue = queue.Queue()
+        self.__thread = Thread(target=self.__loop, name='ConsoleWriter')
+        self.__thread.daemon = True
+        self.__thread.start()
+
+    def write(self, chunk):
+        if self.__owner_pid != os.getpid():
+            self.__write(chunk)
+            return
+
+        if self.__pid is None:
+            self.start()
+
+        self.__queue.put(chunk)
+
+    def __write(self, string):
+        with lock:
+            self.__stream.write(string)
+            self.__stream.flush()
+
+    def wait(self):
+        """
+        Wait while all of chunks will be written
+        """
+        if self.__pid == os.getpid():
+            self.__queue.join()
+
+    def close(self):
+        if self.__pid == os.getpid():
+            self.__queue.put(self.STOP)
+            self.__thread.join()
+            self.__pid = None
+
+    def __loop(self):
+        while True:
+            chunks = [self.__queue.get()]
+
+            while chunks[-1] is not self.STOP:
+                try:
+                    chunks.append(self.__queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            string = u''.join(c for c in chunks if c is not self.STOP)
+
+            try:
+                if string:
+                    self.__write(string)
+            finally:
+                for _ in chunks:
+                    self.__queue.task_done()
+
+            if chunks[-1] is self.STOP:
+                break
+
 
 class Console(object):
 
@@ -182,10 +507,11 @@ class Console(object):
             )
             self.__buffer = []
 
-    def __init__(self, stream=None, verbose=False):
+    def __init__(self, stream=None, verbose=False, writer=None):
         self.__buffer = []
         self.__children = []
 
+        self.__writer = writer
         self.__verbose = verbose
         self.__stream = stream or sys.stdout
 
@@ -198,7 +524,21 @@ class Console(object):
         self.__children.append(child_console)
         return child_console
 
+    @property
+    def writer(self):
+        return self.__writer
+
     def flush(self):
+        if self.__writer:
+            chunk = Chunk(self.__buffer)
+            self.__buffer = []
+
+            for child in self.__children:
+                child.flush(chunk)
+
+            self.__writer.write(u''.join(chunk))
+            return
+
         with lock:
             self.__stream.write(
                 u''.join(self.__buffer),
@@ -210,6 +550,10 @@ class Console(object):
 
         self.__buffer = []
 
+    def wait(self):
+        if self.__writer:
+            self.__writer.wait()
+
     def write(self, string):
         self.__buffer.append(string)
 
@@ -225,12 +569,14 @@ class Markers(object):
         LONG_FAIL = 'FAIL'
         LONG_SKIP = 'SKIP: '
         LONG_SUCCESS = 'OK'
+        LONG_CACHED = 'OK (cached)'
         LONG_ERROR = 'ERROR'
 
         SMALL_FAIL = 'F'
         SMALL_SKIP = 'S'
         SMALL_ERROR = 'E'
         SMALL_SUCCESS = '.'
+        SMALL_CACHED = 'c'
 
         def __init__(self, config):
             self.__config = config
@@ -264,6 +610,13 @@ class Markers(object):
                 return colors.green(self.LONG_SUCCESS)
             return self.SMALL_SUCCESS
 
+        def cached(self):
+            if self.__config.VERBOSE:
+                if self.__config.NO_COLOR:
+                    return self.LONG_CACHED
+                return colors.green(self.LONG_CACHED)
+            return self.SMALL_CACHED
+
         def error(self):
             if self.__config.VERBOSE:
                 if self.__config.NO_COLOR:
@@ -280,9 +633,9 @@ class State(object):
         self.__result = result
         self.__should_stop = MPSupportedValue(should_stop)
 
-    def support_mp(self, manager):
+    def support_mp(self):
         self.__should_stop.set(
-            manager.Value('b', self.should_stop)
+            shared_flag(self.should_stop),
         )
 
     @property
@@ -302,14 +655,15 @@ class State(object):
         if self.__result.runtime is not None:
             return round(self.__result.runtime, xunit.ROUND_RUNTIME)
 
-        runtime = float()
-
-        for storage in (
+        runtime = sum(
+            get_runtime_from_storage(storage)
+            for storage in (
                 self.__result.errors,
                 self.__result.skipped,
                 self.__result.failures,
-                self.__result.successes):
-            runtime += get_runtime_from_storage(storage)
+                self.__result.successes,
+            )
+        )
 
         return round(runtime, xunit.ROUND_RUNTIME)
 
@@ -333,6 +687,10 @@ class State(object):
     def skipped(self):
         return len(self.__result.skipped)
 
+    @property
+    def cached(self):
+        return self.__result.successes.cached
+
     @property
     def was_success(self):
         return not self.__result.errors and not self.__result.failures
@@ -342,11 +700,12 @@ class Result(object):
 
     __marker_class__ = Markers
 
-    def __init__(self, config, name=None, stream=None, current_state=None, is_proxy=False):
-        self.errors = []
-        self.skipped = []
-        self.failures = []
-        self.successes = []
+    def __init__(self, config, name=None, stream=None, current_state=None, is_proxy=False, events_log=None,
+                 console_writer=None):
+        self.errors = Storage()
+        self.skipped = Storage()
+        self.failures = Storage()
+        self.successes = Storage()
 
         self.proxies = []
 
@@ -359,11 +718,20 @@ class Result(object):
         self._marker = self.__marker_class__(self.__config)
 
         self.__timer = None
+        self.__report = None
+        self.__events_log = events_log
         self.__runtime = None
         self.__capture = None
+
+        # greenlets do not wait for each other on stream,
+        # so output of gevent groups is written directly
+        if not is_proxy and not self.__config.GEVENT:
+            console_writer = ConsoleWriter(self._stream)
+
         self.__console = Console(
             self._stream,
             verbose=self.__config.VERBOSE,
+            writer=console_writer,
         )
 
         if not is_proxy:
@@ -390,8 +758,17 @@ class Result(object):
     def __exit__(self, *args, **kwargs):
         self.final()
 
-        if self.__config.XUNIT_REPORT:
-            self.create_report(self.__config.XUNIT_REPORT)
+        if self.__report:
+            self.__report.close(self)
+
+        if self.__events_log:
+            self.__events_log.close()
+
+        if self.__console.writer:
+            self.__console.writer.close()
+
+        if self.__config.HISTORY:
+            self.save_history(self.__config.HISTORY)
 
     def __repr__(self):
         state = self.get_state()
@@ -435,8 +812,8 @@ class Result(object):
     def current_state(self):
         return self.__current_state
 
-    def support_mp(self, manager):
-        self.__current_state.support_mp(manager)
+    def support_mp(self):
+        self.__current_state.support_mp()
 
     def set_timer(self, timer):
         self.__timer = timer
@@ -452,6 +829,8 @@ class Result(object):
             self.__config,
             is_proxy=True,
             stream=self._stream,
+            events_log=self.__events_log,
+            console_writer=self.__console.writer,
             current_state=self.__current_state,
             **kwargs
         )
@@ -470,6 +849,23 @@ class Result(object):
         self.failures.extend(result.failures)
         self.successes.extend(result.successes)
 
+    def freeze_phases(self):
+        """
+        Phases of run are fixed when proxy of run is closed
+        and timers of cases are started again for next run
+        """
+        timers = []
+
+        for storage in (self.errors, self.skipped, self.failures, self.successes):
+            for _, xunit_data in storage:
+                timer = xunit_data.freeze_phases()
+
+                if timer is not None:
+                    timers.append(timer)
+
+        for timer in timers:
+            timer.reset()
+
     @contextmanager
     def proxy(self, runnable_object=None, timer=None):
         if runnable_object:
@@ -485,6 +881,7 @@ class Result(object):
             proxy.set_timer(timer)
 
             self.proxies.append(proxy)
+            self.event(events.SUITE_START, name=proxy.name)
         else:
             proxy = self.create_proxy()
 
@@ -492,9 +889,14 @@ class Result(object):
             yield proxy
         finally:
             proxy.stop_timer()
+            proxy.freeze_phases()
             self.extend(proxy)
             proxy.console.flush()
 
+            if runnable_object:
+                self.report(proxy)
+                self.event_of_suite(proxy)
+
     def get_state(self):
         return State(
             self, should_stop=self.__current_state.should_stop,
@@ -525,62 +927,91 @@ class Result(object):
         return reset_item_of_storage(self.successes, runnable_object, xunit_data)
 
     def add_error(self, runnable_object, traceback, runtime, exc):
+        record = runnable.record(runnable_object)
+        record.description = repr(runnable_object)
+
         error_reason = reason.create(
-            runnable_object, traceback, config=self.__config,
-        )
+            runnable_object,
+            traceback,
+            config=self.__config,
+            log=LogCapture.release(need_log=True),
+        ).capture_context(record)
 
         xunit_data = xunit.XUnitData(
             exc=exc,
             runtime=runtime,
-            reason=reason.format_reason(error_reason),
-            class_name=runnable.class_name(runnable_object),
-            method_name=runnable.stopped_on(runnable_object),
+            reason=error_reason,
+            class_name=record.class_name,
+            phases=runnable.phases(runnable_object),
+            method_name=record.stopped_on,
         )
 
-        self.errors.append((runnable_object, xunit_data))
+        self.errors.append((record, xunit_data))
+        self.event_of_result('error', xunit_data)
         self.finish(self._marker.error())
 
         if self.__config.STOP:
             self.__current_state.should_stop = True
 
     def add_fail(self, runnable_object, traceback, runtime, exc):
+        record = runnable.record(runnable_object)
+        record.description = repr(runnable_object)
+
         fail_reason = reason.create(
-            runnable_object, traceback, config=self.__config,
-        )
+            runnable_object,
+            traceback,
+            config=self.__config,
+            log=LogCapture.release(need_log=True),
+        ).capture_context(record)
 
         xunit_data = xunit.XUnitData(
             exc=exc,
             runtime=runtime,
-            reason=reason.format_reason(fail_reason),
-            class_name=runnable.class_name(runnable_object),
-            method_name=runnable.stopped_on(runnable_object),
+            reason=fail_reason,
+            class_name=record.class_name,
+            phases=runnable.phases(runnable_object),
+            method_name=record.stopped_on,
         )
 
-        self.failures.append((runnable_object, xunit_data))
+        self.failures.append((record, xunit_data))
+        self.event_of_result('fail', xunit_data)
         self.finish(self._marker.fail())
 
         if self.__config.STOP:
             self.__current_state.should_stop = True
 
-    def add_success(self, runnable_object, runtime):
+    def add_success(self, runnable_object, runtime, cached=False):
+        LogCapture.release()
+
+        record = runnable.record(runnable_object)
         xunit_data = xunit.XUnitData(
+            cached=cached,
             runtime=runtime,
-            class_name=runnable.class_name(runnable_object),
-            method_name=runnable.method_name(runnable_object),
+            class_name=record.class_name,
+            phases=runnable.phases(runnable_object),
+            method_name=record.method_name,
         )
 
-        self.successes.append((runnable_object, xunit_data))
-        self.finish(self._marker.success())
+        self.successes.append((record, xunit_data))
+        self.event_of_result('success', xunit_data)
+        self.finish(
+            self._marker.cached() if cached else self._marker.success(),
+        )
 
     def add_skip(self, runnable_object, reason, runtime):
+        LogCapture.release()
+
+        record = runnable.record(runnable_object)
         xunit_data = xunit.XUnitData(
             reason=reason,
             runtime=runtime,
-            class_name=runnable.class_name(runnable_object),
-            method_name=runnable.method_name(runnable_object),
+            class_name=record.class_name,
+            phases=runnable.phases(runnable_object),
+            method_name=record.method_name,
         )
 
-        self.skipped.append((runnable_object, xunit_data))
+        self.skipped.append((record, xunit_data))
+        self.event_of_result('skip', xunit_data)
         self.finish(self._marker.skip(reason))
 
     def create_report(self, file_path):
@@ -594,7 +1025,145 @@ class Result(object):
                 xunit.create_xml_document(self),
             )
 
+    def start_report(self, file_path):
+        if self.__is_proxy:
+            raise RuntimeError(
+                'Proxy result can not be independent',
+            )
+
+        self.__report = xunit.XUnitWriter(file_path, self.__name)
+
+    def report(self, result_proxy):
+        """
+        Write result proxy of suite to report which was started
+        """
+        if self.__report:
+            self.__report.write(result_proxy)
+
+    def get_durations(self, top, phases=None):
+        """
+        Slowest results. Runtime of result is taken if phases are not given,
+        sum of given phases otherwise. Cached successes are not counted.
+        """
+        def get_duration(xunit_data):
+            if phases is None:
+                return xunit_data.runtime
+
+            return sum(xunit_data.phases.get(p, float()) for p in phases)
+
+        items = (
+            (get_duration(xunit_data), xunit_data)
+            for storage in (self.successes, self.failures, self.errors)
+            for _, xunit_data in storage
+            if not xunit_data.cached
+        )
+
+        return heapq.nlargest(top, items, key=lambda i: i[0])
+
+    def print_durations(self, top):
+        from .case import SETUP_PHASE
+        from .case import SETUP_CLASS_PHASE
+
+        for title, phases in (('tests', None), ('setups', (SETUP_CLASS_PHASE, SETUP_PHASE))):
+            durations = self.get_durations(top, phases=phases)
+
+            if not durations:
+                continue
+
+            self.__console.line_break()
+            self.__console.writeln('Slowest {}:'.format(title))
+
+            for duration, xunit_data in durations:
+                self.__console.writeln(
+                    '{:.3f}s {}.{}'.format(
+                        duration, xunit_data.class_name, xunit_data.method_name,
+                    ),
+                )
+
+        self.__console.flush()
+
+    def print_profile(self):
+        from .profiler import report
+
+        profile_report = report(self.__config)
+
+        if profile_report:
+            self.__console.line_break()
+            self.__console.writeln(profile_report)
+            self.__console.flush()
+
+    def save_history(self, file_path):
+        if self.__is_proxy:
+            raise RuntimeError(
+                'Proxy result can not be independent',
+            )
+
+        from .history import save
+
+        save(self, file_path)
+
+    def save_last_failed(self, file_path):
+        if self.__is_proxy:
+            raise RuntimeError(
+                'Proxy result can not be independent',
+            )
+
+        from .last_failed import save
+
+        try:
+            save(self, file_path)
+        except (IOError, OSError) as error:
+            logger.warning(
+                'Can not save last failed to "{}": {}'.format(file_path, error),
+            )
+
+    def start_events_log(self, file_path, fmt=None):
+        if self.__is_proxy:
+            raise RuntimeError(
+                'Proxy result can not be independent',
+            )
+
+        self.__events_log = events.EventsLog(file_path, fmt=fmt or events.JSON_FORMAT)
+
+    def event(self, event, **data):
+        if self.__events_log:
+            self.__events_log.write(event, **data)
+
+    def event_of_result(self, status, xunit_data):
+        if self.__events_log:
+            self.__events_log.write(
+                events.CASE_END,
+                status=status,
+                cached=xunit_data.cached,
+                runtime=xunit_data.runtime,
+                exc_type=xunit_data.exc_type,
+                class_name=xunit_data.class_name,
+                method_name=xunit_data.method_name,
+            )
+
+    def event_of_suite(self, proxy):
+        if self.__events_log:
+            state = proxy.get_state()
+            self.__events_log.write(
+                events.SUITE_END,
+                name=proxy.name,
+                tests=state.tests,
+                errors=state.errors,
+                skipped=state.skipped,
+                failures=state.failures,
+                runtime=state.runtime,
+            )
+
     def start(self, runnable_object):
+        if not self.__config.NO_CAPTURE:
+            LogCapture.stream.bind()
+
+        self.event(
+            events.CASE_START,
+            class_name=runnable.class_name(runnable_object),
+            method_name=runnable.method_name(runnable_object),
+        )
+
         if self.__config.VERBOSE:
             self.__console.write(
                 '* {}: '.format(str(runnable_object)),
@@ -615,6 +1184,16 @@ class Result(object):
         if self.__capture:
             self.__capture.make()
 
+        if self.__config.XUNIT_REPORT:
+            self.start_report(self.__config.XUNIT_REPORT)
+
+        if self.__config.EVENTS_LOG:
+            self.start_events_log(
+                self.__config.EVENTS_LOG, fmt=self.__config.EVENTS_LOG_FORMAT,
+            )
+
+        self.event(events.RUN_START, name=self.__name)
+
         self.__console.writeln('Seismograph is measuring:')
         self.__console.line_break()
         self.console.flush()
@@ -640,13 +1219,16 @@ class Result(object):
             for storage in (self.errors, self.failures):
                 for storage_item in storage:
                     runnable_object, xunit_data = storage_item
-                    if xunit_data.reason:
-                        crash_reason = reason.create(
-                            runnable_object, xunit_data.reason, config=self.__config,
-                        )
+                    crash_reason = xunit_data.crash_reason
+
+                    if isinstance(crash_reason, reason.Reason):
                         self.__console.writeln(
                             reason.format_reason_to_output(crash_reason),
                         )
+                    elif crash_reason:
+                        self.__console.writeln(
+                            reason.format_output(runnable_object, crash_reason),
+                        )
 
         total = 'tests={} failures={} errors={} skipped={} successes={} runtime={}'.format(
             self.__current_state.tests,
@@ -657,9 +1239,10 @@ class Result(object):
             self.__current_state.runtime,
         )
 
-        sep_line = ''.join(
-            '-' for _ in pyv.xrange(len(total)),
-        )
+        if self.__config.TEST_CACHE:
+            total = '{} cached={}'.format(total, self.__current_state.cached)
+
+        sep_line = '-' * len(total)
 
         if not need_report:
             self.__console.line_break()
@@ -680,5 +1263,25 @@ class Result(object):
         self.__console.writeln(total)
         self.__console.flush()
 
+        self.event(
+            events.RUN_END,
+            name=self.__name,
+            tests=self.__current_state.tests,
+            errors=self.__current_state.errors,
+            skipped=self.__current_state.skipped,
+            failures=self.__current_state.failures,
+            runtime=self.__current_state.runtime,
+        )
+
+        if self.__config.DURATIONS:
+            self.print_durations(self.__config.DURATIONS)
+
+        if self.__config.PROFILE:
+            self.print_profile()
+
         if self.__capture:
+            self.__console.wait()
             self.__capture.flush(self._stream)
+
+        if self.__config.LAST_FAILED_FILE and not self.__config.NO_LAST_FAILED_FILE:
+            self.save_last_failed(self.__config.LAST_FAILED_FILE)
@@ -1,10 +1,12 @@
 # -*- coding: utf-8 -*-
 
+import sys
 from functools import wraps
 from collections import OrderedDict
 from contextlib import contextmanager
 
 from .utils import pyv
+from .utils.mp import shared_string
 from .utils.mp import MPSupportedValue
 
 
@@ -48,6 +50,16 @@ def class_name(runnable):
     return runnable.__class_name__()
 
 
+def phases(runnable):
+    return runnable.__phases__()
+
+
+def record(runnable):
+    if isinstance(runnable, RunnableRecord):
+        return runnable
+    return runnable.__record__()
+
+
 def run_method(f):
     @wraps(f)
     def wrapper(self, *args, **kwargs):
@@ -78,6 +90,130 @@ def build_method(f):
     return wrapper
 
 
+def run_flow(flow):
+    """
+    Chains which are yielded by flow of run are called.
+    Exception of chain is raised inside of flow.
+    """
+    try:
+        chain = next(flow)
+
+        while True:
+            try:
+                chain()
+            except BaseException:
+                chain = flow.throw(*sys.exc_info())
+            else:
+                chain = next(flow)
+    except StopIteration:
+        pass
+
+
+class Chain(object):
+    """
+    Callbacks which are called one by one with the same arguments.
+    Flow of run yields chains to its runner,
+    so runner of asyncio can await coroutines of callbacks.
+    """
+
+    __slots__ = (
+        'args',
+        'phase',
+        'runnable',
+        'callbacks',
+        'stopped_on',
+    )
+
+    def __init__(self, callbacks, args=None, runnable=None, phase=None, stopped_on=None):
+        self.args = args or tuple()
+        self.phase = phase
+        self.runnable = runnable
+        self.callbacks = callbacks
+        self.stopped_on = stopped_on
+
+    def __call__(self):
+        with self.guard():
+            for callback in self.callbacks:
+                result = callback(*self.args)
+
+                if pyv.is_awaitable(result):
+                    getattr(result, 'close', lambda: None)()
+                    raise RuntimeError(
+                        '"{}" is coroutine function, asyncio group is required for it (--asyncio)'.format(
+                            pyv.get_func_name(callback),
+                        ),
+                    )
+
+    @contextmanager
+    def guard(self):
+        """
+        Phase of runnable object is measured
+        and method is marked as stopped on if chain was failed
+        """
+        timer = phases(self.runnable) if self.phase else None
+
+        try:
+            if timer is None:
+                yield
+            else:
+                with timer.measure(self.phase):
+                    yield
+        except BaseException:
+            if self.stopped_on:
+                stopped_on(self.runnable, self.stopped_on)
+            raise
+
+
+class RunnableRecord(object):
+    """
+    Compact record of runnable object which is kept by result
+    instead of runnable object itself
+    """
+
+    __slots__ = (
+        'id',
+        'case_name',
+        'suite_name',
+        'class_name',
+        'stopped_on',
+        'method_name',
+        'description',
+    )
+
+    def __init__(self,
+                 id,
+                 class_name,
+                 method_name,
+                 stopped_on=None,
+                 suite_name=None,
+                 case_name=None,
+                 description=None):
+        self.id = id
+        self.case_name = pyv.intern_string(case_name)
+        self.suite_name = pyv.intern_string(suite_name)
+        self.class_name = pyv.intern_string(class_name)
+        self.stopped_on = pyv.intern_string(stopped_on)
+        self.method_name = pyv.intern_string(method_name)
+        self.description = description
+
+    def __repr__(self):
+        if self.description:
+            return self.description
+
+        return '<{} class_name={} method_name={}>'.format(
+            self.__class__.__name__, self.class_name, self.method_name,
+        )
+
+    def __method_name__(self):
+        return self.method_name
+
+    def __class_name__(self):
+        return self.class_name
+
+    def __stopped_on__(self):
+        return self.stopped_on
+
+
 class RunnableObject(object):
 
     __create_reason__ = False
@@ -134,6 +270,17 @@ class RunnableObject(object):
             self.__class__.__module__, self.__class__.__name__,
         )
 
+    def __phases__(self):
+        return None
+
+    def __record__(self):
+        return RunnableRecord(
+            self.__id,
+            class_name(self),
+            method_name(self),
+            stopped_on=stopped_on(self),
+        )
+
     def __reason__(self):
         return 'Your reason can be here. This is from "{}.{}.__reason__" method.\n'.format(
             self.__class__.__module__, self.__class__.__name__,
@@ -146,9 +293,9 @@ class RunnableObject(object):
             ),
         )
 
-    def support_mp(self, manager):
+    def support_mp(self):
         self.__stopped_on.set(
-            manager.Value('s', self._stopped_on),
+            shared_string(self._stopped_on),
         )
 
 
@@ -225,7 +372,79 @@ class ContextOfRunnableObject(object):
 class LayerOfRunnableObject(object):
 
     def __init__(self):
-        self.enabled = True
+        self.__enabled = True
+
+    @property
+    def enabled(self):
+        return self.__enabled
+
+    @enabled.setter
+    def enabled(self, value):
+        self.__enabled = value
+        invalidate_layers()
+
+
+# is changed when layers are registered or toggled
+layers_version = 0
+
+
+def invalidate_layers():
+    """
+    Chains of layers will be resolved again.
+    Should be called after changing of lists of layers.
+    """
+    global layers_version
+    layers_version += 1
+
+
+def is_overridden(layer, method_name, base_class):
+    method = getattr(layer, method_name)
+    default = getattr(base_class, method_name, None)
+
+    return getattr(method, '__func__', method) is not getattr(default, '__func__', default)
+
+
+class LayerChains(object):
+    """
+    Bound methods of layers for each hook.
+    Layers which do not override hook of base class are skipped.
+    """
+
+    def __init__(self, layers, base_class):
+        self.__layers = tuple(layers)
+        self.__base_class = base_class
+
+        self.__chains = {}
+
+    @property
+    def layers(self):
+        return self.__layers
+
+    def __getitem__(self, method_name):
+        try:
+            return self.__chains[method_name]
+        except KeyError:
+            chain = tuple(
+                getattr(layer, method_name)
+                for layer in self.__layers
+                if is_overridden(layer, method_name, self.__base_class)
+            )
+            self.__chains[method_name] = chain
+            return chain
+
+
+def get_layer_chains(cache, key, get_layers, base_class):
+    """
+    Chains are kept in cache by key until layers are changed
+    """
+    current_version = layers_version
+    version, chains = cache.get(key, (None, None))
+
+    if version != current_version:
+        chains = LayerChains(get_layers(), base_class)
+        cache[key] = current_version, chains
+
+    return chains
 
 
 class RunnableGroup(RunnableObject):
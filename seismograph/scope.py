@@ -18,22 +18,27 @@ shared_extension = _program.Program.shared_extension
 
 def match_suite_to_layer(cls, layer):
     _suite.MATCH_SUITE_TO_LAYER[cls] = layer
+    _runnable.invalidate_layers()
 
 
 def match_case_to_layer(cls, layer):
     _case.MATCH_CASE_TO_LAYER[cls] = layer
+    _runnable.invalidate_layers()
 
 
 def set_default_case_layers(*layers):
     _case.DEFAULT_LAYERS.extend(layers)
+    _runnable.invalidate_layers()
 
 
 def set_default_suite_layers(*layers):
     _suite.DEFAULT_LAYERS.extend(layers)
+    _runnable.invalidate_layers()
 
 
 def set_default_program_layers(*layers):
     _program.DEFAULT_LAYERS.extend(layers)
+    _runnable.invalidate_layers()
 
 
 def configure(
@@ -242,3 +242,16 @@ class CaseMeta(type):
             setattr(cls, loader.DEFAULT_TEST_NAME, _make_run_test())
 
         return cls
+
+    def __setattr__(cls, name, value):
+        type.__setattr__(cls, name, value)
+
+        # magic attributes are state of class, they are not tests
+        if not (name.startswith('__') and name.endswith('__')):
+            loader.invalidate_test_names()
+
+    def __delattr__(cls, name):
+        type.__delattr__(cls, name)
+
+        if not (name.startswith('__') and name.endswith('__')):
+            loader.invalidate_test_names()
@@ -1,7 +1,6 @@
 # -*- coding: utf-8 -*-
 
 import logging
-import traceback
 from types import FunctionType
 
 from . import case
@@ -10,6 +9,7 @@ from . import loader
 from . import runnable
 from .utils import pyv
 from . import extensions
+from .reason import get_traceback
 from .utils.common import measure_time
 from .utils.common import call_to_chain
 from .groups.default import DefaultCaseGroup
@@ -23,6 +23,9 @@ logger = logging.getLogger(__name__)
 DEFAULT_LAYERS = []
 MATCH_SUITE_TO_LAYER = {}
 
+# (class of suite, layers of suite) -> chains of layers
+LAYER_CHAINS = {}
+
 
 def with_match_layers(context, suite):
     for layer in context.layers:
@@ -146,6 +149,7 @@ class SuiteContext(runnable.ContextOfRunnableObject):
     def __init__(self, setup, teardown):
         self.__layers = []
         self.__require = []
+        self.__chains_key = None
 
         self.__extensions = {}
         self.__build_rules = []
@@ -185,117 +189,161 @@ class SuiteContext(runnable.ContextOfRunnableObject):
 
     def add_layers(self, layers):
         self.__layers.extend(layers)
+        self.__chains_key = None
+
+    def get_chain(self, suite, method_name):
+        """
+        Bound methods of layers which implement the hook.
+        Chains are resolved once for class of suite.
+        """
+        if self.__chains_key is None:
+            self.__chains_key = (suite.__class__, ) + tuple(self.__layers)
+
+        return runnable.get_layer_chains(
+            LAYER_CHAINS,
+            self.__chains_key,
+            lambda: with_match_layers(self, suite),
+            SuiteLayer,
+        )[method_name]
+
+    def get_extension(self, name, suite_name=None):
+        if name not in self.__extensions:
+            self.__extensions[name] = extensions.get(name, suite_name=suite_name)
 
-    def install_extensions(self):
+        return self.__extensions[name]
+
+    def install_extensions(self, suite_name=None):
         for ext_name in self.__require:
-            if ext_name not in self.__extensions:
-                self.__extensions[ext_name] = extensions.get(ext_name)
+            self.get_extension(ext_name, suite_name=suite_name)
 
-    def start_context(self, suite):
-        logger.debug(
-            'Start context of suite "{}"'.format(
-                runnable.class_name(suite),
-            ),
+    def release_extensions(self, suite_name=None):
+        for ext_name, ext in self.__extensions.items():
+            extensions.release(ext_name, ext)
+
+        self.__extensions.clear()
+        extensions.release_suite(suite_name)
+
+    def hook(self, suite, method_name, *args):
+        """
+        Chain of layers for hook. Suite is stopped on hook if chain was failed.
+        """
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                'Call to chain callbacks "{}" of suite "{}"'.format(
+                    method_name, runnable.class_name(suite),
+                ),
+            )
+
+        return runnable.Chain(
+            self.get_chain(suite, method_name),
+            args=args,
+            runnable=suite,
+            stopped_on=method_name,
         )
 
-        try:
-            call_to_chain(
-                with_match_layers(self, suite), 'on_setup', suite,
+    def start_chains(self, suite):
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                'Start context of suite "{}"'.format(
+                    runnable.class_name(suite),
+                ),
             )
-            call_to_chain(self.__setup_callbacks, None)
-        except BaseException:
-            runnable.stopped_on(suite, 'start_context')
-            raise
 
-    def stop_context(self, suite):
-        logger.debug(
-            'Stop context of suite "{}"'.format(
-                runnable.class_name(suite),
+        return (
+            runnable.Chain(
+                self.get_chain(suite, 'on_setup'),
+                args=(suite, ),
+                runnable=suite,
+                stopped_on='start_context',
+            ),
+            runnable.Chain(
+                self.__setup_callbacks,
+                runnable=suite,
+                stopped_on='start_context',
             ),
         )
 
-        try:
-            call_to_chain(
-                with_match_layers(self, suite), 'on_teardown', suite,
+    def stop_chains(self, suite):
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                'Stop context of suite "{}"'.format(
+                    runnable.class_name(suite),
+                ),
             )
-            call_to_chain(self.__teardown_callbacks, None)
-        except BaseException:
-            runnable.stopped_on(suite, 'stop_context')
-            raise
 
-    def on_init(self, suite):
-        logger.debug(
-            'Call to chain callbacks "on_init" of suite "{}"'.format(
-                runnable.class_name(suite),
+        return (
+            runnable.Chain(
+                self.get_chain(suite, 'on_teardown'),
+                args=(suite, ),
+                runnable=suite,
+                stopped_on='stop_context',
+            ),
+            runnable.Chain(
+                self.__teardown_callbacks,
+                runnable=suite,
+                stopped_on='stop_context',
             ),
         )
 
+    def start_context(self, suite):
+        call_to_chain(self.start_chains(suite), None)
+
+    def stop_context(self, suite):
+        call_to_chain(self.stop_chains(suite), None)
+
+    def on_init(self, suite):
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                'Call to chain callbacks "on_init" of suite "{}"'.format(
+                    runnable.class_name(suite),
+                ),
+            )
+
         call_to_chain(
-            with_match_layers(self, suite), 'on_init', suite,
+            self.get_chain(suite, 'on_init'), None, suite,
         )
 
     def on_require(self, suite):
-        logger.debug(
-            'Call to chain callbacks "on_require" of suite "{}"'.format(
-                runnable.class_name(suite),
-            ),
-        )
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                'Call to chain callbacks "on_require" of suite "{}"'.format(
+                    runnable.class_name(suite),
+                ),
+            )
 
         call_to_chain(
-            with_match_layers(self, suite), 'on_require', self.__require,
+            self.get_chain(suite, 'on_require'), None, self.__require,
         )
 
     def on_build_rule(self, suite):
-        logger.debug(
-            'Call to chain callbacks "on_build_rule" of suite "{}"'.format(
-                runnable.class_name(suite),
-            ),
-        )
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                'Call to chain callbacks "on_build_rule" of suite "{}"'.format(
+                    runnable.class_name(suite),
+                ),
+            )
 
         call_to_chain(
-            with_match_layers(self, suite), 'on_build_rule', self.__build_rules,
+            self.get_chain(suite, 'on_build_rule'), None, self.__build_rules,
         )
 
     def on_mount(self, suite, program):
-        logger.debug(
-            'Call to chain callbacks "on_mount" of suite "{}"'.format(
-                runnable.class_name(suite),
-            ),
-        )
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                'Call to chain callbacks "on_mount" of suite "{}"'.format(
+                    runnable.class_name(suite),
+                ),
+            )
 
         call_to_chain(
-            with_match_layers(self, suite), 'on_mount', suite, program,
+            self.get_chain(suite, 'on_mount'), None, suite, program,
         )
 
     def on_run(self, suite):
-        logger.debug(
-            'Call to chain callbacks "on_run" of suite "{}"'.format(
-                runnable.class_name(suite),
-            ),
-        )
-
-        try:
-            call_to_chain(
-                with_match_layers(self, suite), 'on_run', suite,
-            )
-        except BaseException:
-            runnable.stopped_on(suite, 'on_run')
-            raise
+        self.hook(suite, 'on_run', suite)()
 
     def on_error(self, error, suite, result):
-        logger.debug(
-            'Call to chain callbacks "on_error" of suite "{}"'.format(
-                runnable.class_name(suite),
-            ),
-        )
-
-        try:
-            call_to_chain(
-                with_match_layers(self, suite), 'on_error', error, suite, result,
-            )
-        except BaseException:
-            runnable.stopped_on(suite, 'on_error')
-            raise
+        self.hook(suite, 'on_error', error, suite, result)()
 
 
 class Suite(runnable.RunnableObject, runnable.MountObjectMixin, runnable.BuildObjectMixin):
@@ -312,7 +360,7 @@ class Suite(runnable.RunnableObject, runnable.MountObjectMixin, runnable.BuildOb
     #
 
     def __is_run__(self):
-        return self.__is_run
+        return self._is_run
 
     def __is_build__(self):
         return self.__is_build
@@ -323,6 +371,15 @@ class Suite(runnable.RunnableObject, runnable.MountObjectMixin, runnable.BuildOb
     def __class_name__(self):
         return self.__name
 
+    def __record__(self):
+        return runnable.RunnableRecord(
+            self.id,
+            runnable.class_name(self),
+            runnable.method_name(self),
+            stopped_on=runnable.stopped_on(self),
+            suite_name=self.__name,
+        )
+
     def __reason__(self):
         if self.reason_storage:
             return reason.item(
@@ -333,28 +390,51 @@ class Suite(runnable.RunnableObject, runnable.MountObjectMixin, runnable.BuildOb
         return ''
 
     @runnable.build_method
-    def __run__(self, result):
-        self.__is_run = True
+    def __run__(self, result, cases=None):
+        runnable.run_flow(self.__flow__(result, cases=cases))
+
+    def __flow__(self, result, cases=None):
+        """
+        Steps of run. Chains of layers, callbacks and group of cases
+        are yielded to runner of flow which calls them.
+        """
+        self._is_run = True
         timer = measure_time()
 
-        if result.current_state.should_stop or not self.__case_instances:
+        if cases is None:
+            cases = self.__case_instances
+
+        if result.current_state.should_stop or not cases:
             return
 
-        group = self._make_group()
+        group = self._make_group(cases)
 
         with result.proxy(self, timer=timer) as result_proxy:
             try:
-                self.__context.on_run(self)
+                logger.debug(
+                    'Install extensions on context of suite "{}"'.format(self.name),
+                )
+
+                self.__context.install_extensions(suite_name=self.name)
+                yield self.__context.hook(self, 'on_run', self)
+
+                for chain in self.__context.start_chains(self):
+                    yield chain
 
-                with self.__context(self):
-                    group(result_proxy)
+                try:
+                    yield runnable.Chain((group, ), args=(result_proxy, ))
+                finally:
+                    for chain in self.__context.stop_chains(self):
+                        yield chain
             except ALLOW_RAISED_EXCEPTIONS:
                 raise
             except BaseException as error:
-                self.__context.on_error(error, self, result_proxy)
+                yield self.__context.hook(self, 'on_error', error, self, result_proxy)
                 result_proxy.add_error(
-                    self, traceback.format_exc(), timer(), error,
+                    self, get_traceback(), timer(), error,
                 )
+            finally:
+                self.__context.release_extensions(suite_name=self.name)
 
     #
     # Behavior on magic methods
@@ -378,10 +458,11 @@ class Suite(runnable.RunnableObject, runnable.MountObjectMixin, runnable.BuildOb
 
         self.__name = name
 
-        self.__is_run = False
+        self._is_run = False
         self.__is_build = False
 
         self.__case_classes = []
+        self.__case_classes_by_name = {}
         self.__case_instances = []
 
         self.__mount_data__ = None
@@ -404,13 +485,15 @@ class Suite(runnable.RunnableObject, runnable.MountObjectMixin, runnable.BuildOb
         self.__context.on_require(self)
         self.__context.on_build_rule(self)
 
-    def __build__(self, case_name=None, test_name=None):
+    def __build__(self, case_name=None, test_name=None, lazy=False):
         logger.debug(
-            'Build suite "{}". case=name={} test_name={}'.format(
-                runnable.class_name(self), case_name, test_name,
+            'Build suite "{}". case=name={} test_name={} lazy={}'.format(
+                runnable.class_name(self), case_name, test_name, lazy,
             ),
         )
 
+        case_factory = case.CaseSpec if lazy else case.create_case
+
         if case_name:
             cls = loader.load_case_from_suite(
                 case_name, self,
@@ -421,6 +504,7 @@ class Suite(runnable.RunnableObject, runnable.MountObjectMixin, runnable.BuildOb
                     cls,
                     config=self.config,
                     method_name=test_name,
+                    case_factory=case_factory,
                     box_class=self.__case_box_class__,
                 ),
             )
@@ -430,6 +514,7 @@ class Suite(runnable.RunnableObject, runnable.MountObjectMixin, runnable.BuildOb
                     loader.load_tests_from_case(
                         cls,
                         config=self.config,
+                        case_factory=case_factory,
                         box_class=self.__case_box_class__,
                     ),
                 )
@@ -447,18 +532,24 @@ class Suite(runnable.RunnableObject, runnable.MountObjectMixin, runnable.BuildOb
     def cases(self):
         return self.__case_classes
 
+    def get_case_class(self, name):
+        return self.__case_classes_by_name.get(name)
+
     @property
     def context(self):
         return self.__context
 
-    def _make_group(self):
+    def _make_group(self, cases=None):
+        if cases is None:
+            cases = self.__case_instances
+
         if self.__case_group_class__:
             logger.debug(
                 'Use "__case_group_class__" to making case group',
             )
 
             return self.__case_group_class__(
-                self.__case_instances, self.config,
+                cases, self.config,
             )
 
         if self.config.GEVENT:
@@ -471,7 +562,20 @@ class Suite(runnable.RunnableObject, runnable.MountObjectMixin, runnable.BuildOb
             from .groups.gevent import GeventCaseGroup
 
             return GeventCaseGroup(
-                self.__case_instances, self.config,
+                cases, self.config,
+            )
+
+        if self.config.ASYNCIO:
+            logger.debug(
+                'Use "AsyncioCaseGroup" to making case group',
+            )
+
+            pyv.check_asyncio_supported()
+
+            from .groups.asyncio import AsyncioCaseGroup
+
+            return AsyncioCaseGroup(
+                cases, self.config,
             )
 
         if self.config.THREADING or self.config.MULTIPROCESSING:
@@ -482,7 +586,7 @@ class Suite(runnable.RunnableObject, runnable.MountObjectMixin, runnable.BuildOb
             from .groups.threading import ThreadingCaseGroup
 
             return ThreadingCaseGroup(
-                self.__case_instances, self.config,
+                cases, self.config,
             )
 
         logger.debug(
@@ -490,7 +594,7 @@ class Suite(runnable.RunnableObject, runnable.MountObjectMixin, runnable.BuildOb
         )
 
         return DefaultCaseGroup(
-            self.__case_instances, self.config,
+            cases, self.config,
         )
 
     def setup(self, *args, **kwargs):
@@ -523,7 +627,7 @@ class Suite(runnable.RunnableObject, runnable.MountObjectMixin, runnable.BuildOb
         if name not in self.__context.require:
             raise ExtensionNotRequired(name)
 
-        return self.__context.extensions.get(name)
+        return self.__context.get_extension(name, suite_name=self.__name)
 
     def mount_to(self, program):
         logger.debug(
@@ -553,10 +657,7 @@ class Suite(runnable.RunnableObject, runnable.MountObjectMixin, runnable.BuildOb
                 'cls': case_class,
                 'tests': dict(
                     (atr, getattr(case_class, atr))
-                    for atr in dir(case_class)
-                    if atr.startswith(loader.TEST_NAME_PREFIX)
-                    or
-                    atr == loader.DEFAULT_TEST_NAME,
+                    for atr in loader.load_test_names_from_case(case_class)
                 ),
             }
 
@@ -615,6 +716,7 @@ class Suite(runnable.RunnableObject, runnable.MountObjectMixin, runnable.BuildOb
                     require=require,
                 ),
             )
+            self.__case_classes_by_name.setdefault(_class.__name__, _class)
 
             return _class
 
@@ -627,7 +729,10 @@ class Suite(runnable.RunnableObject, runnable.MountObjectMixin, runnable.BuildOb
         return wrapper
 
     @runnable.mount_method
-    def build(self, case_name=None, test_name=None, shuffle=None):
+    def build(self, case_name=None, test_name=None, shuffle=None, lazy=False):
+        """
+        :param lazy: cases are built on demand when they are run
+        """
         if self.__is_build:
             raise RuntimeError(
                 'Suite "{}" is already built'.format(
@@ -635,22 +740,18 @@ class Suite(runnable.RunnableObject, runnable.MountObjectMixin, runnable.BuildOb
                 ),
             )
 
-        logger.debug(
-            'Install extensions on context of suite "{}"'.format(self.name),
-        )
-
-        self.__context.install_extensions()
-
         if self.__context.build_rules and not case_name:
             for rule in self.__context.build_rules:
                 self.__build__(
                     case_name=rule.case_name,
                     test_name=rule.test_name,
+                    lazy=lazy,
                 )
         else:
             self.__build__(
                 case_name=case_name,
                 test_name=test_name,
+                lazy=lazy,
             )
 
         if shuffle:
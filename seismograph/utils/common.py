@@ -1,7 +1,9 @@
 # -*- coding: utf-8 -*-
 
 import time
+from contextlib import contextmanager
 
+from . import pyv
 from ..exceptions import TimeoutException
 
 
@@ -46,5 +48,42 @@ def call_to_chain(chain, method_name, *args, **kwargs):
 
 
 def measure_time():
-    start_time = time.time()
-    return lambda: time.time() - start_time
+    start_time = pyv.monotonic()
+    return lambda: pyv.monotonic() - start_time
+
+
+class PhaseTimer(object):
+    """
+    Durations of phases of run.
+    Durations of the same phase are summed.
+    """
+
+    def __init__(self):
+        self.__durations = {}
+
+    def __nonzero__(self):
+        return bool(self.__durations)
+
+    def __bool__(self):  # please python 3
+        return self.__nonzero__()
+
+    def get(self, phase, default=None):
+        return self.__durations.get(phase, default)
+
+    def add(self, phase, duration):
+        self.__durations[phase] = self.__durations.get(phase, float()) + duration
+
+    @contextmanager
+    def measure(self, phase):
+        timer = measure_time()
+
+        try:
+            yield
+        finally:
+            self.add(phase, timer())
+
+    def to_dict(self):
+        return dict(self.__durations)
+
+    def reset(self):
+        self.__durations.clear()
@@ -4,26 +4,93 @@
 Multiprocessing utils
 """
 
+import os
+import ctypes
+
+from . import pyv
+
+
+SHARED_STRING_SIZE = 128
+
+
+class SharedString(object):
+    """
+    String of limited size which is stored in shared memory.
+    Read and write are local memory operations without lock.
+    """
+
+    def __init__(self, value=None, size=SHARED_STRING_SIZE):
+        from multiprocessing.sharedctypes import RawArray
+
+        self.__array = RawArray('c', size)
+        self.value = value
+
+    @property
+    def value(self):
+        value = self.__array.value
+
+        if pyv.IS_PYTHON_3:
+            return value.decode('utf-8', 'ignore')
+
+        return value
+
+    @value.setter
+    def value(self, value):
+        if value is None:
+            value = ''
+
+        # last byte is reserved for null terminator
+        self.__array.value = pyv.unicode_string(value).encode('utf-8')[:len(self.__array) - 1]
+
+
+def shared_flag(value=False):
+    from multiprocessing.sharedctypes import RawValue
+
+    return RawValue(ctypes.c_bool, bool(value))
+
+
+def shared_string(value=None):
+    return SharedString(value)
+
 
 class MPSupportedValue(object):
 
     def __init__(self, value=None):
         self._value = value
+        self._is_shared = False
 
     @property
     def value(self):
-        val = getattr(self._value, 'value', None)
-        if val is not None:
+        if self._is_shared:
             return self._value.value
 
         return self._value
 
     @value.setter
     def value(self, value):
-        if hasattr(self._value, 'value'):
+        if self._is_shared:
             self._value.value = value
         else:
             self._value = value
 
     def set(self, value):
+        """
+        Move value to shared storage. Storage should have "value" attribute.
+        """
         self._value = value
+        self._is_shared = True
+
+
+def get_rss_size():
+    """
+    Resident set size of current process in megabytes
+    or None if it can not be read on the platform.
+    Peak RSS is not used, it never decreases.
+    """
+    try:
+        with open('/proc/self/statm') as fp:
+            pages = int(fp.read().split()[1])
+    except (IOError, OSError, ValueError, IndexError):
+        return None
+
+    return pages * os.sysconf('SC_PAGE_SIZE') / float(1024 ** 2)
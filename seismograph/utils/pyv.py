@@ -4,8 +4,11 @@
 Module for supporting py 2-3 versions.
 """
 
+import os
 import sys
+import time
 import types
+import inspect
 
 from ..exceptions import PyVersionError
 
@@ -25,8 +28,13 @@ def check_py_version():
 
 
 def check_gevent_supported():
-    if IS_PYTHON_3:
-        raise PyVersionError('gevent lib not supported with python 3')
+    if IS_PYTHON_3 and sys.version_info < (3, 5):
+        raise PyVersionError('gevent lib needs python 3.5 and greater with python 3')
+
+
+def check_asyncio_supported():
+    if sys.version_info < (3, 5):
+        raise PyVersionError('asyncio groups need python 3.5 and greater')
 
 
 if IS_PYTHON_2:
@@ -54,6 +62,24 @@ elif IS_PYTHON_3:
     reduce = reduce
 
 
+if IS_PYTHON_2:
+    monotonic = time.time
+elif IS_PYTHON_3:
+    monotonic = time.perf_counter
+
+
+if IS_PYTHON_2:
+    intern = intern
+elif IS_PYTHON_3:
+    intern = sys.intern
+
+
+def intern_string(string):
+    if isinstance(string, str):
+        return intern(string)
+    return string
+
+
 if IS_PYTHON_2:
     execfile = execfile
 elif IS_PYTHON_3:
@@ -62,6 +88,31 @@ elif IS_PYTHON_3:
             exec(fp.read(), globals, locals)
 
 
+if IS_PYTHON_2:
+    def replace(src, dst):
+        """
+        Rename of file which overwrites existing file on windows too
+        """
+        try:
+            os.rename(src, dst)
+        except OSError:
+            if not os.path.exists(dst):
+                raise
+            os.remove(dst)
+            os.rename(src, dst)
+elif IS_PYTHON_3:
+    replace = os.replace
+
+
+if IS_PYTHON_2:
+    def is_awaitable(obj):
+        return False
+elif IS_PYTHON_3:
+    def is_awaitable(obj):
+        isawaitable = getattr(inspect, 'isawaitable', None)
+        return isawaitable is not None and isawaitable(obj)
+
+
 def get_exc_message(error):
     if hasattr(error, 'message'):
         return error.message
@@ -2,23 +2,44 @@
 
 import json
 import pickle
+import logging
 import marshal
+from threading import Lock
 
 from .utils import pyv
 
 
+logger = logging.getLogger(__name__)
+
+
 XML_VERSION = '1.0'
 XML_ENCODING = 'UTF-8'
 
 ROUND_RUNTIME = 3
+ROUND_PHASE = 6
+
+PHASE_PROPERTY_PREFIX = 'phase.'
 
 
 class XUnitData(object):
 
+    __slots__ = (
+        '__reason',
+        '__cached',
+        '__phases',
+        '__runtime',
+        '__exc_type',
+        '__class_name',
+        '__exc_message',
+        '__method_name',
+    )
+
     def __init__(self,
                  exc=None,
                  reason=None,
+                 phases=None,
                  runtime=None,
+                 cached=False,
                  exc_type=None,
                  class_name=None,
                  method_name=None,
@@ -26,13 +47,15 @@ class XUnitData(object):
         if exc:
             self.parse_exc(exc)
         else:
-            self.__exc_type = exc_type
+            self.__exc_type = pyv.intern_string(exc_type)
             self.__exc_message = exc_message
 
         self.__reason = reason
+        self.__cached = cached
+        self.__phases = phases
         self.__runtime = runtime
-        self.__class_name = class_name
-        self.__method_name = method_name
+        self.__class_name = pyv.intern_string(class_name)
+        self.__method_name = pyv.intern_string(method_name)
 
     @classmethod
     def from_dict(cls, dct):
@@ -52,6 +75,18 @@ class XUnitData(object):
 
     @property
     def reason(self):
+        # reason of crash is rendered on demand and keeps its text
+        if self.__reason is not None and not isinstance(self.__reason, pyv.basestring):
+            return pyv.unicode_string(self.__reason)
+
+        return self.__reason
+
+    @property
+    def crash_reason(self):
+        """
+        Object of reason which was captured at the moment of crash
+        or text of reason if it was sent from other process
+        """
         return self.__reason
 
     @reason.setter
@@ -62,6 +97,37 @@ class XUnitData(object):
     def runtime(self):
         return round(self.__runtime, ROUND_RUNTIME)
 
+    @property
+    def cached(self):
+        return self.__cached
+
+    @property
+    def phases(self):
+        """
+        Phase name -> duration. Timer of case is kept
+        until proxy of run is closed, so teardown of case is counted too.
+        """
+        if self.__phases is None:
+            return {}
+
+        if isinstance(self.__phases, dict):
+            return self.__phases
+
+        return self.__phases.to_dict()
+
+    def freeze_phases(self):
+        """
+        Durations are taken from timer of case.
+        Timer is returned if it was live.
+        """
+        if self.__phases is None or isinstance(self.__phases, dict):
+            return None
+
+        timer = self.__phases
+        self.__phases = timer.to_dict()
+
+        return timer
+
     @property
     def exc_type(self):
         return self.__exc_type
@@ -84,8 +150,10 @@ class XUnitData(object):
 
     def to_dict(self):
         return {
-            'reason': self.__reason,
+            'reason': self.reason,
+            'phases': self.phases,
             'runtime': self.__runtime,
+            'cached': self.__cached,
             'exc_type': self.__exc_type,
             'class_name': self.__class_name,
             'exc_message': self.__exc_message,
@@ -93,8 +161,8 @@ class XUnitData(object):
         }
 
     def parse_exc(self, exc):
-        self.__exc_type = '{}.{}'.format(
-            exc.__class__.__module__, exc.__class__.__name__,
+        self.__exc_type = pyv.intern_string(
+            '{}.{}'.format(exc.__class__.__module__, exc.__class__.__name__),
         )
         self.__exc_message = pyv.get_exc_message(exc)
 
@@ -143,77 +211,103 @@ def to_xml_tag(tag_name, contains, **attributes):
         tag_name, dict_to_tag_attributes(attributes))
 
 
-def create_xml_document(result):
-    def render_result_proxy(result_proxy):
-        cases_report = []
-
-        for _, xunit_data in result_proxy.successes:
-            cases_report.append(
-                to_xml_tag('testcase', None,
-                           time=xunit_data.runtime,
-                           name=xunit_data.method_name,
-                           classname=xunit_data.class_name,
-                           ),
-            )
+def render_phases(xunit_data):
+    phases = xunit_data.phases
 
-        for _, xunit_data in result_proxy.skipped:
-            cases_report.append(
-                to_xml_tag('testcase',
-                           to_xml_tag('skipped',
-                                      cdata(xunit_data.reason),
-                                      ),
-                           time=xunit_data.runtime,
-                           name=xunit_data.method_name,
-                           classname=xunit_data.class_name,
-                           ),
-            )
+    if not phases:
+        return u''
 
-        for _, xunit_data in result_proxy.failures:
-            cases_report.append(
-                to_xml_tag('testcase',
-                           to_xml_tag('failure',
-                                      cdata(xunit_data.reason),
-                                      type=xunit_data.exc_type,
-                                      message=xunit_data.exc_message,
-                                      ),
-                           time=xunit_data.runtime,
-                           name=xunit_data.method_name,
-                           classname=xunit_data.class_name,
-                           ),
-            )
+    return to_xml_tag('properties',
+                      u''.join(
+                          to_xml_tag('property', None,
+                                     name=PHASE_PROPERTY_PREFIX + name,
+                                     value='{:.{}f}'.format(phases[name], ROUND_PHASE),
+                                     )
+                          for name in sorted(phases)
+                      ),
+                      )
 
-        for _, xunit_data in result_proxy.errors:
-            cases_report.append(
-                to_xml_tag('testcase',
-                           to_xml_tag('error',
-                                      cdata(xunit_data.reason),
-                                      type=xunit_data.exc_type,
-                                      message=xunit_data.exc_message,
-                                      ),
-                           time=xunit_data.runtime,
-                           name=xunit_data.method_name,
-                           classname=xunit_data.class_name,
-                           ),
-            )
 
-        state = result_proxy.get_state()
+def render_result_proxy(result_proxy):
+    cases_report = []
 
-        return to_xml_tag('testsuite',
-                          u''.join(cases_report),
-                          name=result_proxy.name,
-                          tests=state.tests,
-                          time=state.runtime,
-                          skip=state.skipped,
-                          errors=state.errors,
-                          failures=state.failures,
-                          )
+    for _, xunit_data in result_proxy.successes:
+        cases_report.append(
+            to_xml_tag('testcase', render_phases(xunit_data),
+                       time=xunit_data.runtime,
+                       name=xunit_data.method_name,
+                       classname=xunit_data.class_name,
+                       cached='true' if xunit_data.cached else None,
+                       ),
+        )
 
+    for _, xunit_data in result_proxy.skipped:
+        cases_report.append(
+            to_xml_tag('testcase',
+                       render_phases(xunit_data) +
+                       to_xml_tag('skipped',
+                                  cdata(xunit_data.reason),
+                                  ),
+                       time=xunit_data.runtime,
+                       name=xunit_data.method_name,
+                       classname=xunit_data.class_name,
+                       ),
+        )
+
+    for _, xunit_data in result_proxy.failures:
+        cases_report.append(
+            to_xml_tag('testcase',
+                       render_phases(xunit_data) +
+                       to_xml_tag('failure',
+                                  cdata(xunit_data.reason),
+                                  type=xunit_data.exc_type,
+                                  message=xunit_data.exc_message,
+                                  ),
+                       time=xunit_data.runtime,
+                       name=xunit_data.method_name,
+                       classname=xunit_data.class_name,
+                       ),
+        )
+
+    for _, xunit_data in result_proxy.errors:
+        cases_report.append(
+            to_xml_tag('testcase',
+                       render_phases(xunit_data) +
+                       to_xml_tag('error',
+                                  cdata(xunit_data.reason),
+                                  type=xunit_data.exc_type,
+                                  message=xunit_data.exc_message,
+                                  ),
+                       time=xunit_data.runtime,
+                       name=xunit_data.method_name,
+                       classname=xunit_data.class_name,
+                       ),
+        )
+
+    state = result_proxy.get_state()
+
+    return to_xml_tag('testsuite',
+                      u''.join(cases_report),
+                      name=result_proxy.name,
+                      tests=state.tests,
+                      time=state.runtime,
+                      skip=state.skipped,
+                      errors=state.errors,
+                      failures=state.failures,
+                      )
+
+
+def render_header():
+    return u'<?xml version="{version}" encoding="{encoding}"?>'.format(
+        version=XML_VERSION,
+        encoding=XML_ENCODING,
+    )
+
+
+def create_xml_document(result):
     data = u''.join(
         (
-            u'<?xml version="{version}" encoding="{encoding}"?>'.format(
-                version=XML_VERSION,
-                encoding=XML_ENCODING,
-            ),
+            render_header(),
             to_xml_tag('testsuites',
                        u''.join(
                            map(render_result_proxy, result.proxies),
@@ -233,3 +327,131 @@ def create_xml_document(result):
         return data.encode('utf-8')
 
     return data
+
+
+class XUnitWriter(object):
+    """
+    Writes report while program is running.
+    Each suite is appended as soon as it is done and
+    file is well-formed after each write, so report of killed run is usable.
+    """
+
+    # place for counters of root tag to grow
+    HEADER_RESERVE = 128
+
+    def __init__(self, file_path, name):
+        self.__name = name
+        self.__lock = Lock()
+        self.__written = set()
+        self.__fp = open(file_path, 'w+b')
+
+        self.__tests = 0
+        self.__skipped = 0
+        self.__errors = 0
+        self.__failures = 0
+        self.__runtime = float()
+
+        self.__fp.write(render_header().encode('utf-8'))
+
+        self.__header_position = self.__fp.tell()
+        self.__header_size = len(self.render_root_tag()) + self.HEADER_RESERVE
+
+        self.write_root_tag()
+
+        self.__position = self.__fp.tell()
+
+        self.write_tail()
+
+    def render_root_tag(self, tests=None, runtime=None, skipped=None, errors=None, failures=None):
+        return u'<testsuites{}>'.format(
+            dict_to_tag_attributes(
+                {
+                    'name': self.__name,
+                    'tests': self.__tests if tests is None else tests,
+                    'time': round(self.__runtime, ROUND_RUNTIME) if runtime is None else runtime,
+                    'skip': self.__skipped if skipped is None else skipped,
+                    'errors': self.__errors if errors is None else errors,
+                    'failures': self.__failures if failures is None else failures,
+                },
+            ),
+        ).encode('utf-8')
+
+    def grow_header(self, size):
+        """
+        Suites which were written are moved to give place for bigger root tag
+        """
+        logger.debug(
+            'Root tag of xunit report outgrows reserve, suites will be rewritten',
+        )
+
+        self.__fp.seek(self.__header_position + self.__header_size)
+        body = self.__fp.read(self.__position - self.__fp.tell())
+
+        self.__header_size = size + self.HEADER_RESERVE
+
+        self.__fp.seek(self.__header_position + self.__header_size)
+        self.__fp.write(body)
+        self.__position = self.__fp.tell()
+
+    def write_root_tag(self, **kwargs):
+        root_tag = self.render_root_tag(**kwargs)
+
+        if len(root_tag) > self.__header_size:
+            self.grow_header(len(root_tag))
+
+        # whitespace before ">" keeps size of root tag
+        root_tag = root_tag[:-1] + b' ' * (self.__header_size - len(root_tag)) + b'>'
+
+        self.__fp.seek(self.__header_position)
+        self.__fp.write(root_tag)
+
+    def write_tail(self):
+        self.__fp.seek(self.__position)
+        self.__fp.write(u'</testsuites>'.encode('utf-8'))
+        self.__fp.truncate()
+        self.__fp.flush()
+
+    def write(self, result_proxy):
+        with self.__lock:
+            if id(result_proxy) in self.__written:
+                return
+
+            self.__written.add(id(result_proxy))
+
+            self.__fp.seek(self.__position)
+            self.__fp.write(render_result_proxy(result_proxy).encode('utf-8'))
+            self.__position = self.__fp.tell()
+
+            state = result_proxy.get_state()
+
+            self.__tests += state.tests
+            self.__skipped += state.skipped
+            self.__errors += state.errors
+            self.__failures += state.failures
+            self.__runtime += state.runtime
+
+            self.write_root_tag()
+            self.write_tail()
+
+    def close(self, result):
+        """
+        Writes suites which were not written yet and totals of result.
+        Result itself is written if it has no proxies,
+        e.g. error of program was raised before suites.
+        """
+        if result.proxies:
+            for result_proxy in result.proxies:
+                self.write(result_proxy)
+        elif not self.__written:
+            self.write(result)
+
+        with self.__lock:
+            self.write_root_tag(
+                tests=result.current_state.tests,
+                runtime=result.current_state.runtime,
+                skipped=result.current_state.skipped,
+                errors=result.current_state.errors,
+                failures=result.current_state.failures,
+            )
+            self.write_tail()
+            self.__fp.close()
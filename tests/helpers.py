@@ -0,0 +1,37 @@
+from six import StringIO
+
+from seismograph import config
+from seismograph.result import Result
+
+
+class Program(object):
+    """
+    Program for mount of suites in tests
+    """
+
+    def __init__(self, config):
+        self.suites = []
+        self.config = config
+
+    def __class_name__(self):
+        return 'tests.Program'
+
+
+def create_config(**kwargs):
+    options, _ = config.create_option_parser().parse_args([])
+    cfg = config.Config(options=options)
+    cfg.update(kwargs)
+    return cfg
+
+
+def create_result(cfg):
+    return Result(cfg, stream=StringIO())
+
+
+def mount_suites(cfg, *suites):
+    program = Program(cfg)
+
+    for suite in suites:
+        suite.mount_to(program)
+
+    return program
@@ -0,0 +1,73 @@
+import sys
+import threading
+import unittest
+
+from seismograph.case import Case
+from seismograph.suite import Suite
+from seismograph.groups.default import DefaultCaseGroup
+
+from .helpers import create_config
+from .helpers import create_result
+from .helpers import mount_suites
+
+
+CALLS = []
+
+
+class DefaultGroupSuite(Suite):
+
+    __case_group_class__ = DefaultCaseGroup
+
+
+suite = Suite('asyncio_run_suite')
+default_group_suite = DefaultGroupSuite('asyncio_default_group_suite')
+
+
+@suite.register
+class OverriddenRunCase(Case):
+
+    def __run__(self, result):
+        CALLS.append(self.__class__.__name__)
+
+    def test(self):
+        pass
+
+
+@default_group_suite.register
+class ThreadCase(Case):
+
+    def test(self):
+        CALLS.append(threading.current_thread())
+
+
+@unittest.skipIf(sys.version_info < (3, 5), 'asyncio is not supported')
+class TestAsyncio(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.config = create_config(ASYNCIO=True)
+        mount_suites(cls.config, suite, default_group_suite)
+
+    def setUp(self):
+        del CALLS[:]
+
+    def test_overridden_run(self):
+        from seismograph.groups.asyncio import AsyncioCaseGroup
+
+        group = AsyncioCaseGroup(
+            [OverriddenRunCase('test', config=self.config)], self.config,
+        )
+        group(create_result(self.config))
+
+        self.assertEqual(CALLS, ['OverriddenRunCase'])
+
+    def test_group_in_executor(self):
+        from seismograph.groups.asyncio import AsyncioSuiteGroup
+
+        default_group_suite.build()
+        result = create_result(self.config)
+
+        AsyncioSuiteGroup([default_group_suite], self.config)(result)
+
+        self.assertEqual(len(result.successes), 1)
+        self.assertEqual(len(CALLS), 1)
+        self.assertIsNot(CALLS[0], threading.current_thread())
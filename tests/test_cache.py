@@ -0,0 +1,140 @@
+import os
+import sys
+import shutil
+import tempfile
+import unittest
+
+from seismograph.cache import _caches
+from seismograph.cache import get_digest
+from seismograph.cache import ConfigReader
+from seismograph.datastructures import DictObject
+
+from .helpers import create_config
+from .helpers import create_result
+from .helpers import mount_suites
+
+
+class TestGetDigest(unittest.TestCase):
+    def test_stable(self):
+        self.assertEqual(get_digest('a', 1), get_digest('a', 1))
+
+    def test_separated(self):
+        self.assertNotEqual(get_digest('ab', 'c'), get_digest('a', 'bc'))
+
+
+class TestConfigReader(unittest.TestCase):
+    def setUp(self):
+        self.config = DictObject(A=1, B=2, C=3)
+
+    def test_keys_read(self):
+        reader = ConfigReader(self.config)
+        self.assertEqual(reader.A, 1)
+        self.assertEqual(reader['B'], 2)
+        self.assertEqual(reader.get('D'), None)
+        self.assertEqual(reader.keys_read, ['A', 'B', 'D'])
+
+    def test_set(self):
+        reader = ConfigReader(self.config)
+        reader.A = 10
+        self.assertEqual(self.config.A, 10)
+        self.assertEqual(reader.keys_read, [])
+
+
+CASE_MODULE = '''
+from seismograph.case import Case
+from seismograph.suite import Suite
+
+
+RUNS = []
+
+suite = Suite('cache_invalidation_suite')
+
+
+@suite.register
+class CachedCase(Case):
+
+    __cache_files__ = [{data_path!r}]
+
+    def test(self):
+        RUNS.append(self.config.VALUE)
+'''
+
+
+class TestCacheInvalidation(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.module_dir = tempfile.mkdtemp()
+        cls.module_path = os.path.join(cls.module_dir, 'cache_invalidation_case.py')
+        cls.data_path = os.path.join(cls.module_dir, 'data.txt')
+
+        cls.write_module()
+        sys.path.insert(0, cls.module_dir)
+        cls.module = __import__('cache_invalidation_case')
+        sys.path.remove(cls.module_dir)
+
+        cls.config = create_config(VALUE=1)
+        mount_suites(cls.config, cls.module.suite)
+
+    @classmethod
+    def tearDownClass(cls):
+        sys.modules.pop('cache_invalidation_case', None)
+        shutil.rmtree(cls.module_dir)
+
+    @classmethod
+    def write_module(cls, tail=''):
+        with open(cls.module_path, 'w') as fp:
+            fp.write(CASE_MODULE.format(data_path=cls.data_path) + tail)
+
+    def setUp(self):
+        self.cache_dir = tempfile.mkdtemp()
+
+        self.write_module()
+        self.config.update(VALUE=1, TEST_CACHE=self.cache_dir)
+
+        with open(self.data_path, 'w') as fp:
+            fp.write('data')
+
+        del self.module.RUNS[:]
+
+    def tearDown(self):
+        shutil.rmtree(self.cache_dir)
+
+    def run_case(self):
+        """
+        Returns True if success of case was taken from cache
+        """
+        # each run starts with empty memo of digests as new process
+        _caches.clear()
+
+        result = create_result(self.config)
+        self.module.CachedCase('test', config=self.config)(result)
+
+        (_, xunit_data), = list(result.successes)
+        return xunit_data.cached
+
+    def test_cached(self):
+        self.assertFalse(self.run_case())
+        self.assertTrue(self.run_case())
+        self.assertEqual(self.module.RUNS, [1])
+
+    def test_source_file(self):
+        self.assertFalse(self.run_case())
+        self.write_module(tail='\n# changed\n')
+        self.assertFalse(self.run_case())
+        self.assertTrue(self.run_case())
+
+    def test_config_value(self):
+        self.assertFalse(self.run_case())
+        self.config.VALUE = 2
+        self.assertFalse(self.run_case())
+        self.assertTrue(self.run_case())
+        self.assertEqual(self.module.RUNS, [1, 2])
+
+    def test_declared_file(self):
+        self.assertFalse(self.run_case())
+
+        with open(self.data_path, 'w') as fp:
+            fp.write('changed')
+
+        self.assertFalse(self.run_case())
+        self.assertTrue(self.run_case())
@@ -0,0 +1,180 @@
+import sys
+import unittest
+
+from seismograph.case import Case
+from seismograph.case import CaseLayer
+from seismograph.case import MATCH_CASE_TO_LAYER
+from seismograph.case import skip
+from seismograph.case import flows
+from seismograph.case import CaseSpec
+from seismograph.case import create_case
+from seismograph.case import compile_method
+from seismograph.case import COMPILED_FROM_ATTRIBUTE_NAME
+from seismograph.suite import Suite
+
+from .helpers import create_config
+from .helpers import create_result
+from .helpers import mount_suites
+
+
+suite = Suite('case_spec_suite')
+
+
+@suite.register
+class ExampleCase(Case):
+
+    def test_run(self):
+        pass
+
+    @skip('method')
+    def test_skip(self):
+        pass
+
+
+@suite.register(skip='class')
+class SkippedCase(Case):
+
+    def test_run(self):
+        pass
+
+
+@suite.register
+@flows(1, 2)
+class FlowsCase(Case):
+
+    def test_flow(self, flow):
+        pass
+
+
+@suite.register(always_success=True)
+def always_success(case):
+    pass
+
+
+class TestCaseSpec(unittest.TestCase):
+    def test_not_resolved(self):
+        spec = CaseSpec(ExampleCase, 'test_run')
+        self.assertFalse(spec.is_resolved)
+        self.assertIsInstance(create_case(ExampleCase, 'test_run'), ExampleCase)
+
+    def test_skip_method(self):
+        spec = CaseSpec(ExampleCase, 'test_skip')
+        self.assertTrue(spec.is_resolved)
+        self.assertEqual(spec.skip_reason, 'method')
+
+    def test_skip_class(self):
+        spec = create_case(SkippedCase, 'test_run')
+        self.assertIsInstance(spec, CaseSpec)
+        self.assertEqual(spec.skip_reason, 'class')
+
+    def test_always_success(self):
+        cls = suite.get_case_class('always_success')
+        spec = create_case(cls, 'test')
+        self.assertIsInstance(spec, CaseSpec)
+        self.assertIsNone(spec.skip_reason)
+        self.assertTrue(spec.always_success)
+
+
+class RecordLayer(CaseLayer):
+
+    def __init__(self):
+        super(RecordLayer, self).__init__()
+        self.calls = []
+
+    def on_skip(self, case, reason, result):
+        self.calls.append(('on_skip', case, reason))
+
+    def on_success(self, case):
+        self.calls.append(('on_success', case))
+
+
+class MatchCase(Case):
+    pass
+
+
+class TestResolvedCaseLayers(unittest.TestCase):
+    def setUp(self):
+        self.layer = RecordLayer()
+        self.match_layer = RecordLayer()
+        MATCH_CASE_TO_LAYER[MatchCase] = self.match_layer
+
+        self.suite = Suite('resolved_case_layers_suite_{}'.format(id(self)))
+
+        @self.suite.register(skip='reason', layers=[self.layer])
+        class SkippedCase(MatchCase):
+            def test(self):
+                pass
+
+        @self.suite.register(always_success=True, layers=[self.layer])
+        class SuccessCase(Case):
+            def test(self):
+                pass
+
+        self.config = create_config()
+        mount_suites(self.config, self.suite)
+
+    def tearDown(self):
+        MATCH_CASE_TO_LAYER.pop(MatchCase)
+
+    def test_layers(self):
+        self.suite.build()
+        result = create_result(self.config)
+        self.suite(result)
+
+        skipped, success = [case for box in self.suite for case in box]
+
+        self.assertEqual(
+            self.layer.calls,
+            [('on_skip', skipped, 'reason'), ('on_success', success)],
+        )
+        self.assertIsInstance(skipped, CaseSpec)
+        self.assertEqual(self.match_layer.calls, [('on_skip', skipped, 'reason')])
+        self.assertEqual(len(result.skipped), 1)
+        self.assertEqual(len(result.successes), 1)
+
+
+class TestCompile(unittest.TestCase):
+    def test_compile_method(self):
+        def method():
+            pass
+
+        compiled = compile_method(method, lambda f: lambda: f())
+        self.assertIs(getattr(compiled, COMPILED_FROM_ATTRIBUTE_NAME), method)
+
+        recompiled = compile_method(compiled, lambda f: lambda: f())
+        self.assertIs(getattr(recompiled, COMPILED_FROM_ATTRIBUTE_NAME), method)
+
+    def test_compiled_once(self):
+        FlowsCase('test_flow')
+        compiled = FlowsCase.__dict__['test_flow']
+
+        for _ in range(3):
+            FlowsCase('test_flow')
+
+        self.assertIs(FlowsCase.__dict__['test_flow'], compiled)
+
+
+@unittest.skipIf(sys.version_info < (3, 5), 'awaitable objects need python 3.5 and greater')
+class TestAwaitableInSyncGroup(unittest.TestCase):
+    def setUp(self):
+        class Awaitable(object):
+            def __await__(self):
+                yield
+
+        self.suite = Suite('awaitable_in_sync_group_suite')
+
+        @self.suite.register
+        class AwaitableCase(Case):
+            def test(self):
+                return Awaitable()
+
+        self.config = create_config()
+        mount_suites(self.config, self.suite)
+
+    def test_error(self):
+        self.suite.build()
+        result = create_result(self.config)
+        self.suite(result)
+
+        self.assertEqual(len(result.successes), 0)
+        self.assertEqual(len(result.errors), 1)
@@ -0,0 +1,113 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from seismograph import events
+from seismograph.case import Case
+from seismograph.suite import Suite
+from seismograph.groups.multiprocessing import MultiprocessingSuiteGroup
+
+from .helpers import create_config
+from .helpers import create_result
+from .helpers import mount_suites
+
+
+class TestEventsLog(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmp_dir, 'events')
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def check_format(self, fmt):
+        log = events.EventsLog(self.path, fmt=fmt)
+        log.write(events.RUN_START, name='test')
+
+        with open(self.path, 'rb') as fp:
+            records = list(events.read(fp, fmt))
+            self.assertEqual(len(records), 1)
+            self.assertEqual(records[0]['event'], events.RUN_START)
+            self.assertEqual(records[0]['name'], 'test')
+
+            log.write(events.RUN_END)
+            log.close()
+
+            records = list(events.read(fp, fmt))
+            self.assertEqual([r['event'] for r in records], [events.RUN_END])
+
+    def test_json(self):
+        self.check_format(events.JSON_FORMAT)
+
+    def test_marshal(self):
+        self.check_format(events.MARSHAL_FORMAT)
+
+    def test_partial_record(self):
+        record = events.dump_json({'event': events.RUN_START})
+
+        with open(self.path, 'wb') as fp:
+            fp.write(record + record[:5])
+
+        with open(self.path, 'rb') as fp:
+            self.assertEqual(len(list(events.read(fp))), 1)
+            self.assertEqual(fp.tell(), len(record))
+
+    def test_unknown_format(self):
+        with self.assertRaises(ValueError):
+            events.EventsLog(self.path, fmt='xml')
+
+
+class TestMultiprocessingEvents(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmp_dir, 'events')
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def test_suite_events(self):
+        suites = [Suite('mp_events_first'), Suite('mp_events_second')]
+
+        for suite in suites:
+            @suite.register
+            class ExampleCase(Case):
+
+                def test_one(self):
+                    pass
+
+                def test_two(self):
+                    pass
+
+        config = create_config(MULTIPROCESSING=True, ASYNC_SUITES=2)
+        mount_suites(config, *suites)
+
+        for suite in suites:
+            suite.build()
+
+        result = create_result(config)
+        result.start_events_log(self.path)
+
+        group = MultiprocessingSuiteGroup(suites, config)
+        group(result)
+
+        with open(self.path, 'rb') as fp:
+            records = list(events.read(fp))
+
+        for suite in suites:
+            names = [
+                r['event'] for r in records
+                if r.get('name') == suite.name
+                or r.get('class_name', '').startswith(suite.name + '.')
+            ]
+            self.assertEqual(names[0], events.SUITE_START)
+            self.assertEqual(names[-1], events.SUITE_END)
+            self.assertEqual(names.count(events.SUITE_START), 1)
+            self.assertEqual(names.count(events.SUITE_END), 1)
+            self.assertEqual(names.count(events.CASE_END), 2)
+
+            suite_end = [
+                r for r in records
+                if r['event'] == events.SUITE_END and r['name'] == suite.name
+            ][0]
+            self.assertEqual(suite_end['tests'], 2)
@@ -0,0 +1,101 @@
+import unittest
+
+from seismograph import extensions
+from seismograph.program import Program
+from seismograph.extensions import RUN_SCOPE
+from seismograph.extensions import CASE_SCOPE
+from seismograph.extensions import SUITE_SCOPE
+from seismograph.extensions import DataContainer
+from seismograph.extensions import ExtensionContainer
+
+
+class Client(object):
+    def __init__(self):
+        self.was_reset = False
+
+    def __reset__(self):
+        self.was_reset = True
+
+
+class TestExtensionContainer(unittest.TestCase):
+    def test_unknown_scope(self):
+        with self.assertRaises(ValueError):
+            ExtensionContainer(Client, scope='unknown')
+
+    def test_case_scope(self):
+        container = ExtensionContainer(object, scope=CASE_SCOPE)
+        instance = container()
+        container.release(instance)
+        self.assertIsNot(container(), instance)
+
+    def test_case_scope_pool(self):
+        container = ExtensionContainer(Client, scope=CASE_SCOPE)
+        instance = container()
+        container.release(instance)
+        self.assertTrue(instance.was_reset)
+        self.assertIs(container(), instance)
+
+    def test_reset_hook(self):
+        calls = []
+        container = ExtensionContainer(object, scope=CASE_SCOPE, reset=calls.append)
+        instance = container()
+        container.release(instance)
+        self.assertEqual(calls, [instance])
+        self.assertIs(container(), instance)
+
+    def test_run_scope(self):
+        container = ExtensionContainer(Client, scope=RUN_SCOPE)
+        instance = container()
+        container.release(instance)
+        self.assertFalse(instance.was_reset)
+        self.assertIs(container(), instance)
+
+    def test_suite_scope(self):
+        container = ExtensionContainer(Client, scope=SUITE_SCOPE)
+        instance = container(suite_name='a')
+        self.assertIs(container(suite_name='a'), instance)
+        self.assertIsNot(container(suite_name='b'), instance)
+
+        container.release_key('a')
+        self.assertTrue(instance.was_reset)
+        self.assertIs(container(suite_name='c'), instance)
+
+    def test_not_pooled(self):
+        container = ExtensionContainer(Client, scope=CASE_SCOPE)
+        instance = container()
+        container.release(instance)
+
+        self.assertIsNot(container.acquire(pool=False), instance)
+        self.assertIs(container(), instance)
+
+    def test_data(self):
+        data = {'a': [1]}
+        container = DataContainer(data)
+        self.assertEqual(container(), data)
+        self.assertIsNot(container(), data)
+        self.assertIsNot(container()['a'], data['a'])
+
+
+class TestSet(unittest.TestCase):
+    def tearDown(self):
+        extensions._TMP.pop('test_extensions_data', None)
+        extensions._TMP.pop('test_extensions_client', None)
+
+    def test_singleton_data_is_copied(self):
+        data = {'a': [1]}
+        extensions.set(data, 'test_extensions_data', is_data=True, singleton=True)
+
+        copy = extensions.get('test_extensions_data')
+        copy['a'].append(2)
+
+        self.assertEqual(extensions.get('test_extensions_data'), {'a': [1]})
+        self.assertEqual(data, {'a': [1]})
+
+    def test_ext_of_program(self):
+        Program.shared_extension('test_extensions_client', Client)
+
+        instance = extensions.get('test_extensions_client')
+        extensions.release('test_extensions_client', instance)
+
+        self.assertIsNot(Program.ext('test_extensions_client'), instance)
+        self.assertIs(extensions.get('test_extensions_client'), instance)
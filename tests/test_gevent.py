@@ -0,0 +1,75 @@
+import unittest
+
+try:
+    import gevent
+except ImportError:
+    gevent = None
+
+from seismograph.case import Case
+from seismograph.suite import Suite
+
+from .helpers import create_config
+from .helpers import create_result
+from .helpers import mount_suites
+
+
+EVENTS = []
+
+
+def create_suite(name):
+    suite = Suite(name)
+
+    @suite.register
+    class FirstCase(Case):
+
+        def test(self):
+            EVENTS.append('start')
+            gevent.sleep(0.01)
+            EVENTS.append('end')
+
+    @suite.register
+    class SecondCase(Case):
+
+        def test(self):
+            EVENTS.append('start')
+            gevent.sleep(0.01)
+            EVENTS.append('end')
+
+    return suite
+
+
+@unittest.skipIf(gevent is None, 'gevent is not installed')
+class TestGevent(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.config = create_config(GEVENT=True, ASYNC_SUITES=2, ASYNC_TESTS=2)
+        cls.suites = [create_suite('gevent_first_suite'), create_suite('gevent_second_suite')]
+        mount_suites(cls.config, *cls.suites)
+
+        for suite in cls.suites:
+            suite.build()
+
+    def setUp(self):
+        del EVENTS[:]
+
+    def test_case_group(self):
+        from seismograph.groups.gevent import GeventCaseGroup
+
+        suite = self.suites[0]
+        group = suite._make_group()
+        self.assertIsInstance(group, GeventCaseGroup)
+
+        result = create_result(self.config)
+        suite(result)
+
+        self.assertEqual(len(result.successes), 2)
+        self.assertEqual(EVENTS, ['start', 'start', 'end', 'end'])
+
+    def test_suite_group(self):
+        from seismograph.groups.gevent import GeventSuiteGroup
+
+        result = create_result(self.config)
+        GeventSuiteGroup(self.suites, self.config)(result)
+
+        self.assertEqual(len(result.successes), 4)
+        self.assertEqual(EVENTS, ['start'] * 4 + ['end'] * 4)
@@ -0,0 +1,124 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from seismograph.case import Case
+from seismograph.case import CaseSpec
+from seismograph.suite import Suite
+from seismograph.history import History
+from seismograph.history import merge_runtime
+from seismograph.collector import get_shuffle
+
+from .helpers import create_config
+from .helpers import create_result
+from .helpers import mount_suites
+
+
+class TestMergeRuntime(unittest.TestCase):
+    def test_new(self):
+        self.assertEqual(merge_runtime(None, 2.0), 2.0)
+
+    def test_merge(self):
+        self.assertEqual(merge_runtime(1.0, 3.0), 2.0)
+
+
+class TestHistory(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.test_path = os.path.join(self.test_dir, 'history.json')
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+
+    def test_not_exist(self):
+        obj = History.from_file(self.test_path)
+        self.assertFalse(obj)
+
+    def test_corrupted(self):
+        with open(self.test_path, 'w') as f:
+            f.write('{')
+        obj = History.from_file(self.test_path)
+        self.assertFalse(obj)
+
+    def test_file(self):
+        History(suites={'suite': 3.0}, tests={'suite.Case:test': 1.5}).to_file(self.test_path)
+        obj = History.from_file(self.test_path)
+        self.assertEqual(obj.suites, {'suite': 3.0})
+        self.assertEqual(obj.tests, {'suite.Case:test': 1.5})
+
+    def test_overwrite_file(self):
+        History(suites={'suite': 3.0}).to_file(self.test_path)
+        History(suites={'suite': 1.0}).to_file(self.test_path)
+        obj = History.from_file(self.test_path)
+        self.assertEqual(obj.suites, {'suite': 1.0})
+
+    def test_loaded_history_is_used(self):
+        cfg = create_config(LPT=True, HISTORY=self.test_path)
+        obj = History(suites={'suite': 3.0})
+        self.assertEqual(get_shuffle(cfg, runtime_history=obj), obj.sort)
+
+    def test_default_runtime(self):
+        obj = History(tests={'a': 1.0, 'b': 3.0})
+        self.assertEqual(obj.default_runtime, 2.0)
+        self.assertEqual(History().default_runtime, 0.0)
+
+    def test_expected_runtime_of_unknown(self):
+        self.assertEqual(History().expected_runtime(object()), 0.0)
+
+    def test_expected_runtime_of_not_built(self):
+        suite = Suite('history_suite')
+
+        @suite.register
+        class ExampleCase(Case):
+            def test_one(self):
+                pass
+
+            def test_two(self):
+                pass
+
+        obj = History(tests={'history_suite.ExampleCase:test_one': 2.0, 'other.Case:test': 1.0})
+        self.assertEqual(obj.expected_runtime(suite), 2.0 + obj.default_runtime)
+        self.assertEqual(obj.expected_runtime(CaseSpec(ExampleCase, 'test_one')), 2.0)
+
+
+class TestCachedRun(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.suite = Suite('history_cached_suite')
+
+        @cls.suite.register
+        class CachedCase(Case):
+            def test_one(self):
+                pass
+
+            def test_two(self):
+                pass
+
+        cls.config = create_config()
+        mount_suites(cls.config, cls.suite)
+        cls.suite.build()
+
+    def run_cached(self):
+        result = create_result(self.config)
+
+        with result.proxy(self.suite, timer=lambda: 0.5) as proxy:
+            for case in [case for box in self.suite for case in box]:
+                proxy.add_success(case, 0.0, cached=True)
+
+        return result
+
+    def test_history_is_not_changed(self):
+        suites = {'history_cached_suite': 3.0}
+        tests = {
+            'history_cached_suite.CachedCase:test_one': 1.0,
+            'history_cached_suite.CachedCase:test_two': 2.0,
+        }
+        obj = History(suites=dict(suites), tests=dict(tests))
+        obj.update(self.run_cached())
+
+        self.assertEqual(obj.suites, suites)
+        self.assertEqual(obj.tests, tests)
+
+    def test_durations(self):
+        self.assertEqual(self.run_cached().get_durations(10), [])
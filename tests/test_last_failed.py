@@ -0,0 +1,136 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from seismograph import config
+from seismograph import collector
+from seismograph.case import Case
+from seismograph.case import CaseSpec
+from seismograph.suite import Suite
+from seismograph.last_failed import LastFailed
+from seismograph.last_failed import get_command
+
+from .helpers import create_config
+from .helpers import create_result
+from .helpers import mount_suites
+
+
+class TestLastFailed(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.test_path = os.path.join(self.test_dir, 'last_failed')
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+
+    def test_not_exist(self):
+        obj = LastFailed.from_file(self.test_path)
+        self.assertFalse(obj)
+
+    def test_corrupted(self):
+        with open(self.test_path, 'w') as f:
+            f.write('{')
+        obj = LastFailed.from_file(self.test_path)
+        self.assertFalse(obj)
+
+    def test_file(self):
+        LastFailed(commands=['suite:Case.test', 'other']).to_file(self.test_path)
+        obj = LastFailed.from_file(self.test_path)
+        self.assertEqual(obj.commands, ['suite:Case.test', 'other'])
+
+    def test_case_spec(self):
+        suite = Suite('last_failed_suite')
+
+        @suite.register
+        class ExampleCase(Case):
+            def test(self):
+                pass
+
+        spec = CaseSpec(ExampleCase, 'test')
+        self.assertEqual(get_command(spec), 'last_failed_suite:ExampleCase.test')
+        self.assertTrue(LastFailed(commands=['last_failed_suite:ExampleCase.test']).is_failed(spec))
+        self.assertFalse(LastFailed(commands=['other']).is_failed(spec))
+
+
+class TestLastFailedGenerator(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.test_path = os.path.join(self.test_dir, 'last_failed')
+
+        LastFailed(commands=['lf_generator_second:SecondCase.test_b']).to_file(self.test_path)
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+
+    def create_suites(self, cfg):
+        suites = [Suite('lf_generator_first'), Suite('lf_generator_second')]
+
+        for suite in suites:
+            @suite.register
+            class FirstCase(Case):
+                def test(self):
+                    pass
+
+            @suite.register
+            class SecondCase(Case):
+                def test_a(self):
+                    pass
+
+                def test_b(self):
+                    pass
+
+        mount_suites(cfg, *suites)
+        return suites
+
+    def create_config(self, **kwargs):
+        cfg = create_config(EAGER_BUILD=True, LAST_FAILED_FILE=self.test_path, **kwargs)
+        config.prepare_config(cfg)
+        return cfg
+
+    @staticmethod
+    def get_commands(suite):
+        return [get_command(case) for box in suite for case in box]
+
+    def test_default_file(self):
+        cfg = create_config()
+        config.prepare_config(cfg)
+        self.assertEqual(cfg.LAST_FAILED_FILE, config.DEFAULT_LAST_FAILED_FILE)
+
+        cfg = create_config(LAST_FAILED=True, LAST_FAILED_FILE=None)
+        config.prepare_config(cfg)
+        self.assertEqual(cfg.LAST_FAILED_FILE, config.DEFAULT_LAST_FAILED_FILE)
+
+    def test_file_of_plain_run(self):
+        os.remove(self.test_path)
+
+        create_result(self.create_config(NO_LAST_FAILED_FILE=True)).final()
+        self.assertFalse(os.path.exists(self.test_path))
+
+        create_result(self.create_config()).final()
+        self.assertTrue(os.path.exists(self.test_path))
+
+    def test_last_failed(self):
+        cfg = self.create_config(LAST_FAILED=True)
+        suites = list(collector.create_generator(self.create_suites(cfg), cfg))
+
+        self.assertEqual([s.name for s in suites], ['lf_generator_second'])
+        self.assertEqual(
+            self.get_commands(suites[0]), ['lf_generator_second:SecondCase.test_b'],
+        )
+
+    def test_failed_first(self):
+        cfg = self.create_config(FAILED_FIRST=True)
+        suites = list(collector.create_generator(self.create_suites(cfg), cfg))
+
+        self.assertEqual(
+            [s.name for s in suites], ['lf_generator_second', 'lf_generator_first'],
+        )
+        self.assertEqual(
+            self.get_commands(suites[0]),
+            [
+                'lf_generator_second:SecondCase.test_b',
+                'lf_generator_second:SecondCase.test_a',
+                'lf_generator_second:FirstCase.test',
+            ],
+        )
@@ -0,0 +1,58 @@
+import unittest
+
+from seismograph.case import Case
+from seismograph.loader import invalidate_test_names
+from seismograph.loader import load_test_names_from_case
+
+
+class TestLoadTestNames(unittest.TestCase):
+    def test_added_method(self):
+        class ExampleCase(Case):
+            def test_one(self):
+                pass
+
+        self.assertEqual(list(load_test_names_from_case(ExampleCase)), ['test_one'])
+
+        setattr(ExampleCase, 'test_two', lambda self: None)
+        self.assertEqual(list(load_test_names_from_case(ExampleCase)), ['test_one', 'test_two'])
+
+    def test_subclass(self):
+        class BaseCase(Case):
+            def test_one(self):
+                pass
+
+        class ExampleCase(BaseCase):
+            def test_two(self):
+                pass
+
+        self.assertEqual(list(load_test_names_from_case(BaseCase)), ['test_one'])
+        self.assertEqual(list(load_test_names_from_case(ExampleCase)), ['test_one', 'test_two'])
+
+        setattr(BaseCase, 'test_three', lambda self: None)
+        self.assertEqual(
+            list(load_test_names_from_case(ExampleCase)), ['test_one', 'test_three', 'test_two'],
+        )
+
+    def test_swapped_method(self):
+        class ExampleCase(Case):
+            def test_one(self):
+                pass
+
+        self.assertEqual(list(load_test_names_from_case(ExampleCase)), ['test_one'])
+
+        delattr(ExampleCase, 'test_one')
+        setattr(ExampleCase, 'test_two', lambda self: None)
+        self.assertEqual(list(load_test_names_from_case(ExampleCase)), ['test_two'])
+
+    def test_base_which_is_not_case(self):
+        class Mixin(object):
+            pass
+
+        class ExampleCase(Case, Mixin):
+            pass
+
+        self.assertEqual(list(load_test_names_from_case(ExampleCase)), [])
+
+        Mixin.test_one = lambda self: None
+        invalidate_test_names()
+        self.assertEqual(list(load_test_names_from_case(ExampleCase)), ['test_one'])
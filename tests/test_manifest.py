@@ -0,0 +1,53 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from seismograph.manifest import Manifest
+
+
+class TestManifest(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.test_path = os.path.join(self.test_dir, 'manifest.json')
+        self.module_path = os.path.join(self.test_dir, 'module.py')
+
+        with open(self.module_path, 'w') as f:
+            f.write('x = 1\n')
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+
+    def test_not_exist(self):
+        obj = Manifest.from_file(self.test_path)
+        self.assertEqual(obj.modules, {})
+
+    def test_valid(self):
+        obj = Manifest()
+        obj.add('module', self.module_path, [])
+        obj.to_file(self.test_path)
+        obj = Manifest.from_file(self.test_path)
+        self.assertTrue(obj.is_valid('module', self.module_path))
+        self.assertFalse(obj.is_valid('other', self.module_path))
+
+    def test_changed(self):
+        obj = Manifest()
+        obj.add('module', self.module_path, [])
+        with open(self.module_path, 'w') as f:
+            f.write('x = 2\n\n')
+        self.assertFalse(obj.is_valid('module', self.module_path))
+
+    def test_retain(self):
+        obj = Manifest()
+        obj.add('module', self.module_path, [])
+        obj.retain(set())
+        self.assertEqual(obj.modules, {})
+
+    def test_suite_index(self):
+        obj = Manifest(
+            modules={
+                'a': {'suites': [{'name': 'suite_a', 'cases': []}]},
+                'b': {'suites': [{'name': 'suite_b', 'cases': []}]},
+            },
+        )
+        self.assertEqual(obj.suite_index, {'suite_a': 'a', 'suite_b': 'b'})
@@ -0,0 +1,63 @@
+import os
+import unittest
+
+from seismograph.utils.mp import shared_flag
+from seismograph.utils.mp import get_rss_size
+from seismograph.utils.mp import SharedString
+from seismograph.utils.mp import MPSupportedValue
+from seismograph.utils.mp import SHARED_STRING_SIZE
+from seismograph.groups.multiprocessing import should_recycle
+
+
+class TestSharedString(unittest.TestCase):
+    def test_value(self):
+        obj = SharedString('test_name')
+        self.assertEqual(obj.value, 'test_name')
+
+    def test_none(self):
+        obj = SharedString()
+        self.assertEqual(obj.value, '')
+
+    def test_truncate(self):
+        obj = SharedString('x' * (SHARED_STRING_SIZE * 2))
+        self.assertEqual(len(obj.value), SHARED_STRING_SIZE - 1)
+
+
+class TestMPSupportedValue(unittest.TestCase):
+    def test_local(self):
+        obj = MPSupportedValue('test_value')
+        obj.value = 'new_value'
+        self.assertEqual(obj.value, 'new_value')
+
+    def test_shared_string(self):
+        obj = MPSupportedValue('test_value')
+        obj.set(SharedString(obj.value))
+        self.assertEqual(obj.value, 'test_value')
+        obj.value = 'new_value'
+        self.assertEqual(obj.value, 'new_value')
+
+    def test_shared_flag(self):
+        obj = MPSupportedValue(False)
+        obj.set(shared_flag(obj.value))
+        self.assertIs(obj.value, False)
+        obj.value = True
+        self.assertIs(obj.value, True)
+
+
+class TestShouldRecycle(unittest.TestCase):
+    def test_max_suites(self):
+        self.assertFalse(should_recycle(1, max_suites=2))
+        self.assertTrue(should_recycle(2, max_suites=2))
+
+    @unittest.skipUnless(os.path.exists('/proc/self/statm'), 'RSS can not be read')
+    def test_max_rss(self):
+        rss_size = get_rss_size()
+        self.assertGreater(rss_size, 0)
+
+        self.assertFalse(should_recycle(0, max_rss=int(rss_size) * 10))
+        self.assertTrue(should_recycle(0, max_rss=1))
+
+    @unittest.skipIf(os.path.exists('/proc/self/statm'), 'RSS can be read')
+    def test_unknown_rss(self):
+        self.assertIsNone(get_rss_size())
+        self.assertFalse(should_recycle(0, max_rss=1))
@@ -0,0 +1,37 @@
+import os
+import shutil
+import cProfile
+import tempfile
+import unittest
+
+from seismograph import profiler
+
+
+class TestCreateReport(unittest.TestCase):
+    def setUp(self):
+        self.path = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.path)
+
+    def dump(self, name):
+        file_path = os.path.join(self.path, name + profiler.FILE_EXTENSION)
+        profile = cProfile.Profile()
+        profile.enable()
+        sorted([3, 2, 1])
+        profile.disable()
+        profile.dump_stats(file_path)
+        return file_path
+
+    def test_report(self):
+        self.dump('first')
+        report = profiler.create_report(self.path, 5)
+        self.assertIn('Profile of 1 cases', report)
+        self.assertIn('sorted', report)
+
+    def test_old_files(self):
+        old_path = self.dump('old')
+        old_files = {old_path: os.path.getmtime(old_path)}
+        self.assertEqual(profiler.create_report(self.path, 5, old_files=old_files), None)
+        self.dump('new')
+        self.assertIn('Profile of 1 cases', profiler.create_report(self.path, 5, old_files=old_files))
@@ -0,0 +1,50 @@
+import traceback
+import unittest
+
+from seismograph import reason
+
+
+def fail(message):
+    raise ValueError(message)
+
+
+def fail_with_context():
+    try:
+        fail('first')
+    except ValueError:
+        fail('second')
+
+
+class TestTraceback(unittest.TestCase):
+    def capture(self, func, *args):
+        try:
+            func(*args)
+        except ValueError:
+            return reason.get_traceback(), traceback.format_exc()
+
+    def test_render(self):
+        tb, expected = self.capture(fail, 'message')
+        self.assertEqual(tb.render(), expected)
+
+    def test_chain(self):
+        tb, expected = self.capture(fail_with_context)
+        self.assertEqual(tb.render(), expected)
+
+    def test_rendered_once(self):
+        first, _ = self.capture(fail, 'message')
+        second, _ = self.capture(fail, 'message')
+        self.assertEqual(first.key, second.key)
+        self.assertIs(first.render(), second.render())
+
+
+class Runnable(object):
+    __create_reason__ = False
+
+
+class TestReason(unittest.TestCase):
+    def test_format_with_log(self):
+        crash_reason = reason.create(Runnable(), u'traceback\n', log=u'log line\n')
+        self.assertEqual(
+            reason.format_reason(crash_reason),
+            u'traceback\n\nCaptured log:\n\nlog line\n',
+        )
@@ -0,0 +1,186 @@
+import os
+import unittest
+from threading import Thread
+
+from seismograph import reason
+from seismograph.result import Console
+from seismograph.result import Storage
+from seismograph.result import CaseCapture
+from seismograph.result import ConsoleWriter
+from seismograph.xunit import XUnitData
+from seismograph.runnable import RunnableObject
+from seismograph.runnable import RunnableRecord
+from seismograph.reason import get_traceback
+
+from .helpers import create_config
+from .helpers import create_result
+
+
+class TestStorage(unittest.TestCase):
+    def setUp(self):
+        self.first = RunnableRecord(1, 'suite', 'first')
+        self.second = RunnableRecord(2, 'suite', 'second')
+        self.storage = Storage()
+        self.storage.append((self.first, XUnitData(runtime=1.0)))
+        self.storage.append((self.second, XUnitData(runtime=2.0, cached=True)))
+
+    def test_counters(self):
+        self.assertEqual(len(self.storage), 2)
+        self.assertEqual(self.storage.runtime, 3.0)
+        self.assertEqual(self.storage.cached, 1)
+
+    def test_get(self):
+        self.assertEqual(self.storage.get(self.second).runtime, 2.0)
+        self.assertEqual(self.storage.get(RunnableRecord(3, 'suite', 'third')), None)
+
+    def test_reset(self):
+        self.assertTrue(self.storage.reset(self.first, XUnitData(runtime=5.0)))
+        self.assertEqual(self.storage.runtime, 7.0)
+        self.assertEqual(self.storage.last[0], self.first)
+        self.assertEqual([r for r, _ in self.storage], [self.second, self.first])
+
+    def test_remove(self):
+        self.storage.remove(self.second)
+        self.assertEqual(len(self.storage), 1)
+        self.assertEqual(self.storage.cached, 0)
+        self.assertEqual(self.storage.remove(self.second), None)
+
+    def test_record_of_runnable_object(self):
+        runnable_object = RunnableObject()
+        self.storage.append((runnable_object, XUnitData(runtime=1.0)))
+        record, _ = self.storage.last
+        self.assertIsInstance(record, RunnableRecord)
+        self.assertEqual(record.id, runnable_object.id)
+        self.assertEqual(self.storage.get(runnable_object).runtime, 1.0)
+
+    def test_concurrent_append(self):
+        storage = Storage()
+
+        def target(num):
+            for i in range(2000):
+                storage.append(
+                    (RunnableRecord((num, i), 'suite', 'test'), XUnitData(runtime=1.0)),
+                )
+            storage.extend(
+                [(RunnableRecord((num, 'extend'), 'suite', 'test'), XUnitData(runtime=1.0))],
+            )
+
+        threads = [Thread(target=target, args=(num, )) for num in range(8)]
+
+        for thread in threads:
+            thread.start()
+
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(storage), 8 * 2001)
+        self.assertEqual(storage.runtime, 8 * 2001.0)
+
+
+class Stream(object):
+    def __init__(self):
+        self.data = []
+
+    def write(self, s):
+        self.data.append(s)
+
+    def flush(self):
+        pass
+
+
+class TestConsoleWriter(unittest.TestCase):
+    def test_write(self):
+        stream = Stream()
+        writer = ConsoleWriter(stream)
+        console = Console(stream, writer=writer)
+
+        console.write('a')
+        console.child_console()('b')
+        console.flush()
+        console.write('c')
+        console.flush()
+        console.wait()
+
+        self.assertEqual(u''.join(stream.data), u'a  b\nc')
+
+        writer.close()
+
+    @unittest.skipUnless(hasattr(os, 'fork'), 'fork is not supported')
+    def test_write_in_child_process(self):
+        read_fd, write_fd = os.pipe()
+        stream = os.fdopen(write_fd, 'w')
+        writer = ConsoleWriter(stream)
+        writer.write('a')
+        writer.wait()
+
+        pid = os.fork()
+
+        if pid == 0:
+            writer.write('b')
+            os._exit(0)
+
+        os.waitpid(pid, 0)
+        writer.close()
+        stream.close()
+
+        with os.fdopen(read_fd) as fp:
+            self.assertEqual(fp.read(), 'ab')
+
+
+class TestCaseCapture(unittest.TestCase):
+    def test_in_memory(self):
+        capture = CaseCapture(max_size=100)
+        capture.write('a\n')
+        capture.write(u'b\n')
+        self.assertFalse(capture.is_spilled)
+        self.assertEqual(capture.getvalue(), u'a\nb\n')
+        capture.close()
+
+    def test_spill(self):
+        capture = CaseCapture(max_size=10)
+        lines = [u'line {}\n'.format(i) for i in range(10)]
+        for line in lines:
+            capture.write(line)
+        self.assertTrue(capture.is_spilled)
+        self.assertEqual(capture.getvalue(), u''.join(lines))
+        capture.close()
+        self.assertFalse(capture)
+
+
+class CrashObject(RunnableObject):
+
+    def __is_run__(self):
+        return True
+
+
+class TestReasonOfCrash(unittest.TestCase):
+    def test_captured_reason_is_reused(self):
+        result = create_result(create_config(NO_LAST_FAILED_FILE=True))
+
+        try:
+            raise ValueError('crash of object')
+        except ValueError as error:
+            result.add_error(CrashObject(), get_traceback(), 0.1, error)
+
+        _, xunit_data = result.errors.last
+        self.assertIsInstance(xunit_data.crash_reason, reason.Reason)
+        self.assertIn(u'ValueError: crash of object', xunit_data.reason)
+
+        result.final()
+        output = result._stream.getvalue()
+
+        self.assertIn(repr(xunit_data.crash_reason.runnable_object), output)
+        self.assertEqual(output.count(u'ValueError: crash of object'), 1)
+        self.assertIsInstance(xunit_data.crash_reason, reason.Reason)
+
+    def test_reason_from_other_process(self):
+        result = create_result(create_config(NO_LAST_FAILED_FILE=True))
+        record = RunnableRecord(1, 'tests.Object', 'test', description='<tests.Object>')
+        result.errors.append(
+            (record, XUnitData(reason=u'text of reason', runtime=0.1, class_name='tests.Object', method_name='test')),
+        )
+
+        result.final()
+        self.assertIn(
+            reason.format_output(record, u'text of reason'), result._stream.getvalue(),
+        )
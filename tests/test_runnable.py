@@ -0,0 +1,99 @@
+import sys
+import unittest
+
+from seismograph import runnable
+from seismograph.case import CaseLayer
+
+
+class SetupLayer(CaseLayer):
+
+    def __init__(self):
+        super(SetupLayer, self).__init__()
+        self.calls = []
+
+    def on_setup(self, case):
+        self.calls.append(case)
+
+
+class TestLayerChains(unittest.TestCase):
+    def setUp(self):
+        self.cache = {}
+        self.layer = SetupLayer()
+        self.default_layer = CaseLayer()
+        self.get_layers = lambda: [l for l in (self.layer, self.default_layer) if l.enabled]
+
+    def get_chains(self):
+        return runnable.get_layer_chains(self.cache, 'key', self.get_layers, CaseLayer)
+
+    def test_not_overridden(self):
+        chains = self.get_chains()
+        self.assertEqual(len(chains.layers), 2)
+        self.assertEqual(chains['on_setup'], (self.layer.on_setup, ))
+        self.assertEqual(chains['on_teardown'], ())
+
+    def test_cached(self):
+        self.assertIs(self.get_chains(), self.get_chains())
+
+    def test_toggle(self):
+        chains = self.get_chains()
+        self.layer.enabled = False
+        self.assertIsNot(self.get_chains(), chains)
+        self.assertEqual(self.get_chains()['on_setup'], ())
+
+    def test_invalidate(self):
+        chains = self.get_chains()
+        runnable.invalidate_layers()
+        self.assertIsNot(self.get_chains(), chains)
+
+
+class TestRunFlow(unittest.TestCase):
+    def test_error_is_raised_in_flow(self):
+        calls = []
+
+        def fail():
+            raise AssertionError('fail')
+
+        def flow():
+            try:
+                yield runnable.Chain((fail, ))
+            except AssertionError as error:
+                calls.append(str(error))
+            finally:
+                yield runnable.Chain((calls.append, ), args=('finally', ))
+
+        runnable.run_flow(flow())
+        self.assertEqual(calls, ['fail', 'finally'])
+
+    def test_error_of_flow(self):
+        def flow():
+            yield runnable.Chain((lambda: 1 / 0, ))
+
+        with self.assertRaises(ZeroDivisionError):
+            runnable.run_flow(flow())
+
+
+class Awaitable(object):
+
+    def __init__(self):
+        self.closed = False
+
+    def __await__(self):
+        yield
+
+    def close(self):
+        self.closed = True
+
+
+@unittest.skipIf(sys.version_info < (3, 5), 'awaitable objects need python 3.5 and greater')
+class TestAwaitableInChain(unittest.TestCase):
+    def test_error(self):
+        awaitable = Awaitable()
+
+        def test():
+            return awaitable
+
+        with self.assertRaises(RuntimeError) as ctx:
+            runnable.Chain((test, ))()
+
+        self.assertIn('asyncio group is required', str(ctx.exception))
+        self.assertTrue(awaitable.closed)
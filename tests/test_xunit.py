@@ -0,0 +1,222 @@
+import os
+import sys
+import time
+import shutil
+import tempfile
+import unittest
+import xml.dom.minidom
+
+from six import StringIO
+
+from seismograph.result import State
+from seismograph.result import Storage
+from seismograph.xunit import XUnitData
+from seismograph.xunit import XUnitWriter
+from seismograph.xunit import render_phases
+from seismograph.utils.common import PhaseTimer
+from seismograph.runnable import RunnableRecord
+from seismograph.case import Case
+from seismograph.suite import Suite
+from seismograph.program import Program
+from seismograph.program import ProgramLayer
+
+from .helpers import create_config
+from .helpers import create_result
+from .helpers import mount_suites
+
+
+class FakeResult(object):
+    runtime = None
+
+    def __init__(self, name, runtime=1.0):
+        self.name = name
+        self.proxies = []
+        self.errors = Storage()
+        self.skipped = Storage()
+        self.failures = Storage()
+        self.successes = Storage(
+            [(RunnableRecord(id(self), name, 'test'), XUnitData(runtime=runtime, class_name=name, method_name='test'))],
+        )
+        self.current_state = self.get_state()
+
+    def get_state(self):
+        return State(self)
+
+
+class TestXUnitWriter(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.test_path = os.path.join(self.test_dir, 'report.xml')
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+
+    def parse(self):
+        return xml.dom.minidom.parse(self.test_path).documentElement
+
+    def test_partial(self):
+        writer = XUnitWriter(self.test_path, 'program')
+        root = self.parse()
+        self.assertEqual(root.getAttribute('tests'), '0')
+
+        writer.write(FakeResult('first'))
+        root = self.parse()
+        self.assertEqual(root.getAttribute('tests'), '1')
+        self.assertEqual(len(root.getElementsByTagName('testcase')), 1)
+
+    def test_close(self):
+        result = FakeResult('program', runtime=3.0)
+        result.proxies.extend([FakeResult('first'), FakeResult('second')])
+
+        writer = XUnitWriter(self.test_path, 'program')
+        writer.write(result.proxies[0])
+        writer.close(result)
+
+        root = self.parse()
+        self.assertEqual(root.getAttribute('time'), '3.0')
+        self.assertEqual(
+            [s.getAttribute('name') for s in root.getElementsByTagName('testsuite')],
+            ['first', 'second'],
+        )
+
+    def test_grow_header(self):
+        class Writer(XUnitWriter):
+            HEADER_RESERVE = 0
+
+        writer = Writer(self.test_path, 'program')
+        # results are kept alive, writer knows written results by id
+        results = [FakeResult('suite_{}'.format(i), runtime=12.345) for i in range(12)]
+
+        for result in results:
+            writer.write(result)
+
+        root = self.parse()
+        self.assertEqual(root.getAttribute('tests'), '12')
+        self.assertEqual(root.getAttribute('time'), '148.14')
+        self.assertEqual(len(root.getElementsByTagName('testsuite')), 12)
+
+    def test_close_without_proxies(self):
+        writer = XUnitWriter(self.test_path, 'program')
+        writer.close(FakeResult('program'))
+
+        root = self.parse()
+        self.assertEqual(root.getAttribute('tests'), '1')
+        self.assertEqual(len(root.getElementsByTagName('testsuite')), 1)
+        self.assertEqual(len(root.getElementsByTagName('testcase')), 1)
+
+
+class FailLayer(ProgramLayer):
+
+    def on_setup(self, program):
+        raise ValueError('layer')
+
+
+class FailProgram(Program):
+
+    def setup(self):
+        raise ValueError('program')
+
+
+class TestErrorOfProgram(unittest.TestCase):
+    def setUp(self):
+        self.argv = sys.argv
+        self.test_dir = tempfile.mkdtemp()
+        self.test_path = os.path.join(self.test_dir, 'report.xml')
+        sys.argv = ['seismograph', '--xunit-report', self.test_path, '--no-last-failed-file']
+
+        self.suite = Suite('xunit_error_of_program_suite_{}'.format(id(self)))
+
+        @self.suite.register
+        def test(case):
+            pass
+
+    def tearDown(self):
+        sys.argv = self.argv
+        shutil.rmtree(self.test_dir)
+
+    def run_program(self, program_class, **kwargs):
+        program = program_class(
+            suites_path=None, suites=[self.suite], exit=False, stream=StringIO(), **kwargs
+        )
+        self.assertFalse(program())
+
+        root = xml.dom.minidom.parse(self.test_path).documentElement
+        self.assertEqual(root.getAttribute('errors'), '1')
+
+        return root.getElementsByTagName('testcase')
+
+    def check_error(self, testcases, message):
+        self.assertEqual(len(testcases), 1)
+        self.assertEqual(testcases[0].getAttribute('name'), 'start_context')
+
+        error, = testcases[0].getElementsByTagName('error')
+        self.assertIn(message, error.getAttribute('message'))
+
+    def test_program(self):
+        self.check_error(self.run_program(FailProgram), 'program')
+
+    def test_layer(self):
+        self.check_error(self.run_program(Program, layers=[FailLayer()]), 'layer')
+
+
+class TestPhases(unittest.TestCase):
+    def test_timer(self):
+        phases = PhaseTimer()
+        self.assertFalse(phases)
+
+        phases.add('setup', 1.0)
+        phases.add('setup', 0.5)
+        with phases.measure('test'):
+            pass
+
+        self.assertEqual(phases.get('setup'), 1.5)
+        self.assertEqual(sorted(phases.to_dict()), ['setup', 'test'])
+
+    def test_live_timer(self):
+        phases = PhaseTimer()
+        xunit_data = XUnitData(runtime=1.0, phases=phases)
+        phases.add('teardown', 2.0)
+        self.assertEqual(xunit_data.phases, {'teardown': 2.0})
+
+        data = XUnitData.from_marshal(xunit_data.to_marshal())
+        self.assertEqual(data.phases, {'teardown': 2.0})
+
+    def test_repeat(self):
+        suite = Suite('phases_repeat_suite')
+
+        @suite.register
+        class RepeatCase(Case):
+
+            def setup(self):
+                time.sleep(0.05)
+
+            def test(self):
+                pass
+
+        config = create_config(REPEAT=3)
+        mount_suites(config, suite)
+        suite.build()
+
+        result = create_result(config)
+        suite(result)
+
+        phases = [xunit_data.phases for _, xunit_data in result.successes]
+        self.assertEqual(len(phases), 3)
+
+        for run_phases in phases:
+            self.assertTrue(0.05 <= run_phases['setup'] < 0.1, run_phases)
+            self.assertIn('teardown', run_phases)
+
+        self.assertIn('setup_class', phases[0])
+        self.assertNotIn('setup_class', phases[1])
+
+    def test_render(self):
+        self.assertEqual(render_phases(XUnitData(runtime=1.0)), '')
+
+        element = xml.dom.minidom.parseString(
+            render_phases(XUnitData(runtime=1.0, phases={'test': 0.5, 'setup': 0.25})),
+        ).documentElement
+        self.assertEqual(
+            [(p.getAttribute('name'), p.getAttribute('value')) for p in element.getElementsByTagName('property')],
+            [('phase.setup', '0.250000'), ('phase.test', '0.500000')],
+        )